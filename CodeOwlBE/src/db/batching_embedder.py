@@ -0,0 +1,164 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.db.embedding_service import EmbeddingService, get_embedding_service
+
+
+# (text, loop the caller awaits on, caller's future)
+_Request = Tuple[str, asyncio.AbstractEventLoop, asyncio.Future]
+
+_STOP = object()
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    if future.done():  # caller gave up (cancelled or timed out)
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _deliver(loop: asyncio.AbstractEventLoop, future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    try:
+        loop.call_soon_threadsafe(_resolve, future, result, error)
+    except RuntimeError:  # the caller's loop has already closed
+        pass
+
+
+class BatchingEmbedder:
+    """
+    Asyncio front-end that merges concurrent single-text embedding requests
+    into model batches.
+
+    Requests go onto a queue drained by one dedicated worker thread, which
+    waits at most max_wait_ms after the first request of a batch for more to
+    arrive (or until max_batch_size are queued), encodes them in one call
+    through the EmbeddingService (so the embedding cache still applies) and
+    resolves each caller's future on its own event loop. The event loop
+    never runs the model, and a lone request waits at most max_wait_ms.
+    """
+
+    def __init__(
+        self,
+        service: Optional[EmbeddingService] = None,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.service = service or get_embedding_service()
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.batches = 0
+        self.requests = 0
+
+    @classmethod
+    def from_settings(cls) -> "BatchingEmbedder":
+        """Build a batcher over the shared EmbeddingService using application settings"""
+        from src.utils.config import settings
+
+        return cls(
+            max_batch_size=settings.embedding_batch_size,
+            max_wait_ms=settings.embedding_batch_wait_ms,
+        )
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embedding for one text, batched with whatever else is in flight"""
+        if not text or not text.strip():
+            return np.zeros(self.service.embedding_dim, dtype=np.float32)
+
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((text, loop, future))
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """Embeddings for several texts, each submitted as its own request"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters since the batcher was created"""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self, timeout: Optional[float] = None):
+        """Finish queued requests and stop the worker thread"""
+        with self._start_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join(timeout)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch: List[_Request] = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._encode(batch)
+            if stopping:
+                return
+
+    def _encode(self, batch: List[_Request]):
+        try:
+            vectors = self.service.embed_batch([text for text, _, _ in batch], batch_size=len(batch))
+        except Exception as e:
+            for _, loop, future in batch:
+                _deliver(loop, future, error=e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        for (_, loop, future), vector in zip(batch, vectors):
+            _deliver(loop, future, vector)
+
+
+_shared_batcher: Optional[BatchingEmbedder] = None
+_shared_lock = threading.Lock()
+
+
+def get_batching_embedder() -> BatchingEmbedder:
+    """Process-wide BatchingEmbedder over the shared EmbeddingService"""
+    global _shared_batcher
+    if _shared_batcher is None:
+        with _shared_lock:
+            if _shared_batcher is None:
+                _shared_batcher = BatchingEmbedder.from_settings()
+    return _shared_batcher
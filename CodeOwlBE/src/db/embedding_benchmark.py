@@ -0,0 +1,133 @@
+"""
+Compare embedding backends on CPU: cosine drift against the fp32 torch
+model and encoding throughput.
+
+    python -m src.db.embedding_benchmark --backends torch onnx onnx-int8
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.db.model_registry import BACKENDS, get_model
+
+
+def sample_texts(source_dir: str = "src", limit: int = 512, lines_per_text: int = 30) -> List[str]:
+    """Windows of source lines from a directory, as a stand-in for indexed code"""
+    texts = []
+    for path in sorted(Path(source_dir).rglob("*.py")):
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        for start in range(0, len(lines), lines_per_text):
+            chunk = "\n".join(lines[start:start + lines_per_text]).strip()
+            if chunk:
+                texts.append(f"File: {path}\n{chunk}")
+                if len(texts) >= limit:
+                    return texts
+    return texts
+
+
+def _encode(model_name: str, backend: str, texts: Sequence[str], batch_size: int) -> np.ndarray:
+    model = get_model(model_name, backend)
+    return model.encode(
+        list(texts), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+    ).astype(np.float32)
+
+
+def parity(
+    model_name: str,
+    backend: str,
+    texts: Sequence[str],
+    reference: str = "torch",
+    batch_size: int = 64,
+    k: int = 10,
+) -> Dict[str, Any]:
+    """
+    Drift of a backend's vectors from the reference backend: per-text cosine
+    similarity, and how many of each text's k nearest neighbours (among the
+    other texts) survive, as a proxy for retrieval quality.
+    """
+    expected = _encode(model_name, reference, texts, batch_size)
+    actual = _encode(model_name, backend, texts, batch_size)
+    cosine = np.sum(expected * actual, axis=1)
+
+    k = min(k, len(texts) - 1)
+    overlap = 1.0
+    if k > 0:
+        def neighbours(vectors: np.ndarray) -> np.ndarray:
+            scores = vectors @ vectors.T
+            np.fill_diagonal(scores, -np.inf)
+            return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        ours, theirs = neighbours(actual), neighbours(expected)
+        overlap = float(np.mean([
+            len(np.intersect1d(a, b, assume_unique=True)) / k for a, b in zip(ours, theirs)
+        ]))
+
+    return {
+        "backend": backend,
+        "reference": reference,
+        "texts": len(texts),
+        "mean_cosine": float(cosine.mean()),
+        "min_cosine": float(cosine.min()),
+        "max_drift": float(1.0 - cosine.min()),
+        f"neighbour_overlap@{k}": overlap,
+    }
+
+
+def throughput(
+    model_name: str, backend: str, texts: Sequence[str], batch_size: int = 64, repeats: int = 3
+) -> Dict[str, Any]:
+    """Best-of-repeats encoding rate, after one warmup pass"""
+    _encode(model_name, backend, texts[:batch_size], batch_size)
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        _encode(model_name, backend, texts, batch_size)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "backend": backend,
+        "texts": len(texts),
+        "seconds": best,
+        "texts_per_second": len(texts) / best if best > 0 else float("inf"),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    from src.utils.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--source", default="src", help="directory of code to sample texts from")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=settings.embedding_batch_size)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    texts = sample_texts(args.source, args.texts)
+    if not texts:
+        parser.error(f"no Python files found under {args.source}")
+    print(f"{len(texts)} texts from {args.source}, batch size {args.batch_size}\n")
+
+    baseline = None
+    for backend in args.backends:
+        speed = throughput(args.model, backend, texts, args.batch_size, args.repeats)
+        baseline = baseline or speed["texts_per_second"]
+        line = (
+            f"{backend:<10} {speed['texts_per_second']:8.1f} texts/s "
+            f"({speed['texts_per_second'] / baseline:.2f}x)"
+        )
+        if backend != "torch":
+            drift = parity(args.model, backend, texts, batch_size=args.batch_size)
+            overlap_key = next(key for key in drift if key.startswith("neighbour_overlap"))
+            line += (
+                f"  cosine mean {drift['mean_cosine']:.5f} min {drift['min_cosine']:.5f}"
+                f"  {overlap_key} {drift[overlap_key]:.3f}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
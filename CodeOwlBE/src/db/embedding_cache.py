@@ -0,0 +1,213 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Form of a text that cache keys are computed from"""
+    return text.strip()
+
+
+class EmbeddingCache:
+    """
+    Two-level cache of embedding vectors keyed by hash(model, normalized text).
+
+    A bounded in-memory LRU sits in front of a SQLite store of raw float32
+    vectors that evicts least recently used rows once it exceeds max_bytes.
+    The store remembers which model filled it and is cleared when opened
+    for a different one.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = "./.cache/embeddings",
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 10000,
+    ):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(Path(cache_dir) / "embeddings.sqlite3"), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Several processes can share the store, so its total size lives in the
+        # database itself, kept current by triggers, not in a per-process counter
+        self._db.executescript(
+            "BEGIN IMMEDIATE;"
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);"
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);"
+            "INSERT OR IGNORE INTO totals VALUES (0, (SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM entries));"
+            "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes + LENGTH(NEW.vector) WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF vector ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes - LENGTH(OLD.vector) + LENGTH(NEW.vector) WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes - LENGTH(OLD.vector) WHERE id = 0; END;"
+            "COMMIT;"
+        )
+
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'model'").fetchone()
+        if row is not None and row[0] != model_name:
+            print(f"Embedding model changed ({row[0]} -> {model_name}), clearing embedding cache")
+            self._db.execute("DELETE FROM entries")
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('model', ?)", (model_name,)
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        """Build a cache for the configured model, sized from application settings"""
+        from src.utils.config import settings
+        from src.db.model_registry import model_id
+
+        return cls(
+            model_name=model_id(settings.embedding_model, settings.embedding_backend),
+            cache_dir=settings.embedding_cache_dir,
+            max_bytes=settings.embedding_cache_max_bytes,
+            memory_entries=settings.embedding_cache_memory_entries,
+        )
+
+    def make_key(self, text: str) -> str:
+        data = f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha1(data, usedforsecurity=False).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector for each text, None where it has not been embedded yet"""
+        keys = [self.make_key(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        from_disk = set()
+
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                elif key not in found:
+                    missing.append(key)
+            missing = list(dict.fromkeys(missing))
+
+            now = time.time()
+            for start in range(0, len(missing), _LOOKUP_CHUNK):
+                chunk = missing[start:start + _LOOKUP_CHUNK]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM entries WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vector
+                    from_disk.add(key)
+                    self._remember(key, vector)
+                if rows:
+                    self._db.executemany(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+            if missing:
+                self._db.commit()
+
+            results = []
+            for key in keys:
+                vector = found.get(key)
+                if vector is None:
+                    self.misses += 1
+                elif key in from_disk:
+                    self.disk_hits += 1
+                else:
+                    self.memory_hits += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]):
+        """Store freshly computed vectors"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                vector = np.array(vector, dtype=np.float32)
+                vector.setflags(write=False)
+                key = self.make_key(text)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes(), now))
+
+            # An upsert, not INSERT OR REPLACE: REPLACE deletes without firing the delete trigger
+            self._db.executemany(
+                "INSERT INTO entries (key, vector, accessed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "vector = excluded.vector, accessed_at = excluded.accessed_at",
+                rows,
+            )
+            self._evict()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current sizes"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self.disk_bytes(),
+        }
+
+    def disk_bytes(self) -> int:
+        """Size of the shared on-disk store, as written by every process"""
+        return self._db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used rows until the store fits in max_bytes"""
+        disk_bytes = self.disk_bytes()
+        while disk_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, LENGTH(vector) FROM entries ORDER BY accessed_at LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                disk_bytes -= size
+                self.evictions += 1
+                if disk_bytes <= self.max_bytes:
+                    break
@@ -1,32 +1,135 @@
+import threading
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.utils.config import settings
+from src.db.embedding_cache import EmbeddingCache, normalize_text
+from src.db.model_registry import get_model
+
+# Texts are cut to this many characters per token of budget before tokenizing,
+# so truncating a large file never tokenizes all of it
+_MAX_CHARS_PER_TOKEN = 16
 
 class EmbeddingService:
     """Service for generating embeddings using sentence-transformers"""
 
     def __init__(self):
-        print(f"Loading embedding model: {settings.embedding_model}...")
-        self.model = SentenceTransformer(settings.embedding_model)
+        self.model_name = settings.embedding_model
+        self.backend = settings.embedding_backend
         self.embedding_dim = settings.embedding_dimension
-        print(f"Embedding model loaded (dimension: {self.embedding_dim})")
+        self.cache = EmbeddingCache.from_settings() if settings.embedding_cache_enabled else None
+    
+    @property
+    def model(self) -> SentenceTransformer:
+        """Shared model from the registry, loaded on first use"""
+        return get_model(self.model_name, self.backend)
+    
+    @property
+    def max_seq_length(self) -> int:
+        """Longest input, in tokens including special tokens, the model reads"""
+        model = self.model
+        return model.max_seq_length or getattr(model.tokenizer, "model_max_length", None) or 512
+    
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Model token counts (capped at max_seq_length) for each text"""
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
     
-    def embed_text(self, text: str) -> List[float]:
-        """Generate embedding for a single text"""
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text that is at most max_tokens model tokens"""
+        if not text or max_tokens <= 0:
+            return ""
+        text = text[:max_tokens * _MAX_CHARS_PER_TOKEN]
+        tokenizer = self.model.tokenizer
+        if getattr(tokenizer, "is_fast", False):
+            offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+            return text if len(offsets) <= max_tokens else text[:offsets[max_tokens - 1][1]]
+        ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+        return text if len(ids) <= max_tokens else tokenizer.decode(ids[:max_tokens])
+    
+    def _fit_tail(self, head: str, tail: str) -> str:
+        """head followed by as much of tail as fits in the model's sequence length"""
+        budget = (
+            self.max_seq_length
+            - self.model.tokenizer.num_special_tokens_to_add()
+            - len(self.model.tokenizer(head, add_special_tokens=False)["input_ids"])
+            - 1
+        )
+        return f"{head} {self.truncate_to_tokens(tail, budget)}"
+    
+    def embed_text(self, text: str, normalize: bool = False) -> np.ndarray:
+        """Generate embedding for a single text, as a float32 vector"""
         if not text or not text.strip():
-            return [0.0] * self.embedding_dim
+            return np.zeros(self.embedding_dim, dtype=np.float32)
         
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return self._as_vectors(self._embed([text])[0], normalize)
     
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embedding for multiple texts"""
+    def embed_batch(self, texts: List[str], batch_size: Optional[int] = None, normalize: bool = False) -> np.ndarray:
+        """Generate embedding for multiple texts, as a (len(texts), dim) float32 array"""
         valid_texts = [t if t and t.strip() else " " for t in texts]
-        embeddings = self.model.encode(valid_texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        return self._as_vectors(self._embed(valid_texts, batch_size), normalize)
     
-    def embed_code_graph(self, graph_data: Dict[str, Any]) -> List[float]:
-        """Generate embedding for code graph structure"""
+    @staticmethod
+    def _as_vectors(vectors: np.ndarray, normalize: bool) -> np.ndarray:
+        """Contiguous float32 vectors (copied only if needed), L2-normalized in place on request"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if normalize:
+            if not vectors.flags.writeable:
+                vectors = vectors.copy()
+            norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+            np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+    
+    def _embed(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Encode texts, sending only cache misses to the model"""
+        batch_size = batch_size or settings.embedding_batch_size
+        if self.cache is None:
+            return self._encode_bucketed(texts, batch_size)
+
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Encode each distinct (normalized) text once, even if the batch repeats it
+            unique = list(dict.fromkeys(normalize_text(texts[i]) for i in missing))
+            encoded = self._encode_bucketed(unique, batch_size)
+            self.cache.put_many(unique, encoded)
+            by_text = dict(zip(unique, encoded))
+            for i in missing:
+                vectors[i] = by_text[normalize_text(texts[i])]
+
+        if not vectors:
+            return np.zeros((0, self.embedding_dim), dtype=np.float32)
+        return np.stack(vectors)
+    
+    def _encode_bucketed(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Encode texts in batches of similar token length, so short texts are not
+        padded to the longest one in a mixed batch. Rows come back in input order.
+        """
+        vectors = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
+        if not texts:
+            return vectors
+        order = np.argsort(self.token_lengths(texts), kind="stable")
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            vectors[bucket] = self.model.encode(
+                [texts[i] for i in bucket], batch_size=len(bucket), convert_to_numpy=True
+            )
+        return vectors
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hit/miss counters, empty when the cache is disabled"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def code_graph_text(self, graph_data: Dict[str, Any]) -> str:
+        """Text embedded for a code graph structure"""
         content = f"""
         File: {graph_data.get('file_path', '')}
         Functions: {', '.join(graph_data.get('functions', []))}
@@ -35,23 +138,51 @@ class EmbeddingService:
         Total Nodes: {graph_data.get('nodes', 0)}
         Total Edges: {graph_data.get('edges', 0)}
         """
-        return self.embed_text(content.strip())
+        return content.strip()
     
-    def embed_import_file(self, file_path: str, source_code: str, imports: List[str]) -> List[float]:
-        """Generate embedding for import file"""
+    def embed_code_graph(self, graph_data: Dict[str, Any]) -> np.ndarray:
+        """Generate embedding for code graph structure"""
+        return self.embed_text(self.code_graph_text(graph_data))
+    
+    def import_file_text(self, file_path: str, source_code: str, imports: List[str]) -> str:
+        """Text embedded for an import file"""
         content = f"""
         File: {file_path}
         Imports: {', '.join(imports)}
-        Source Code: {source_code[:500]} #first 500 characters
+        Source Code:
         """
-        return self.embed_text(content.strip())
+        return self._fit_tail(content.strip(), source_code)
     
-    def embed_learning(self, commit_message: str, bot_comment: str, user_feedback: str = "", code_context: str = "" ) -> List[float]:
-        """Generate embedding for learning (past reviews)"""
+    def embed_import_file(self, file_path: str, source_code: str, imports: List[str]) -> np.ndarray:
+        """Generate embedding for import file"""
+        return self.embed_text(self.import_file_text(file_path, source_code, imports))
+    
+    def learning_text(self, commit_message: str, bot_comment: str, user_feedback: str = "", code_context: str = "") -> str:
+        """Text embedded for a learning (past review)"""
         content = f"""
         Commit: {commit_message}
         Bot Review: {bot_comment}
         User Feedback: {user_feedback if user_feedback else "No feedback yet"}
-        Code Context: {code_context[:500] if code_context else "None"}
+        Code Context:
         """
-        return self.embed_text(content.strip())
\ No newline at end of file
+        return self._fit_tail(content.strip(), code_context or "None")
+    
+    def embed_learning(self, commit_message: str, bot_comment: str, user_feedback: str = "", code_context: str = "" ) -> np.ndarray:
+        """Generate embedding for learning (past reviews)"""
+        return self.embed_text(
+            self.learning_text(commit_message, bot_comment, user_feedback, code_context)
+        )
+
+
+_shared_service: Optional[EmbeddingService] = None
+_shared_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService, so indexers and retrievers share one model and cache"""
+    global _shared_service
+    if _shared_service is None:
+        with _shared_lock:
+            if _shared_service is None:
+                _shared_service = EmbeddingService()
+    return _shared_service
@@ -0,0 +1,372 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from src.db.vector_store import Conditions, VectorStore
+
+try:
+    import hnswlib
+except ImportError:  # optional (the hnsw extra): large collections fall back to brute force
+    hnswlib = None
+
+
+# SQLite caps the number of bound parameters per statement
+_ROW_CHUNK = 500
+
+_INITIAL_CAPACITY = 1024
+
+
+def _values(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+class _Collection:
+    """
+    One collection on disk: a memory-mapped float32 matrix of unit vectors
+    (row per point) next to a SQLite table of point IDs and JSON payloads.
+
+    Rows freed by deletes are reused. Keyword filters go through inverted
+    indexes built per field on first use. Searches are a brute-force matrix
+    product until the collection reaches hnsw_threshold points and hnswlib is
+    installed, then go through an HNSW index saved alongside on flush().
+    """
+
+    def __init__(self, path: Path, dimension: int, hnsw_threshold: int):
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.hnsw_threshold = hnsw_threshold
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(str(path / "points.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points (row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        meta = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+        self.dimension = int(meta.get("dimension", dimension))
+        if self.dimension != dimension:
+            raise ValueError(f"Collection {path.name} holds {self.dimension}-dimensional vectors, not {dimension}")
+        self._version = int(meta.get("version", 0))
+        self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dimension', ?)", (str(dimension),))
+        self._db.commit()
+
+        self._ids: Dict[int, str] = {}
+        self._rows: Dict[str, int] = {}
+        self._payloads: Dict[int, Dict[str, Any]] = {}
+        for row, point_id, payload in self._db.execute("SELECT row, id, payload FROM points"):
+            self._ids[row] = point_id
+            self._rows[point_id] = row
+            self._payloads[row] = json.loads(payload)
+        self._next_row = max(self._ids, default=-1) + 1
+        self._free = [row for row in range(self._next_row) if row not in self._ids]
+
+        vectors_path = path / "vectors.f32"
+        row_bytes = self.dimension * 4
+        stored = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+        self._capacity = max(stored, self._next_row, _INITIAL_CAPACITY)
+        with open(vectors_path, "ab") as f:
+            f.truncate(self._capacity * row_bytes)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dimension))
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._alive[list(self._ids)] = True
+
+        # field -> value -> rows, built lazily per filtered field
+        self._field_index: Dict[str, Dict[Any, Set[int]]] = {}
+
+        self._hnsw = None
+        hnsw_path = path / "hnsw.bin"
+        if hnswlib is not None and hnsw_path.exists() and meta.get("hnsw_version") == str(self._version):
+            self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+            self._hnsw.load_index(str(hnsw_path), max_elements=self._capacity)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # Writes
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        vectors = _normalized(vectors)
+        last = {point_id: i for i, point_id in enumerate(ids)}
+        with self._lock:
+            rows = []
+            for point_id in last:
+                row = self._rows.get(point_id)
+                if row is None:
+                    row = self._free.pop() if self._free else self._next_row
+                    self._next_row = max(self._next_row, row + 1)
+                    self._rows[point_id] = row
+                    self._ids[row] = point_id
+                else:
+                    self._unindex(row)
+                rows.append(row)
+            self._ensure_capacity(self._next_row)
+
+            order = list(last.values())
+            self._vectors[rows] = vectors[order]
+            self._vectors.flush()
+            self._alive[rows] = True
+            for row, i in zip(rows, order):
+                self._payloads[row] = payloads[i]
+                self._index(row)
+
+            self._db.executemany(
+                "INSERT OR REPLACE INTO points (row, id, payload) VALUES (?, ?, ?)",
+                [(row, self._ids[row], json.dumps(self._payloads[row])) for row in rows],
+            )
+            self._bump_version()
+            if self._hnsw is not None:
+                self._hnsw.add_items(vectors[order], rows)
+
+    def delete(self, must: Optional[Conditions], must_not: Optional[Conditions]):
+        with self._lock:
+            rows = self._candidates(must, must_not).tolist()
+            if not rows:
+                return
+            for row in rows:
+                self._unindex(row)
+                del self._rows[self._ids.pop(row)]
+                del self._payloads[row]
+                self._free.append(row)
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+            self._alive[rows] = False
+            for start in range(0, len(rows), _ROW_CHUNK):
+                chunk = rows[start:start + _ROW_CHUNK]
+                self._db.execute(f"DELETE FROM points WHERE row IN ({','.join('?' * len(chunk))})", chunk)
+            self._bump_version()
+
+    def flush(self):
+        """Save the HNSW index, so the next open can skip rebuilding it"""
+        with self._lock:
+            self._vectors.flush()
+            if self._hnsw is not None:
+                self._hnsw.save_index(str(self.path / "hnsw.bin"))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('hnsw_version', ?)", (str(self._version),)
+                )
+                self._db.commit()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def _bump_version(self):
+        self._version += 1
+        self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (str(self._version),))
+        self._db.commit()
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2)
+        self._vectors.flush()
+        del self._vectors
+        vectors_path = self.path / "vectors.f32"
+        with open(vectors_path, "r+b") as f:
+            f.truncate(capacity * self.dimension * 4)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - self._capacity, dtype=bool)])
+        self._capacity = capacity
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    # Payload indexes
+
+    def _index(self, row: int):
+        payload = self._payloads[row]
+        for field, table in self._field_index.items():
+            if field in payload:
+                for value in _values(payload[field]):
+                    table.setdefault(value, set()).add(row)
+
+    def _unindex(self, row: int):
+        payload = self._payloads.get(row)
+        if payload is None:
+            return
+        for field, table in self._field_index.items():
+            if field in payload:
+                for value in _values(payload[field]):
+                    rows = table.get(value)
+                    if rows is not None:
+                        rows.discard(row)
+                        if not rows:
+                            del table[value]
+
+    def _rows_matching(self, field: str, value: Any) -> Set[int]:
+        table = self._field_index.get(field)
+        if table is None:
+            table = self._field_index[field] = {}
+            for row, payload in self._payloads.items():
+                if field in payload:
+                    for item in _values(payload[field]):
+                        table.setdefault(item, set()).add(row)
+        matched: Set[int] = set()
+        for item in _values(value):
+            matched |= table.get(item, set())
+        return matched
+
+    def _candidates(self, must: Optional[Conditions], must_not: Optional[Conditions]) -> np.ndarray:
+        """Sorted rows of live points passing the filter"""
+        rows: Optional[Set[int]] = None
+        for field, value in (must or {}).items():
+            matched = self._rows_matching(field, value)
+            rows = matched if rows is None else rows & matched
+        if rows is None:
+            candidates = np.flatnonzero(self._alive[:self._next_row])
+        else:
+            candidates = np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+
+        excluded: Set[int] = set()
+        for field, value in (must_not or {}).items():
+            excluded |= self._rows_matching(field, value)
+        if excluded:
+            candidates = candidates[~np.isin(candidates, list(excluded))]
+        return candidates
+
+    # Reads
+
+    def search(self, vector: np.ndarray, limit: int, must: Optional[Conditions], must_not: Optional[Conditions]) -> List[Dict[str, Any]]:
+        query = _normalized(vector)[0]
+        with self._lock:
+            if not self._ids or limit <= 0:
+                return []
+            filtered = bool(must or must_not)
+            candidates = self._candidates(must, must_not) if filtered else None
+
+            rows = None
+            if hnswlib is not None and len(self._ids) >= self.hnsw_threshold and (
+                candidates is None or len(candidates) >= self.hnsw_threshold
+            ):
+                rows = self._search_hnsw(query, limit, candidates)
+            if rows is None:
+                if candidates is None:
+                    candidates = np.flatnonzero(self._alive[:self._next_row])
+                rows = self._search_exact(query, limit, candidates)
+            return [dict(self._payloads[row]) for row in rows]
+
+    def _search_exact(self, query: np.ndarray, limit: int, candidates: np.ndarray) -> List[int]:
+        if not len(candidates):
+            return []
+        scores = self._vectors[candidates] @ query
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return candidates[top].tolist()
+
+    def _search_hnsw(self, query: np.ndarray, limit: int, candidates: Optional[np.ndarray]) -> Optional[List[int]]:
+        if self._hnsw is None:
+            alive = np.flatnonzero(self._alive[:self._next_row])
+            self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+            self._hnsw.init_index(max_elements=self._capacity, ef_construction=200, M=16)
+            self._hnsw.add_items(self._vectors[alive], alive)
+        self._hnsw.set_ef(max(64, limit * 2))
+
+        allowed = None
+        if candidates is not None:
+            mask = np.zeros(self._capacity, dtype=bool)
+            mask[candidates] = True
+            allowed = lambda label: bool(mask[label])
+        try:
+            labels, _ = self._hnsw.knn_query(query, k=min(limit, len(self._ids)), filter=allowed)
+        except RuntimeError:  # not enough neighbours reachable through the filter
+            return None
+        return labels[0].tolist()
+
+    def fetch(self, must: Optional[Conditions], must_not: Optional[Conditions]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(self._payloads[row]) for row in self._candidates(must, must_not).tolist()]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded VectorStore persisted under a directory, one subdirectory per
+    collection, for tests, offline benchmarks and single-node installs that
+    do not run Qdrant. Call close() (or flush()) on shutdown to keep the
+    HNSW indexes of large collections for the next start.
+    """
+
+    def __init__(self, directory: str = "./.cache/vectors", hnsw_threshold: int = 20000):
+        self.directory = Path(directory)
+        self.hnsw_threshold = hnsw_threshold
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LocalVectorStore":
+        """Build a store at the configured directory"""
+        from src.utils.config import settings
+
+        return cls(directory=settings.local_store_dir, hnsw_threshold=settings.local_store_hnsw_threshold)
+
+    def _collection(self, collection_name: str, dimension: Optional[int] = None) -> Optional[_Collection]:
+        """Open a collection, creating it only when a dimension is given"""
+        collection = self._collections.get(collection_name)
+        if collection is not None:
+            return collection
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                path = self.directory / collection_name
+                if dimension is None:
+                    if not (path / "points.sqlite3").exists():
+                        return None
+                    db = sqlite3.connect(str(path / "points.sqlite3"))
+                    try:
+                        dimension = int(db.execute("SELECT value FROM meta WHERE name = 'dimension'").fetchone()[0])
+                    finally:
+                        db.close()
+                collection = _Collection(path, dimension, self.hnsw_threshold)
+                self._collections[collection_name] = collection
+        return collection
+
+    def initialize_collections(self, dimension: int, collection_names: Iterable[str] = ()):
+        from src.db.vector_store import COLLECTIONS
+
+        for collection_name in collection_names or COLLECTIONS:
+            self._collection(collection_name, dimension)
+
+    def upsert(self, collection_name, ids, vectors, payloads, wait=True):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._collection(collection_name, vectors.shape[-1]).upsert(list(ids), vectors, payloads)
+
+    def search(self, collection_name, vector, limit, must=None, must_not=None):
+        collection = self._collection(collection_name)
+        return collection.search(vector, limit, must, must_not) if collection is not None else []
+
+    def fetch(self, collection_name, must=None, must_not=None):
+        collection = self._collection(collection_name)
+        return collection.fetch(must, must_not) if collection is not None else []
+
+    def delete(self, collection_name, must=None, must_not=None):
+        collection = self._collection(collection_name)
+        if collection is not None:
+            collection.delete(must, must_not)
+
+    def count(self, collection_name: str) -> int:
+        collection = self._collection(collection_name)
+        return len(collection) if collection is not None else 0
+
+    def flush(self):
+        for collection in list(self._collections.values()):
+            collection.flush()
+
+    def close(self):
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
@@ -0,0 +1,131 @@
+import gc
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sentence_transformers import SentenceTransformer
+
+
+# Backends EmbeddingService can run a model on
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# (model name, backend) -> loaded model, shared by every EmbeddingService in the process
+_models: Dict[Tuple[str, str], SentenceTransformer] = {}
+_lock = threading.Lock()
+
+
+def model_id(model_name: str, backend: str = "torch") -> str:
+    """Identity of the vectors a model produces; backends other than torch drift slightly"""
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def _load(model_name: str, backend: str) -> SentenceTransformer:
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+    if backend == "onnx-int8":
+        return _load_quantized(model_name)
+    raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def _load_quantized(model_name: str) -> SentenceTransformer:
+    """
+    Load a dynamically int8-quantized ONNX export of a model, exporting and
+    quantizing it into the local ONNX cache directory the first time.
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+    from src.utils.config import settings
+
+    config = settings.embedding_quantization
+    local_dir = Path(settings.embedding_onnx_dir) / model_name.replace("/", "__")
+    file_name = f"onnx/model_qint8_{config}.onnx"
+
+    if not (local_dir / file_name).exists():
+        print(f"Quantizing {model_name} to int8 ({config})...")
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save(str(local_dir))
+        export_dynamic_quantized_onnx_model(model, config, str(local_dir))
+
+    return SentenceTransformer(str(local_dir), backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def get_model(model_name: Optional[str] = None, backend: Optional[str] = None) -> SentenceTransformer:
+    """
+    Return the process-wide instance of a model on a backend, loading it on
+    first use.
+
+    Concurrent first callers wait for a single load instead of each loading
+    their own copy.
+    """
+    if model_name is None or backend is None:
+        from src.utils.config import settings
+
+        model_name = model_name or settings.embedding_model
+        backend = backend or settings.embedding_backend
+
+    key = (model_name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            print(f"Loading embedding model: {model_name} ({backend})...")
+            started = time.perf_counter()
+            try:
+                model = _load(model_name, backend)
+            except ImportError as e:
+                raise ImportError(
+                    f"The {backend} embedding backend needs ONNX Runtime support: "
+                    f"pip install 'sentence-transformers[onnx]' ({e})"
+                ) from e
+            model.eval()
+            _models[key] = model
+            print(f"Embedding model loaded in {time.perf_counter() - started:.1f}s")
+    return model
+
+
+def warmup(model_names: Optional[Iterable[str]] = None, backend: Optional[str] = None) -> List[str]:
+    """
+    Load models ahead of the first request (e.g. at server startup) and run
+    one encode so lazy kernel and allocator setup is paid up front too.
+    """
+    if model_names is None:
+        from src.utils.config import settings
+
+        model_names = [settings.embedding_model]
+
+    loaded = []
+    for model_name in model_names:
+        get_model(model_name, backend).encode(["warmup"], convert_to_numpy=True)
+        loaded.append(model_name)
+    return loaded
+
+
+def preload_for_fork(model_names: Optional[Iterable[str]] = None, backend: Optional[str] = None) -> List[str]:
+    """
+    Warm models in a parent process before forking workers.
+
+    Children inherit the weights copy-on-write; moving everything allocated
+    so far into the GC's permanent generation keeps collections in the
+    children from touching (and so copying) those pages.
+    """
+    loaded = warmup(model_names, backend)
+    gc.collect()
+    gc.freeze()
+    return loaded
+
+
+def loaded_models() -> List[str]:
+    return [model_id(model_name, backend) for model_name, backend in _models]
+
+
+def unload(model_name: Optional[str] = None, backend: Optional[str] = None):
+    """Drop one model (on one or every backend), or all of them, from the registry"""
+    with _lock:
+        for key in list(_models):
+            if model_name is None or (key[0] == model_name and backend in (None, key[1])):
+                del _models[key]
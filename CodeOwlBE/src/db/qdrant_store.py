@@ -0,0 +1,230 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Batch,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchAny,
+    MatchValue,
+    SearchParams,
+)
+
+from src.db.vector_store import COLLECTIONS, Conditions, VectorStore
+
+
+def _conditions(conditions: Optional[Conditions]) -> List[FieldCondition]:
+    result = []
+    for field, value in (conditions or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            result.append(FieldCondition(key=field, match=MatchAny(any=list(value))))
+        else:
+            result.append(FieldCondition(key=field, match=MatchValue(value=value)))
+    return result
+
+
+def to_filter(must: Optional[Conditions] = None, must_not: Optional[Conditions] = None) -> Optional[Filter]:
+    """Qdrant Filter for {field: value} conditions, None when there are none"""
+    if not must and not must_not:
+        return None
+    return Filter(must=_conditions(must) or None, must_not=_conditions(must_not) or None)
+
+
+# Seconds a collection's search parameters are reused before its config is read again,
+# so a migration run from another process is picked up without a restart
+SEARCH_PARAMS_TTL = 60.0
+
+
+class QdrantStore(VectorStore):
+    """VectorStore on a Qdrant server, through the shared sync and async clients"""
+
+    def __init__(self, client: Optional[QdrantClient] = None, async_client: Optional[AsyncQdrantClient] = None):
+        self._client = client
+        self._async_client = async_client
+        # collection -> (read at, search params)
+        self._search_params: Dict[str, Tuple[float, Optional[SearchParams]]] = {}
+        # Collections known to exist; the shared ones are created at startup
+        self._existing: Set[str] = set(COLLECTIONS)
+        self._create_lock = threading.Lock()
+        # Created on first use, inside the event loop that awaits it
+        self._acreate_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def client(self) -> QdrantClient:
+        if self._client is not None:
+            return self._client
+        from src.utils import qdrant_client
+
+        return qdrant_client.qdrant_client
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        if self._async_client is not None:
+            return self._async_client
+        from src.utils.qdrant_client import get_async_client
+
+        return get_async_client()
+
+    def _cached_search_params(self, collection_name: str) -> Tuple[bool, Optional[SearchParams]]:
+        cached = self._search_params.get(collection_name)
+        if cached is None or time.monotonic() - cached[0] > SEARCH_PARAMS_TTL:
+            return False, None
+        return True, cached[1]
+
+    def _store_search_params(self, collection_name: str, config) -> Optional[SearchParams]:
+        from src.utils.collection_profiles import collection_search_params
+
+        params = collection_search_params(config)
+        self._search_params[collection_name] = (time.monotonic(), params)
+        return params
+
+    def search_params(self, collection_name: str) -> Optional[SearchParams]:
+        """Query-time parameters (rescoring, oversampling, hnsw_ef) of the profile the collection is stored on"""
+        hit, params = self._cached_search_params(collection_name)
+        if hit:
+            return params
+        return self._store_search_params(collection_name, self.client.get_collection(collection_name).config)
+
+    async def asearch_params(self, collection_name: str) -> Optional[SearchParams]:
+        """search_params through the async client"""
+        hit, params = self._cached_search_params(collection_name)
+        if hit:
+            return params
+        info = await self.async_client.get_collection(collection_name)
+        return self._store_search_params(collection_name, info.config)
+
+    def initialize_collections(self, dimension: int, collection_names: Iterable[str] = ()):
+        from src.utils.qdrant_client import initialize_collections
+
+        collection_names = list(collection_names)
+        initialize_collections(collection_names or None, client=self.client, dimension=dimension)
+        self._existing.update(collection_names)
+
+    def _exists(self, collection_name: str) -> bool:
+        if collection_name not in self._existing and self.client.collection_exists(collection_name):
+            self._existing.add(collection_name)
+        return collection_name in self._existing
+
+    async def _aexists(self, collection_name: str) -> bool:
+        if collection_name not in self._existing and await self.async_client.collection_exists(collection_name):
+            self._existing.add(collection_name)
+        return collection_name in self._existing
+
+    def _ensure(self, collection_name: str):
+        """Create a dedicated tenant collection on its first write"""
+        if collection_name in self._existing:
+            return
+        with self._create_lock:
+            if not self._exists(collection_name):
+                from src.utils.config import settings
+
+                self.initialize_collections(settings.embedding_dimension, [collection_name])
+
+    async def _aensure(self, collection_name: str):
+        """_ensure through the async client, which is the one that will write"""
+        if collection_name in self._existing:
+            return
+        if self._acreate_lock is None:
+            self._acreate_lock = asyncio.Lock()
+        async with self._acreate_lock:
+            if not await self._aexists(collection_name):
+                from src.utils.qdrant_client import ainitialize_collections
+
+                await ainitialize_collections([collection_name], client=self.async_client)
+                self._existing.add(collection_name)
+
+    def upsert(self, collection_name, ids, vectors, payloads, wait=True):
+        # qdrant-client serializes plain floats either way; one C-level tolist()
+        # is far cheaper than letting pydantic validate an ndarray element by element
+        self._ensure(collection_name)
+        self.client.upsert(
+            collection_name=collection_name,
+            points=Batch(ids=list(ids), vectors=np.asarray(vectors).tolist(), payloads=payloads),
+            wait=wait,
+        )
+
+    def search(self, collection_name, vector, limit, must=None, must_not=None):
+        if not self._exists(collection_name):
+            return []
+        results = self.client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            query_filter=to_filter(must, must_not),
+            search_params=self.search_params(collection_name),
+            limit=limit,
+        ).points
+        return [hit.payload for hit in results]
+
+    def fetch(self, collection_name, must=None, must_not=None):
+        if not self._exists(collection_name):
+            return []
+        payloads = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=to_filter(must, must_not),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            payloads.extend(point.payload for point in points)
+            if offset is None:
+                return payloads
+
+    def delete(self, collection_name, must=None, must_not=None):
+        if not self._exists(collection_name):
+            return
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=FilterSelector(filter=to_filter(must, must_not) or Filter()),
+        )
+
+    def count(self, collection_name: str) -> int:
+        if not self._exists(collection_name):
+            return 0
+        return self.client.count(collection_name=collection_name).count
+
+    async def aupsert(self, collection_name, ids, vectors, payloads, wait=True):
+        await self._aensure(collection_name)
+        await self.async_client.upsert(
+            collection_name=collection_name,
+            points=Batch(ids=list(ids), vectors=np.asarray(vectors).tolist(), payloads=payloads),
+            wait=wait,
+        )
+
+    async def asearch(self, collection_name, vector, limit, must=None, must_not=None):
+        if not await self._aexists(collection_name):
+            return []
+        response = await self.async_client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            query_filter=to_filter(must, must_not),
+            search_params=await self.asearch_params(collection_name),
+            limit=limit,
+        )
+        return [hit.payload for hit in response.points]
+
+    async def afetch(self, collection_name, must=None, must_not=None):
+        if not await self._aexists(collection_name):
+            return []
+        payloads = []
+        offset = None
+        while True:
+            points, offset = await self.async_client.scroll(
+                collection_name=collection_name,
+                scroll_filter=to_filter(must, must_not),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            payloads.extend(point.payload for point in points)
+            if offset is None:
+                return payloads
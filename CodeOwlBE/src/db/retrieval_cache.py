@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# (collection, lookup kind, query/filter identity, limit)
+CacheKey = Tuple[str, str, str, Optional[int]]
+
+Payloads = List[Dict[str, Any]]
+
+
+def _copy(value: Payloads) -> Payloads:
+    return [dict(payload) for payload in value]
+
+
+class RetrievalCache:
+    """
+    Bounded LRU of retrieval results, invalidated per collection by
+    generation counters.
+
+    VectorIndexer bumps a collection's generation after every write, which
+    drops that collection's entries; a result computed while a write was in
+    progress is not stored, because its caller passes the generation it
+    started under. Counters are per process, so the TTL bounds staleness
+    from writers in other processes.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (generation, stored_at, size, payloads)
+        self._entries: "OrderedDict[CacheKey, Tuple[int, float, int, Payloads]]" = OrderedDict()
+        self._by_collection: Dict[str, Set[CacheKey]] = {}
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls) -> "RetrievalCache":
+        """Build a cache sized from application settings"""
+        from src.utils.config import settings
+
+        return cls(
+            max_entries=settings.retrieval_cache_max_entries,
+            max_bytes=settings.retrieval_cache_max_bytes,
+            ttl_seconds=settings.retrieval_cache_ttl_seconds,
+        )
+
+    @staticmethod
+    def vector_key(vector: np.ndarray) -> str:
+        """Identity of a query vector"""
+        data = np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+        return hashlib.sha1(data, usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def filter_key(*conditions: Any) -> str:
+        """Identity of filter conditions"""
+        return json.dumps(conditions, sort_keys=True, default=str)
+
+    def generation(self, collection_name: str) -> int:
+        return self._generations.get(collection_name, 0)
+
+    def bump(self, collection_name: str):
+        """Record a write to a collection, dropping its cached results"""
+        with self._lock:
+            self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+            for key in self._by_collection.pop(collection_name, ()):
+                self._drop(key, untrack=False)
+            self.invalidations += 1
+
+    def get(self, key: CacheKey) -> Optional[Payloads]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, stored_at, _, value = entry
+                if generation == self.generation(key[0]) and time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(value)
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, value: Payloads, generation: int):
+        """Store a result computed under generation (ignored if the collection changed since)"""
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation(key[0]):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (generation, time.monotonic(), size, _copy(value))
+            self._by_collection.setdefault(key[0], set()).add(key)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def lookup(self, key: CacheKey, compute: Callable[[], Payloads]) -> Payloads:
+        """Cached result for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            generation = self.generation(key[0])
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_collection.clear()
+            self._bytes = 0
+
+    def _drop(self, key: CacheKey, untrack: bool = True):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[2]
+        if untrack:
+            keys = self._by_collection.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+
+
+_shared_cache: Optional[RetrievalCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Process-wide RetrievalCache shared by VectorIndexer and VectorRetriever"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = RetrievalCache.from_settings()
+    return _shared_cache
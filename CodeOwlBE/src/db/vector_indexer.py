@@ -1,76 +1,360 @@
+import asyncio
 import uuid
-from typing import List, Dict, Any
-from qdrant_client.models import PointStruct
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+import numpy as np
+
+from src.utils.config import settings
+from src.db.embedding_service import get_embedding_service
+from src.db.retrieval_cache import get_retrieval_cache
+from src.db.vector_store import VectorStore, get_vector_store, tenant_collection
+
+# progress(done, total) after each embedded batch
+ProgressCallback = Callable[[int, int], None]
+
+# (point ID, vector, payload) for a single upsert
+Point = Tuple[str, np.ndarray, Dict[str, Any]]
+
+# Namespace for point IDs; changing it orphans every indexed point
+POINT_NAMESPACE = uuid.UUID("5f0b6a2e-8c1d-5e7a-9b34-0c6d2f1e4a87")
+
+# Collections holding one point per repository file, which sweeps apply to
+FILE_COLLECTIONS = ("code_graphs", "import_files")
+
+
+def point_id(kind: str, key: str, repo_id: str = "") -> str:
+    """
+    Deterministic point ID (UUIDv5) for a record, so indexing it again
+    replaces the existing point instead of adding one. A file keeps one
+    point across versions; its blob_sha is recorded in the payload.
+    """
+    return str(uuid.uuid5(POINT_NAMESPACE, "\0".join([repo_id, kind, key])))
+
+
+def _learning_key(commit_msg: str, bot_comment: str, code_context: str = "") -> str:
+    # user_feedback is left out so adding feedback later updates the same point
+    return "\0".join([commit_msg, bot_comment, code_context or ""])
 
-from src.utils.qdrant_client import qdrant_client
-from src.db.embedding_service import EmbeddingService
 
 class VectorIndexer:
-    """Indexes code data into Qdrant vector collections"""
-    def __init__(self):
-        self.embedding_service = EmbeddingService()
-    
-    def index_code_graph(self, file_path: str, graph_data: Dict[str, Any]) -> str:
-        """Index code graph structure into Qdrant"""
-        embedding = self.embedding_service.embed_code_graph(graph_data)
+    """Indexes code data into the vector collections, for repo_id unless a call names another repo"""
+    def __init__(self, repo_id: str = "", store: Optional[VectorStore] = None):
+        self.repo_id = repo_id
+        self.embedding_service = get_embedding_service()
+        self.store = store or get_vector_store()
+        # Writes bump collection generations, invalidating cached retrievals
+        self.retrieval_cache = get_retrieval_cache()
 
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                'type': 'code_graph',
-                'file_path': file_path,
-                'functions': graph_data.get('functions', []),
-                'classes': graph_data.get('classes', []),
-                'calls': graph_data.get('calls', []),
-                'node_count': graph_data.get('nodes', 0),
-                'edge_count': graph_data.get('edges', 0)
-            },
-        )
+    def _repo(self, repo_id: Optional[str]) -> str:
+        return self.repo_id if repo_id is None else repo_id
 
-        qdrant_client.upsert(collection_name='code_graphs', points=[point])
-        return point.id
-    
-    def index_import_file(self, file_path: str, source_code: str, imports: List[str]) -> str:
-        """Index import file into Qdrant"""
-        embedding = self.embedding_service.embed_import_file(file_path, source_code, imports)
+    @staticmethod
+    def _provenance(repo_id: str, generation: Optional[str], blob_sha: Optional[str] = None) -> Dict[str, Any]:
+        """Payload fields recording which repo and index run wrote a point"""
+        fields: Dict[str, Any] = {'repo_id': repo_id}
+        if generation is not None:
+            fields['generation'] = generation
+        if blob_sha is not None:
+            fields['blob_sha'] = blob_sha
+        return fields
 
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                'type': 'import_file',
-                'file_path': file_path,
-                'source_code': source_code[:1000], # Store first 1000 characters
-                'imports': imports,
-                'import_count': len(imports),
-            },
-        )
+    def _code_graph_payload(self, file_path: str, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'type': 'code_graph',
+            'file_path': file_path,
+            'functions': graph_data.get('functions', []),
+            'classes': graph_data.get('classes', []),
+            'calls': graph_data.get('calls', []),
+            'node_count': graph_data.get('nodes', 0),
+            'edge_count': graph_data.get('edges', 0)
+        }
+
+    def _import_file_payload(self, file_path: str, source_code: str, imports: List[str]) -> Dict[str, Any]:
+        return {
+            'type': 'import_file',
+            'file_path': file_path,
+            'source_code': source_code[:1000], # Store first 1000 characters
+            'imports': imports,
+            'import_count': len(imports),
+        }
+
+    def _learning_payload(self, commit_msg: str, bot_comment: str, user_feedback: str = "", code_context: str = "") -> Dict[str, Any]:
+        return {
+            'type': 'learning',
+            'commit_message': commit_msg,
+            'bot_comment': bot_comment,
+            'user_feedback': user_feedback if user_feedback else None,
+            'has_user_feedback': bool(user_feedback),
+            'code_context': code_context[:1000] if code_context else "",
+        }
+
+    def _code_graph_point(
+        self,
+        file_path: str,
+        graph_data: Dict[str, Any],
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+        blob_sha: Optional[str] = None,
+    ) -> Point:
+        repo_id = self._repo(repo_id)
+        embedding = self.embedding_service.embed_code_graph(graph_data)
+        payload = {
+            **self._code_graph_payload(file_path, graph_data),
+            **self._provenance(repo_id, generation, blob_sha),
+        }
+        return point_id('code_graph', file_path, repo_id), embedding, payload
+
+    def _import_file_point(
+        self,
+        file_path: str,
+        source_code: str,
+        imports: List[str],
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+        blob_sha: Optional[str] = None,
+    ) -> Point:
+        repo_id = self._repo(repo_id)
+        embedding = self.embedding_service.embed_import_file(file_path, source_code, imports)
+        payload = {
+            **self._import_file_payload(file_path, source_code, imports),
+            **self._provenance(repo_id, generation, blob_sha),
+        }
+        return point_id('import_file', file_path, repo_id), embedding, payload
 
-        qdrant_client.upsert(collection_name='import_files', points=[point])
-        return point.id
-    
-    def index_learning(self, commit_msg: str, bot_comment: str, user_feedback:str = "", code_context: str = "") -> str:
-        """Index learning (past review feedback) into Qdrant"""
+    def _learning_point(self, commit_msg: str, bot_comment: str, user_feedback: str = "", code_context: str = "", repo_id: Optional[str] = None) -> Point:
+        repo_id = self._repo(repo_id)
         embedding = self.embedding_service.embed_learning(
             commit_message=commit_msg,
             bot_comment=bot_comment,
             user_feedback=user_feedback,
             code_context=code_context,
         )
+        payload = {
+            **self._learning_payload(commit_msg, bot_comment, user_feedback, code_context),
+            **self._provenance(repo_id, None),
+        }
+        return point_id('learning', _learning_key(commit_msg, bot_comment, code_context), repo_id), embedding, payload
 
-        point = PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embedding,
-            payload={
-                'type': 'learning',
-                'commit_message': commit_msg,
-                'bot_comment': bot_comment,
-                'user_feedback': user_feedback if user_feedback else None,
-                'has_user_feedback': bool(user_feedback),
-                'code_context': code_context[:1000] if code_context else "",
-            },
-        )
+    def index_code_graph(
+        self,
+        file_path: str,
+        graph_data: Dict[str, Any],
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+        blob_sha: Optional[str] = None,
+    ) -> str:
+        """Index code graph structure, replacing the file's previous point"""
+        point = self._code_graph_point(file_path, graph_data, repo_id, generation, blob_sha)
+        return self._upsert_one('code_graphs', point)
+
+    def index_import_file(
+        self,
+        file_path: str,
+        source_code: str,
+        imports: List[str],
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+        blob_sha: Optional[str] = None,
+    ) -> str:
+        """Index import file, replacing the file's previous point"""
+        point = self._import_file_point(file_path, source_code, imports, repo_id, generation, blob_sha)
+        return self._upsert_one('import_files', point)
+
+    def index_learning(self, commit_msg: str, bot_comment: str, user_feedback:str = "", code_context: str = "", repo_id: Optional[str] = None) -> str:
+        """Index learning (past review feedback)"""
+        point = self._learning_point(commit_msg, bot_comment, user_feedback, code_context, repo_id)
+        return self._upsert_one('learnings', point)
+
+    def _upsert_one(self, collection_name: str, point: Point) -> str:
+        id_, vector, payload = point
+        collection_name = tenant_collection(collection_name, payload['repo_id'])
+        self.store.upsert(collection_name, [id_], vector[np.newaxis], [payload])
+        self.retrieval_cache.bump(collection_name)
+        return id_
+
+    # Async facade: the model runs in a worker thread, the upsert on the event loop
+
+    async def aindex_code_graph(self, *args: Any, **kwargs: Any) -> str:
+        """index_code_graph for async callers"""
+        point = await asyncio.to_thread(self._code_graph_point, *args, **kwargs)
+        collection_name = tenant_collection('code_graphs', point[2]['repo_id'])
+        await self.store.aupsert(collection_name, [point[0]], point[1][np.newaxis], [point[2]])
+        self.retrieval_cache.bump(collection_name)
+        return point[0]
+
+    async def aindex_import_file(self, *args: Any, **kwargs: Any) -> str:
+        """index_import_file for async callers"""
+        point = await asyncio.to_thread(self._import_file_point, *args, **kwargs)
+        collection_name = tenant_collection('import_files', point[2]['repo_id'])
+        await self.store.aupsert(collection_name, [point[0]], point[1][np.newaxis], [point[2]])
+        self.retrieval_cache.bump(collection_name)
+        return point[0]
+
+    async def aindex_learning(self, *args: Any, **kwargs: Any) -> str:
+        """index_learning for async callers"""
+        point = await asyncio.to_thread(self._learning_point, *args, **kwargs)
+        collection_name = tenant_collection('learnings', point[2]['repo_id'])
+        await self.store.aupsert(collection_name, [point[0]], point[1][np.newaxis], [point[2]])
+        self.retrieval_cache.bump(collection_name)
+        return point[0]
+
+    async def aindex_code_graphs(self, *args: Any, **kwargs: Any) -> List[str]:
+        """index_code_graphs for async callers; the pipelined bulk path runs in a worker thread"""
+        return await asyncio.to_thread(self.index_code_graphs, *args, **kwargs)
+
+    async def aindex_import_files(self, *args: Any, **kwargs: Any) -> List[str]:
+        """index_import_files for async callers"""
+        return await asyncio.to_thread(self.index_import_files, *args, **kwargs)
+
+    async def aindex_learnings(self, *args: Any, **kwargs: Any) -> List[str]:
+        """index_learnings for async callers"""
+        return await asyncio.to_thread(self.index_learnings, *args, **kwargs)
+
+    # Bulk indexing
+
+    def index_code_graphs(
+        self,
+        records: Iterable[Tuple[str, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+    ) -> List[str]:
+        """Index many (file_path, graph_data) records; returns point IDs in input order"""
+        records = list(records)
+        repo_id = self._repo(repo_id)
+        provenance = self._provenance(repo_id, generation)
+        ids = [point_id('code_graph', file_path, repo_id) for file_path, _ in records]
+        texts = [self.embedding_service.code_graph_text(graph_data) for _, graph_data in records]
+        payloads = [
+            {**self._code_graph_payload(file_path, graph_data), **provenance}
+            for file_path, graph_data in records
+        ]
+        return self._bulk_index(tenant_collection('code_graphs', repo_id), ids, texts, payloads, batch_size, progress)
+
+    def index_import_files(
+        self,
+        records: Iterable[Tuple[str, str, List[str]]],
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        repo_id: Optional[str] = None,
+        generation: Optional[str] = None,
+    ) -> List[str]:
+        """Index many (file_path, source_code, imports) records; returns point IDs in input order"""
+        records = list(records)
+        repo_id = self._repo(repo_id)
+        provenance = self._provenance(repo_id, generation)
+        ids = [point_id('import_file', record[0], repo_id) for record in records]
+        texts = [self.embedding_service.import_file_text(*record) for record in records]
+        payloads = [{**self._import_file_payload(*record), **provenance} for record in records]
+        return self._bulk_index(tenant_collection('import_files', repo_id), ids, texts, payloads, batch_size, progress)
+
+    def index_learnings(
+        self,
+        records: Iterable[Dict[str, str]],
+        batch_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        repo_id: Optional[str] = None,
+    ) -> List[str]:
+        """Index many learnings given as index_learning keyword arguments"""
+        records = list(records)
+        repo_id = self._repo(repo_id)
+        provenance = self._provenance(repo_id, None)
+        ids = [
+            point_id('learning', _learning_key(r['commit_msg'], r['bot_comment'], r.get('code_context', "")), repo_id)
+            for r in records
+        ]
+        texts = [
+            self.embedding_service.learning_text(
+                r['commit_msg'], r['bot_comment'], r.get('user_feedback', ""), r.get('code_context', "")
+            )
+            for r in records
+        ]
+        payloads = [{**self._learning_payload(**r), **provenance} for r in records]
+        return self._bulk_index(tenant_collection('learnings', repo_id), ids, texts, payloads, batch_size, progress)
+
+    # Garbage collection
+
+    def sweep_stale(self, repo_id: Optional[str], generation: str, collections: Iterable[str] = FILE_COLLECTIONS):
+        """
+        Delete a repo's file points that were not written by the given
+        generation (e.g. the commit a full re-index ran at), i.e. points for
+        files that no longer exist. Only run after every live file has been
+        indexed with that generation.
+        """
+        repo_id = self._repo(repo_id)
+        for collection_name in collections:
+            collection_name = tenant_collection(collection_name, repo_id)
+            self.store.delete(collection_name, must={'repo_id': repo_id}, must_not={'generation': generation})
+            self.retrieval_cache.bump(collection_name)
+            print(f"Swept stale points for {repo_id or 'default repo'} from {collection_name}")
+
+    def remove_files(self, file_paths: List[str], repo_id: Optional[str] = None, collections: Iterable[str] = FILE_COLLECTIONS):
+        """Delete the points of files removed since they were indexed (incremental updates)"""
+        if not file_paths:
+            return
+        repo_id = self._repo(repo_id)
+        for collection_name in collections:
+            collection_name = tenant_collection(collection_name, repo_id)
+            self.store.delete(collection_name, must={'repo_id': repo_id, 'file_path': list(file_paths)})
+            self.retrieval_cache.bump(collection_name)
+
+    def _bulk_index(
+        self,
+        collection_name: str,
+        ids: List[str],
+        texts: List[str],
+        payloads: List[Dict[str, Any]],
+        batch_size: Optional[int],
+        progress: Optional[ProgressCallback],
+    ) -> List[str]:
+        """
+        Embed texts a batch at a time and upsert the points in chunks.
+
+        Upserts are sent with wait=False from a small thread pool, so the
+        next batch is encoded while earlier chunks are still in flight; the
+        number of pending requests is bounded to keep memory flat. The last
+        chunk goes out with wait=True once the others are acknowledged, so
+        everything is applied (and cached retrievals invalidated) by return.
+        """
+        total = len(texts)
+        batch_size = batch_size or max(settings.embedding_batch_size, settings.qdrant_upsert_batch_size)
+        chunk_size = settings.qdrant_upsert_batch_size
+        parallel = max(1, settings.qdrant_upsert_parallel)
+
+        pending: List[Future] = []
+        try:
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                for start in range(0, total, batch_size):
+                    end = min(start + batch_size, total)
+                    embeddings = self.embedding_service.embed_batch(texts[start:end])
+
+                    for chunk_start in range(start, end, chunk_size):
+                        chunk_end = min(chunk_start + chunk_size, end)
+                        chunk = (
+                            collection_name,
+                            ids[chunk_start:chunk_end],
+                            embeddings[chunk_start - start:chunk_end - start],
+                            payloads[chunk_start:chunk_end],
+                        )
+                        if chunk_end == total:
+                            # Barrier: updates apply in order, so once this one is
+                            # applied every earlier acknowledged chunk is too
+                            for future in pending:
+                                future.result()
+                            pending.clear()
+                            self.store.upsert(*chunk, wait=True)
+                            continue
+                        if len(pending) >= parallel * 2:
+                            pending.pop(0).result()
+                        pending.append(executor.submit(self.store.upsert, *chunk, wait=False))
+
+                    if progress is not None:
+                        progress(end, total)
+                    else:
+                        print(f"Indexed {end}/{total} points into {collection_name}")
+        finally:
+            # Also after a failed chunk, since earlier ones may already be applied
+            self.retrieval_cache.bump(collection_name)
 
-        qdrant_client.upsert(collection_name='learnings', points=[point])
-        return point.id
\ No newline at end of file
+        return ids
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+# Payload conditions as {field: value}; a list value matches any of its items
+Conditions = Dict[str, Union[str, int, bool, Sequence[Any]]]
+
+# Collections VectorIndexer writes and VectorRetriever reads
+COLLECTIONS = ("code_graphs", "import_files", "learnings")
+
+# Payload field naming the repository (tenant) a point belongs to
+TENANT_FIELD = "repo_id"
+
+# Joins a collection and a repository slug in dedicated collection names
+TENANT_SEPARATOR = "__"
+
+
+def tenant_collection(collection_name: str, repo_id: str) -> str:
+    """
+    Collection holding repo_id's points: a dedicated one for repositories
+    listed in settings.vector_dedicated_repos, else the shared one.
+    """
+    from src.utils.config import settings
+
+    if repo_id not in settings.vector_dedicated_repos:
+        return collection_name
+    slug = re.sub(r"[^a-z0-9]+", "_", repo_id.lower()).strip("_")
+    digest = hashlib.sha1(repo_id.encode("utf-8"), usedforsecurity=False).hexdigest()[:8]
+    return f"{collection_name}{TENANT_SEPARATOR}{slug}_{digest}"
+
+
+def base_collection(collection_name: str) -> str:
+    """Shared collection a (possibly dedicated) collection name belongs to"""
+    return collection_name.split(TENANT_SEPARATOR, 1)[0]
+
+
+class VectorStore(ABC):
+    """
+    Storage backend behind VectorIndexer and VectorRetriever.
+
+    Filters are plain {field: value} conditions: every must condition has to
+    hold and no must_not condition may. Writing to a collection that does
+    not exist yet (a dedicated tenant collection) creates it; reading one
+    finds nothing. Backends implement the abstract blocking methods; the
+    async ones default to running those in a worker thread, and backends
+    with a native async client override them.
+    """
+
+    @abstractmethod
+    def initialize_collections(self, dimension: int, collection_names: Iterable[str] = ()):
+        """Create any missing collection (default: the shared COLLECTIONS)"""
+
+    @abstractmethod
+    def upsert(
+        self,
+        collection_name: str,
+        ids: List[str],
+        vectors: np.ndarray,
+        payloads: List[Dict[str, Any]],
+        wait: bool = True,
+    ):
+        """Insert points, replacing any with the same ID"""
+
+    @abstractmethod
+    def search(
+        self,
+        collection_name: str,
+        vector: np.ndarray,
+        limit: int,
+        must: Optional[Conditions] = None,
+        must_not: Optional[Conditions] = None,
+    ) -> List[Dict[str, Any]]:
+        """Payloads of the limit nearest points (cosine) passing the filter, best first"""
+
+    @abstractmethod
+    def fetch(
+        self,
+        collection_name: str,
+        must: Optional[Conditions] = None,
+        must_not: Optional[Conditions] = None,
+    ) -> List[Dict[str, Any]]:
+        """Payloads of every point passing the filter"""
+
+    @abstractmethod
+    def delete(
+        self,
+        collection_name: str,
+        must: Optional[Conditions] = None,
+        must_not: Optional[Conditions] = None,
+    ):
+        """Delete every point passing the filter"""
+
+    @abstractmethod
+    def count(self, collection_name: str) -> int:
+        """Number of points in the collection, 0 when it does not exist"""
+
+    async def aupsert(self, *args: Any, **kwargs: Any):
+        await asyncio.to_thread(self.upsert, *args, **kwargs)
+
+    async def asearch(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.search, *args, **kwargs)
+
+    async def afetch(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.fetch, *args, **kwargs)
+
+
+_shared_store: Optional[VectorStore] = None
+_shared_lock = threading.Lock()
+
+
+def create_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """Build the backend named by settings.vector_store_backend (qdrant or local)"""
+    from src.utils.config import settings
+
+    backend = backend or settings.vector_store_backend
+    if backend == "qdrant":
+        from src.db.qdrant_store import QdrantStore
+
+        return QdrantStore()
+    if backend == "local":
+        from src.db.local_vector_store import LocalVectorStore
+
+        return LocalVectorStore.from_settings()
+    raise ValueError(f"Unknown vector store backend {backend!r}, expected qdrant or local")
+
+
+def get_vector_store() -> VectorStore:
+    """Process-wide vector store for the configured backend"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = create_vector_store()
+    return _shared_store
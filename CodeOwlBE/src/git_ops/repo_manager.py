@@ -4,6 +4,8 @@ from pathlib import Path
 
 from git import Repo
 
+from src.services.ast.incremental import parse_unified_diff
+
 class RepoManager:
     def __init__(self, temp_dir: str):
         self.temp_dir = Path(temp_dir)
@@ -83,6 +85,13 @@ class RepoManager:
         
         return {"full_diff": diff, "diff_files": normalized_files}
     
+    def get_diff_hunks(self, repo_path, old_ref: str, new_ref: str):
+        """Per-file line hunks between two commits, e.g. the old and new PR head on synchronize"""
+        repo = Repo(repo_path)
+        # Zero context lines so every hunk covers exactly the changed lines
+        diff = repo.git.diff(old_ref, new_ref, unified=0, no_color=True)
+        return parse_unified_diff(diff)
+
     def get_file_content(self, repo_path: Path, branch: str, file_path: str ):
         repo = Repo(repo_path)
         return repo.git.show(f"origin/{branch}:{file_path}")
@@ -1,10 +1,45 @@
 from .parser import SimpleASTParser, LANGUAGE_MAP, LANGUAGE_MODULES
-from .graph_builder import build_simple_graph, analyze_cross_file_imports
+from .graph_builder import build_code_graph, build_simple_graph, analyze_cross_file_imports
+from .code_graph import CodeGraph, EdgeKind, NodeKind, merge_graphs
+from .analysis_cache import AnalysisCache, git_blob_sha
+from .incremental import AnalysisUnit, compute_hunks, hunks_to_edits, parse_unified_diff
+from .parallel import ParallelParser, iter_source_files
+from .import_resolver import ImportResolver
+from .symbol_index import Definition, SymbolIndex, module_name
+from .impact import ImpactAnalyzer, ImpactedSymbol, IntervalTree
+from .symbols import ClassSymbol, FunctionSymbol, SourceBuffer, Symbol
+from .query_engine import QueryExtractor, analyze_tree
 
 __all__ = [
     "SimpleASTParser",
     "LANGUAGE_MAP",
     "LANGUAGE_MODULES",
+    "build_code_graph",
     "build_simple_graph",
     "analyze_cross_file_imports",
+    "CodeGraph",
+    "EdgeKind",
+    "NodeKind",
+    "merge_graphs",
+    "AnalysisCache",
+    "git_blob_sha",
+    "AnalysisUnit",
+    "compute_hunks",
+    "hunks_to_edits",
+    "parse_unified_diff",
+    "ParallelParser",
+    "iter_source_files",
+    "ImportResolver",
+    "Definition",
+    "SymbolIndex",
+    "module_name",
+    "ImpactAnalyzer",
+    "ImpactedSymbol",
+    "IntervalTree",
+    "SourceBuffer",
+    "Symbol",
+    "FunctionSymbol",
+    "ClassSymbol",
+    "QueryExtractor",
+    "analyze_tree",
 ]
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .code_graph import CodeGraph
+from .symbols import SourceBuffer, pack_symbols, unpack_symbols
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Compute the git blob SHA-1 of file contents"""
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data, usedforsecurity=False).hexdigest()
+
+
+def pack_analysis(analysis: Dict[str, Any], graph: CodeGraph, file_path: str) -> Dict[str, Any]:
+    """
+    Compact, path-independent form of a file's analysis and graph.
+
+    Symbol records keep only their byte spans; unpack_analysis rebuilds them
+    over the file's bytes.
+    """
+    fields = {k: v for k, v in analysis.items() if k not in ("file_path", "functions", "classes")}
+    return {
+        "analysis": fields,
+        "functions": pack_symbols(analysis["functions"]),
+        "classes": pack_symbols(analysis["classes"]),
+        "graph": graph.to_payload(file_path),
+    }
+
+
+def unpack_analysis(
+    payload: Dict[str, Any], file_path: str, source: SourceBuffer
+) -> Tuple[Dict[str, Any], CodeGraph]:
+    """Rebuild (semantic_analysis, graph) for file_path from pack_analysis output"""
+    fields = payload["analysis"]
+    analysis = {
+        "file_path": file_path,
+        "language": fields["language"],
+        "functions": unpack_symbols(source, payload["functions"]),
+        "classes": unpack_symbols(source, payload["classes"]),
+        "imports": list(fields["imports"]),
+        "analysis_method": fields["analysis_method"],
+    }
+    return analysis, CodeGraph.from_payload(payload["graph"], file_path)
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of per-file analysis and graph.
+
+    Entries are keyed by (language, grammar version, git blob SHA) and stored
+    path-independent, so the same blob at another path is still a hit. A
+    bounded in-memory LRU sits in front of a zlib-compressed SQLite store
+    that evicts least recently used entries once it exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./.cache/analysis",
+        max_bytes: int = 512 * 1024 * 1024,
+        memory_entries: int = 1024,
+    ):
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(Path(cache_dir) / "analysis.sqlite3"), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # The store is shared by every parse worker, so its total size lives in
+        # the database itself, kept current by triggers, not in a per-process counter
+        self._db.executescript(
+            "BEGIN IMMEDIATE;"
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);"
+            "INSERT OR IGNORE INTO totals VALUES (0, (SELECT COALESCE(SUM(size), 0) FROM entries));"
+            "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN "
+            "UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0; END;"
+            "COMMIT;"
+        )
+
+    @classmethod
+    def from_settings(cls) -> "AnalysisCache":
+        """Build a cache sized from application settings"""
+        from src.utils.config import settings
+
+        return cls(
+            cache_dir=settings.analysis_cache_dir,
+            max_bytes=settings.analysis_cache_max_bytes,
+            memory_entries=settings.analysis_cache_memory_entries,
+        )
+
+    @staticmethod
+    def make_key(lang: str, grammar_version: str, blob_sha: str) -> str:
+        return f"{lang}:{grammar_version}:{blob_sha}"
+
+    def get(
+        self, lang: str, grammar_version: str, blob_sha: str, file_path: str, source: SourceBuffer
+    ) -> Optional[Tuple[Dict[str, Any], CodeGraph]]:
+        """
+        Return (semantic_analysis, graph) for file_path, or None on a miss.
+
+        source is the file's bytes; cached symbols are spans over it.
+        """
+        key = self.make_key(lang, grammar_version, blob_sha)
+
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                row = self._db.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._db.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+                self._db.commit()
+                payload = json.loads(zlib.decompress(row[0]))
+                self._remember(key, payload)
+                self.disk_hits += 1
+
+        return unpack_analysis(payload, file_path, source)
+
+    def put(
+        self,
+        lang: str,
+        grammar_version: str,
+        blob_sha: str,
+        file_path: str,
+        analysis: Dict[str, Any],
+        graph: CodeGraph,
+    ):
+        """Store a file's analysis and graph under its content key"""
+        key = self.make_key(lang, grammar_version, blob_sha)
+        payload = pack_analysis(analysis, graph, file_path)
+        value = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+
+        with self._lock:
+            # The memory tier is filled on reads; drop any stale copy of this key
+            self._memory.pop(key, None)
+            # An upsert, not INSERT OR REPLACE: REPLACE deletes without firing the delete trigger
+            self._db.execute(
+                "INSERT INTO entries (key, value, size, accessed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, accessed_at = excluded.accessed_at",
+                (key, value, len(value), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current sizes"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self.disk_bytes(),
+        }
+
+    def disk_bytes(self) -> int:
+        """Size of the shared on-disk store, as written by every process"""
+        return self._db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def _remember(self, key: str, payload: Dict[str, Any]):
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used rows until the store fits in max_bytes"""
+        disk_bytes = self.disk_bytes()
+        while disk_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                disk_bytes -= size
+                self.evictions += 1
+                if disk_bytes <= self.max_bytes:
+                    break
@@ -1,31 +1,81 @@
-from typing import Any, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from tree_sitter import Language, Parser
 
+from .incremental import Hunk, TextEdit, compute_hunks, hunks_to_edits
+from .symbols import SourceBuffer
+
 
 class BaseParser:
     """Base class for AST parsing with common utilities"""
 
-    def __init__(self, language_module, language_name: str):
-        self.language = Language(language_module.language())
+    def __init__(self, language_module, language_name: str, language_function=None):
+        self.language = Language((language_function or language_module.language)())
         self.parser = Parser(self.language)
         self.lang_name = language_name
+        # file_path -> (tree, source bytes) from the last incremental parse
+        self.previous_trees: Dict[str, Tuple[Any, bytes]] = {}
 
-    def parse_file(self, file_path: str) -> Tuple[Any, str]:
+    def parse_file(self, file_path: str) -> Tuple[Any, SourceBuffer]:
         """Parse a file and return (tree, source_code)"""
         with open(file_path, "rb") as f:
             source_code = f.read()
 
+        return self.parse_bytes(source_code)
+
+    def parse_bytes(self, source_code: bytes) -> Tuple[Any, SourceBuffer]:
+        """
+        Parse raw file contents and return (tree, source_code).
+
+        source_code is a SourceBuffer over the same bytes, so node byte
+        offsets slice it correctly without decoding the whole file.
+        """
         tree = self.parser.parse(source_code)
+        return tree, SourceBuffer(source_code)
+
+    def parse_incremental(
+        self, file_path: str, source_code: bytes, hunks: Optional[List[Hunk]] = None
+    ) -> Tuple[Any, SourceBuffer, Optional[List[TextEdit]], List[Tuple[int, int]]]:
+        """
+        Reparse a file against its previous tree.
+
+        The hunks between the previous and new contents (computed when not
+        given) become Tree.edit calls, and the old tree is passed to the
+        parser. Returns (tree, source_code, edits, changed_ranges); edits is
+        None when the file had to be parsed from scratch.
+        """
+        edits = None
+        previous = self.previous_trees.get(file_path)
+        if previous is not None:
+            old_tree, old_source = previous
+            if hunks is None:
+                hunks = compute_hunks(old_source, source_code)
+            edits = hunks_to_edits(old_source, source_code, hunks)
+
+        if edits is None:
+            tree = self.parser.parse(source_code)
+            changed_ranges = []
+        else:
+            for edit in reversed(edits):
+                old_tree.edit(*edit)
+            tree = self.parser.parse(source_code, old_tree)
+            changed_ranges = [
+                (r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)
+            ]
 
-        if isinstance(source_code, bytes):
-            source_code = source_code.decode("utf-8")
+        self.previous_trees[file_path] = (tree, source_code)
+        return tree, SourceBuffer(source_code), edits, changed_ranges
 
-        return tree, source_code
+    def forget(self, file_path: str):
+        """Drop the retained tree for a file"""
+        self.previous_trees.pop(file_path, None)
 
     @staticmethod
-    def node_text(node, source_code: str) -> str:
+    def node_text(node, source_code) -> str:
         """Extract text from a node"""
         try:
-            return source_code[node.start_byte:node.end_byte]
+            if isinstance(source_code, SourceBuffer):
+                return source_code.text(node.start_byte, node.end_byte)
+            # Decoded text cannot be sliced with byte offsets; use the node's own bytes
+            return node.text.decode("utf-8", "replace")
         except Exception:
             return ""
\ No newline at end of file
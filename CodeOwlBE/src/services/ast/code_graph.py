@@ -0,0 +1,309 @@
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+
+class NodeKind(IntEnum):
+    FILE = 0
+    FUNCTION = 1
+    METHOD = 2
+    CLASS = 3
+    STRUCT = 4
+    INTERFACE = 5
+    TRAIT = 6
+    IMPL = 7
+    IMPORT = 8
+    CALL = 9
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+class EdgeKind(IntEnum):
+    CONTAINS = 0
+    USES = 1
+    IMPORTS = 2
+    CALLS = 3
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+NODE_KINDS = {kind.label: kind for kind in NodeKind}
+EDGE_KINDS = {kind.label: kind for kind in EdgeKind}
+
+# Node keys pack (name id, file id, kind) into one int: kind in 4 bits, file id in 32
+_KIND_BITS = 4
+_FILE_BITS = 32
+
+
+class CodeGraph:
+    """
+    Compact code graph with interned strings and integer node/edge kinds.
+
+    A node is (file, kind, name) with both strings interned, stored in
+    parallel int arrays; edges are appended to arrays and deduplicated into
+    forward and reverse CSR adjacency (NumPy) on first query. Use
+    to_networkx() only where a networkx graph is really needed.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        self._node_file = array("i")
+        self._node_kind = array("b")
+        self._node_name = array("i")
+        self._node_ids: Dict[int, int] = {}
+
+        self._edge_src = array("i")
+        self._edge_dst = array("i")
+        self._edge_kind = array("b")
+
+        # (forward, reverse) CSR, each (indptr, indices, kinds); None when stale
+        self._csr: Optional[Tuple[Tuple[np.ndarray, ...], Tuple[np.ndarray, ...]]] = None
+
+    # Building
+
+    def intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def _add_node_ids(self, file_id: int, kind: int, name_id: int) -> int:
+        key = (((name_id << _FILE_BITS) | file_id) << _KIND_BITS) | kind
+        node = self._node_ids.get(key)
+        if node is None:
+            node = self._node_ids[key] = len(self._node_kind)
+            self._node_file.append(file_id)
+            self._node_kind.append(kind)
+            self._node_name.append(name_id)
+            self._csr = None
+        return node
+
+    def add_node(self, file_path: str, kind: NodeKind, name: str = "") -> int:
+        """Add (or find) a node and return its id"""
+        return self._add_node_ids(self.intern(file_path), kind, self.intern(name))
+
+    def add_edge(self, src: int, dst: int, kind: EdgeKind):
+        """Add an edge; a repeated (src, dst) keeps the latest kind"""
+        self._edge_src.append(src)
+        self._edge_dst.append(dst)
+        self._edge_kind.append(kind)
+        self._csr = None
+
+    def find_node(self, file_path: str, kind: NodeKind, name: str = "") -> Optional[int]:
+        file_id = self._string_ids.get(file_path)
+        name_id = self._string_ids.get(name)
+        if file_id is None or name_id is None:
+            return None
+        return self._node_ids.get((((name_id << _FILE_BITS) | file_id) << _KIND_BITS) | kind)
+
+    def merge(self, other: "CodeGraph") -> "CodeGraph":
+        """Add every node and edge of another graph into this one, in place"""
+        string_map = [self.intern(s) for s in other.strings]
+        node_map = np.fromiter(
+            (
+                self._add_node_ids(string_map[f], k, string_map[n])
+                for f, k, n in zip(other._node_file, other._node_kind, other._node_name)
+            ),
+            dtype=np.int32,
+            count=len(other._node_kind),
+        )
+        if len(other._edge_src):
+            src = node_map[np.frombuffer(other._edge_src, dtype=np.int32)]
+            dst = node_map[np.frombuffer(other._edge_dst, dtype=np.int32)]
+            self._edge_src.frombytes(src.tobytes())
+            self._edge_dst.frombytes(dst.tobytes())
+            self._edge_kind.frombytes(other._edge_kind.tobytes())
+            self._csr = None
+        return self
+
+    # Inspection
+
+    def number_of_nodes(self) -> int:
+        return len(self._node_kind)
+
+    def number_of_edges(self) -> int:
+        return len(self._adjacency()[0][1])
+
+    def __len__(self) -> int:
+        return self.number_of_nodes()
+
+    def node_kind(self, node: int) -> NodeKind:
+        return NodeKind(self._node_kind[node])
+
+    def node_name(self, node: int) -> str:
+        return self.strings[self._node_name[node]]
+
+    def node_file(self, node: int) -> str:
+        return self.strings[self._node_file[node]]
+
+    def label(self, node: int) -> str:
+        """Legacy string label, e.g. 'src/app.py::function::main'"""
+        kind = NodeKind(self._node_kind[node])
+        file_path = self.strings[self._node_file[node]]
+        if kind == NodeKind.FILE:
+            return f"{file_path}::file"
+        return f"{file_path}::{kind.label}::{self.strings[self._node_name[node]]}"
+
+    def node_attrs(self, node: int) -> Dict[str, Any]:
+        kind = NodeKind(self._node_kind[node])
+        attrs: Dict[str, Any] = {"type": kind.label}
+        if kind == NodeKind.IMPORT:
+            attrs["text"] = self.node_name(node)
+        elif kind != NodeKind.FILE:
+            attrs["name"] = self.node_name(node)
+        return attrs
+
+    def nodes_of_kind(self, *kinds: NodeKind) -> np.ndarray:
+        node_kinds = np.frombuffer(self._node_kind, dtype=np.int8)
+        return np.flatnonzero(np.isin(node_kinds, [int(k) for k in kinds]))
+
+    def edges(self) -> Iterable[Tuple[int, int, EdgeKind]]:
+        indptr, indices, kinds = self._adjacency()[0]
+        sources = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+        for src, dst, kind in zip(sources.tolist(), indices.tolist(), kinds.tolist()):
+            yield src, dst, EdgeKind(kind)
+
+    def successors(self, node: int, kinds: Optional[Sequence[EdgeKind]] = None) -> np.ndarray:
+        return self._neighbors(self._adjacency()[0], node, kinds)
+
+    def predecessors(self, node: int, kinds: Optional[Sequence[EdgeKind]] = None) -> np.ndarray:
+        return self._neighbors(self._adjacency()[1], node, kinds)
+
+    @staticmethod
+    def _neighbors(csr, node: int, kinds) -> np.ndarray:
+        indptr, indices, edge_kinds = csr
+        start, end = indptr[node], indptr[node + 1]
+        neighbors = indices[start:end]
+        if kinds is not None:
+            neighbors = neighbors[np.isin(edge_kinds[start:end], [int(k) for k in kinds])]
+        return neighbors
+
+    def k_hop(
+        self,
+        seeds: Iterable[int],
+        k: int = 1,
+        direction: str = "both",
+        kinds: Optional[Sequence[EdgeKind]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Breadth-first expansion from seeds over at most k edges.
+
+        direction is "forward" (callees, contents), "reverse" (callers,
+        containers) or "both". Returns (node_ids, hops) with hops[i] the
+        distance of node_ids[i] from the nearest seed.
+        """
+        forward, reverse = self._adjacency()
+        graphs = {"forward": [forward], "reverse": [reverse], "both": [forward, reverse]}[direction]
+        kind_filter = [int(kind) for kind in kinds] if kinds is not None else None
+
+        hops = np.full(self.number_of_nodes(), -1, dtype=np.int32)
+        frontier = np.unique(np.fromiter(seeds, dtype=np.int32))
+        hops[frontier] = 0
+
+        for hop in range(1, k + 1):
+            if not len(frontier):
+                break
+            reached = []
+            for indptr, indices, edge_kinds in graphs:
+                starts, ends = indptr[frontier], indptr[frontier + 1]
+                counts = ends - starts
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # Flat positions of every outgoing edge of the frontier
+                offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+                positions = offsets + np.arange(total)
+                if kind_filter is not None:
+                    positions = positions[np.isin(edge_kinds[positions], kind_filter)]
+                reached.append(indices[positions])
+            if not reached:
+                break
+            frontier = np.unique(np.concatenate(reached))
+            frontier = frontier[hops[frontier] < 0]
+            hops[frontier] = hop
+
+        node_ids = np.flatnonzero(hops >= 0)
+        return node_ids, hops[node_ids]
+
+    def _adjacency(self):
+        """Deduplicated forward and reverse CSR, rebuilt lazily after changes"""
+        if self._csr is None:
+            n = self.number_of_nodes()
+            src = np.frombuffer(self._edge_src, dtype=np.int32)
+            dst = np.frombuffer(self._edge_dst, dtype=np.int32)
+            kinds = np.frombuffer(self._edge_kind, dtype=np.int8)
+
+            # Keep the last occurrence of each (src, dst), like repeated add_edge on a DiGraph
+            keys = src.astype(np.int64) * max(n, 1) + dst
+            _, last = np.unique(keys[::-1], return_index=True)
+            keep = len(keys) - 1 - last
+            src, dst, kinds = src[keep], dst[keep], kinds[keep]
+
+            self._csr = (_build_csr(src, dst, kinds, n), _build_csr(dst, src, kinds, n))
+        return self._csr
+
+    # Adapters
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Export to a string-labelled networkx DiGraph"""
+        graph = nx.DiGraph()
+        labels = [self.label(node) for node in range(self.number_of_nodes())]
+        graph.add_nodes_from(
+            (labels[node], self.node_attrs(node)) for node in range(self.number_of_nodes())
+        )
+        graph.add_edges_from(
+            (labels[src], labels[dst], {"type": kind.label}) for src, dst, kind in self.edges()
+        )
+        return graph
+
+    def to_payload(self, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Plain-list form for caches and worker results. With file_path, that
+        string is stored as None so the payload can be reused at another path.
+        """
+        strings = list(self.strings)
+        if file_path is not None and file_path in self._string_ids:
+            strings[self._string_ids[file_path]] = None
+        return {
+            "strings": strings,
+            "nodes": [self._node_file.tolist(), self._node_kind.tolist(), self._node_name.tolist()],
+            "edges": [self._edge_src.tolist(), self._edge_dst.tolist(), self._edge_kind.tolist()],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], file_path: Optional[str] = None) -> "CodeGraph":
+        graph = cls()
+        for value in payload["strings"]:
+            graph.intern(file_path if value is None else value)
+        for f, k, n in zip(*payload["nodes"]):
+            graph._add_node_ids(f, k, n)
+        src, dst, kinds = payload["edges"]
+        graph._edge_src.extend(src)
+        graph._edge_dst.extend(dst)
+        graph._edge_kind.extend(kinds)
+        return graph
+
+
+def _build_csr(src: np.ndarray, dst: np.ndarray, kinds: np.ndarray, n: int):
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order], kinds[order]
+
+
+def merge_graphs(graphs: Iterable[CodeGraph]) -> CodeGraph:
+    """Merge per-file graphs into one repository graph"""
+    merged = CodeGraph()
+    for graph in graphs:
+        merged.merge(graph)
+    return merged
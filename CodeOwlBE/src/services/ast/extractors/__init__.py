@@ -1,11 +0,0 @@
-from .python_extractor import PythonExtractor
-from .javascript_extractor import JavaScriptExtractor
-from .go_extractor import GoExtractor
-from .rust_extractor import RustExtractor
-
-__all__ = [
-    "PythonExtractor",
-    "JavaScriptExtractor",
-    "GoExtractor",
-    "RustExtractor",
-]
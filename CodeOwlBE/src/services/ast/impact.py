@@ -0,0 +1,193 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .code_graph import NODE_KINDS, CodeGraph, EdgeKind, NodeKind
+from .incremental import Hunk
+from .symbol_index import Definition, SymbolIndex
+
+
+# Node kinds that stand for definitions (call and import nodes are not reported)
+DEFINITION_KINDS = (
+    NodeKind.FUNCTION, NodeKind.METHOD, NodeKind.CLASS, NodeKind.STRUCT,
+    NodeKind.INTERFACE, NodeKind.TRAIT, NodeKind.IMPL,
+)
+
+# Relation order used for ranking at equal distance
+RELATIONS = ("changed", "caller", "callee")
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over inclusive (start, end, value) ranges.
+
+    overlap(lo, hi) visits one node per level plus the matches, so a lookup
+    costs O(log n + k) however many definitions the file has.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[int, int, Any]]):
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        self.center = points[len(points) // 2]
+
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        self.by_start = sorted(here, key=lambda iv: iv[0])
+        self.by_end = sorted(here, key=lambda iv: -iv[1])
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlap(self, lo: int, hi: int) -> List[Any]:
+        """Values of every interval intersecting [lo, hi]"""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if hi < node.center:
+                for start, _, value in node.by_start:
+                    if start > hi:
+                        break
+                    found.append(value)
+                if node.left is not None:
+                    stack.append(node.left)
+            elif lo > node.center:
+                for _, end, value in node.by_end:
+                    if end < lo:
+                        break
+                    found.append(value)
+                if node.right is not None:
+                    stack.append(node.right)
+            else:
+                found.extend(value for _, _, value in node.by_start)
+                if node.left is not None:
+                    stack.append(node.left)
+                if node.right is not None:
+                    stack.append(node.right)
+        return found
+
+
+class ImpactedSymbol(NamedTuple):
+    """A definition affected by a change, with how it was reached"""
+
+    definition: Definition
+    relation: str
+    hops: int
+    score: float
+
+
+def hunk_line_ranges(hunks: Iterable[Hunk]) -> List[Tuple[int, int]]:
+    """
+    New-file line ranges (1-based, inclusive) touched by diff hunks. A pure
+    deletion marks the lines on either side of where text was removed.
+    """
+    ranges = []
+    for _, _, new_start, new_count in hunks:
+        if new_count:
+            ranges.append((new_start, new_start + new_count - 1))
+        else:
+            ranges.append((max(new_start, 1), new_start + 1))
+    return ranges
+
+
+class ImpactAnalyzer:
+    """
+    Maps a diff to the definitions it touches and the code around them.
+
+    Changed lines are matched against a per-file interval tree of
+    definition line spans (built lazily from the SymbolIndex), then the
+    CodeGraph's resolved call edges are followed up to k hops towards
+    callers and callees. Work grows with the size of the change, not the
+    repository.
+    """
+
+    def __init__(self, index: SymbolIndex, graph: CodeGraph):
+        self.index = index
+        self.graph = graph
+        self._trees: Dict[str, Optional[IntervalTree]] = {}
+
+    def forget(self, file_path: str):
+        """Drop a file's interval tree after SymbolIndex.update_file"""
+        self._trees.pop(file_path, None)
+
+    def _tree(self, file_path: str) -> Optional[IntervalTree]:
+        if file_path not in self._trees:
+            definitions = self.index.file_definitions(file_path)
+            self._trees[file_path] = IntervalTree(
+                [(d.start_line, d.end_line, d) for d in definitions]
+            ) if definitions else None
+        return self._trees[file_path]
+
+    def changed_symbols(self, file_hunks: Dict[str, List[Hunk]]) -> List[Definition]:
+        """Definitions whose lines overlap a hunk, innermost first within a file"""
+        changed: Dict[Definition, None] = {}
+        for file_path, hunks in file_hunks.items():
+            tree = self._tree(file_path)
+            if tree is None:
+                continue
+            hits: Dict[Definition, None] = {}
+            for lo, hi in hunk_line_ranges(hunks):
+                for definition in tree.overlap(lo, hi):
+                    hits[definition] = None
+            changed.update(
+                (d, None) for d in sorted(hits, key=lambda d: (d.end_line - d.start_line, d.start_line))
+            )
+        return list(changed)
+
+    def analyze(
+        self, file_hunks: Dict[str, List[Hunk]], k: int = 2, limit: Optional[int] = None
+    ) -> List[ImpactedSymbol]:
+        """
+        Ranked definitions affected by a diff, e.g. RepoManager.get_diff_hunks output.
+
+        Changed definitions come first, then callers and callees by hop
+        distance (callers before callees at the same distance); the score
+        halves with every hop.
+        """
+        changed = self.changed_symbols(file_hunks)
+        seeds = []
+        for definition in changed:
+            node = self._node(definition)
+            if node is not None:
+                seeds.append(node)
+
+        results: Dict[Definition, ImpactedSymbol] = {
+            d: ImpactedSymbol(d, "changed", 0, 1.0) for d in changed
+        }
+        if seeds and k > 0:
+            for relation, direction in (("caller", "reverse"), ("callee", "forward")):
+                node_ids, hops = self.graph.k_hop(seeds, k, direction, [EdgeKind.CALLS])
+                for node, hop in zip(node_ids.tolist(), hops.tolist()):
+                    definition = self._definition(node)
+                    if definition is None:
+                        continue
+                    previous = results.get(definition)
+                    if previous is None or (hop, RELATIONS.index(relation)) < (
+                        previous.hops, RELATIONS.index(previous.relation)
+                    ):
+                        results[definition] = ImpactedSymbol(definition, relation, hop, 0.5 ** hop)
+
+        ranked = sorted(
+            results.values(),
+            key=lambda s: (
+                s.hops, RELATIONS.index(s.relation), s.definition.file_path, s.definition.start_line
+            ),
+        )
+        return ranked[:limit] if limit is not None else ranked
+
+    def _node(self, definition: Definition) -> Optional[int]:
+        kind = NODE_KINDS.get(definition.kind)
+        if kind is None:
+            return None
+        return self.graph.find_node(definition.file_path, kind, definition.name)
+
+    def _definition(self, node: int) -> Optional[Definition]:
+        kind = self.graph.node_kind(node)
+        if kind not in DEFINITION_KINDS:
+            return None
+        return self.index.definition(self.graph.node_file(node), kind.label, self.graph.node_name(node))
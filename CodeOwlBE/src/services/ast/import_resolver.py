@@ -0,0 +1,254 @@
+import os
+import posixpath
+import re
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .parallel import SKIP_DIRS
+from .parser import LANGUAGE_MAP
+
+
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# Rust roots whose paths never point into the checkout
+RUST_EXTERNAL = {"std", "core", "alloc"}
+
+GO_MODULE_LINE = re.compile(r"^\s*module\s+(\S+)", re.MULTILINE)
+CARGO_NAME_LINE = re.compile(r'^\s*name\s*=\s*"([^"]+)"', re.MULTILINE)
+
+
+def _parent(path: str) -> str:
+    return posixpath.dirname(path)
+
+
+class ImportResolver:
+    """
+    Maps import strings to repository files using indexes built once.
+
+    The constructor takes every repository-relative path of the checkout and
+    derives Python module names (relative to package roots, top-level
+    directories and the checkout root), Go package directories (from go.mod
+    module paths), Rust module paths per crate and the file set used for
+    JS/TS relative and index resolution.
+    resolve() then only does dict and set lookups, never touching the disk.
+    """
+
+    def __init__(
+        self,
+        file_paths: Iterable[str],
+        go_modules: Optional[Dict[str, str]] = None,
+        rust_crates: Optional[Dict[str, str]] = None,
+    ):
+        self.files: Set[str] = {PurePosixPath(p).as_posix() for p in file_paths}
+        # module path -> directory holding its go.mod
+        self.go_modules: Dict[str, str] = dict(go_modules or {})
+        # crate name (underscored) -> crate source root, e.g. "src"
+        self.rust_crates: Dict[str, str] = {
+            name.replace("-", "_"): root for name, root in (rust_crates or {}).items()
+        }
+
+        self.python_modules: Dict[str, str] = {}
+        self.go_packages: Dict[str, List[str]] = {}
+        self.rust_roots: Set[str] = set()
+        self.rust_modules: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._rust_file_modules: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+        self._index_python()
+        self._index_go()
+        self._index_rust()
+
+    @classmethod
+    def from_checkout(cls, repo_path) -> "ImportResolver":
+        """Walk a checkout once, reading go.mod and Cargo.toml files on the way"""
+        repo_path = Path(repo_path)
+        file_paths: List[str] = []
+        go_modules: Dict[str, str] = {}
+        rust_crates: Dict[str, str] = {}
+
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+            rel_root = Path(root).relative_to(repo_path).as_posix()
+            rel_root = "" if rel_root == "." else rel_root
+            for name in files:
+                rel_path = posixpath.join(rel_root, name)
+                if Path(name).suffix in LANGUAGE_MAP:
+                    file_paths.append(rel_path)
+                elif name == "go.mod":
+                    match = GO_MODULE_LINE.search(_read_text(Path(root) / name))
+                    if match:
+                        go_modules[match.group(1)] = rel_root
+                elif name == "Cargo.toml":
+                    match = CARGO_NAME_LINE.search(_read_text(Path(root) / name))
+                    if match:
+                        rust_crates[match.group(1)] = posixpath.join(rel_root, "src")
+
+        return cls(file_paths, go_modules, rust_crates)
+
+    # Index building
+
+    def _index_python(self):
+        python_files = [p for p in self.files if p.endswith(".py")]
+        packages = {_parent(p) for p in python_files if posixpath.basename(p) == "__init__.py"}
+
+        for path in sorted(python_files):
+            parts = path[:-3].split("/")
+            if parts[-1] == "__init__":
+                parts.pop()
+            if not parts:
+                continue
+
+            # Candidate source roots, most specific first: the nearest non-package
+            # ancestor (namespace-less packages), the top-level directory the file
+            # sits in (a service checked out beside others) and the checkout root
+            depth = len(parts) - 1
+            directory = "/".join(parts[:-1])
+            while directory and directory in packages:
+                directory = _parent(directory)
+                depth -= 1
+            for root_depth in dict.fromkeys((max(depth, 0), 1 if len(parts) > 1 else 0, 0)):
+                self.python_modules.setdefault(".".join(parts[root_depth:]), path)
+
+    def _index_go(self):
+        for path in self.files:
+            if path.endswith(".go") and not path.endswith("_test.go"):
+                self.go_packages.setdefault(_parent(path), []).append(path)
+        for files in self.go_packages.values():
+            files.sort()
+
+    def _index_rust(self):
+        rust_files = [p for p in self.files if p.endswith(".rs")]
+        self.rust_roots = {
+            _parent(p) for p in rust_files if posixpath.basename(p) in ("lib.rs", "main.rs")
+        }
+
+        for path in rust_files:
+            root = _parent(path)
+            while root not in self.rust_roots and root:
+                root = _parent(root)
+            if root not in self.rust_roots:
+                continue
+            relative = path[len(root) + 1:] if root else path
+            parts = relative[:-3].split("/")
+            if parts[-1] == "mod" or (len(parts) == 1 and parts[0] in ("lib", "main")):
+                parts.pop()
+            module = (root, tuple(parts))
+            self.rust_modules.setdefault(module, path)
+            self._rust_file_modules[path] = module
+
+    # Resolution
+
+    def resolve(self, import_name: str, from_file: str, language: Optional[str] = None) -> List[str]:
+        """Repository files an import refers to; empty for external or unknown imports"""
+        language = language or LANGUAGE_MAP.get(PurePosixPath(from_file).suffix)
+        import_name = import_name.strip().strip("\"'`")
+        if not import_name:
+            return []
+        if language == "python":
+            return self._resolve_python(import_name, from_file)
+        if language == "go":
+            return self._resolve_go(import_name)
+        if language == "rust":
+            return self._resolve_rust(import_name, from_file)
+        if language in ("javascript", "typescript"):
+            return self._resolve_js(import_name, from_file)
+        return []
+
+    def _resolve_python(self, import_name: str, from_file: str) -> List[str]:
+        if import_name.startswith("."):
+            level = len(import_name) - len(import_name.lstrip("."))
+            base = _parent(from_file)
+            for _ in range(level - 1):
+                base = _parent(base)
+            # Longest prefix again: `.a` from `from . import a` is a submodule or
+            # else a name defined by the package's __init__.py
+            parts = import_name[level:].split(".") if import_name[level:] else []
+            while True:
+                stem = posixpath.join(base, *parts)
+                for candidate in (f"{stem}.py", posixpath.join(stem, "__init__.py")):
+                    if candidate in self.files and candidate != from_file:
+                        return [candidate]
+                if not parts:
+                    return []
+                parts.pop()
+
+        # Longest dotted prefix that is a module: `import a.b.c` may name an attribute
+        parts = import_name.split(".")
+        while parts:
+            path = self.python_modules.get(".".join(parts))
+            if path is not None:
+                return [path]
+            parts.pop()
+        return []
+
+    def _resolve_go(self, import_name: str) -> List[str]:
+        prefix, rest = import_name, ""
+        while prefix:
+            module_dir = self.go_modules.get(prefix)
+            if module_dir is not None:
+                package_dir = posixpath.join(module_dir, rest) if rest else module_dir
+                return list(self.go_packages.get(package_dir.strip("/"), ()))
+            prefix, _, tail = prefix.rpartition("/")
+            rest = f"{tail}/{rest}" if rest else tail
+        return []
+
+    def _resolve_rust(self, import_name: str, from_file: str) -> List[str]:
+        path = import_name.split("{", 1)[0].split(" as ", 1)[0].rstrip(":*").strip()
+        segments = [s for s in path.split("::") if s]
+        if not segments or segments[0] in RUST_EXTERNAL:
+            return []
+
+        current = self._rust_file_modules.get(from_file)
+        head = segments[0]
+        # Segments that must match a module; 1 for paths that may name an external crate
+        minimum = 0
+        if head == "crate" and current is not None:
+            root, module, segments = current[0], (), segments[1:]
+        elif head in ("self", "super") and current is not None:
+            root, module = current
+            while segments and segments[0] in ("self", "super"):
+                if segments.pop(0) == "super":
+                    module = module[:-1]
+        elif head in self.rust_crates:
+            root, module, segments = self.rust_crates[head], (), segments[1:]
+        elif current is not None:
+            # 2018-edition paths may start at a module of the current crate
+            root, module, minimum = current[0], (), 1
+        else:
+            return []
+
+        # Longest module prefix: the trailing segments are usually items
+        while len(segments) >= minimum:
+            target = self.rust_modules.get((root, module + tuple(segments)))
+            if target is not None:
+                return [target] if target != from_file else []
+            if not segments:
+                break
+            segments = segments[:-1]
+        return []
+
+    def _resolve_js(self, import_name: str, from_file: str) -> List[str]:
+        if not import_name.startswith((".", "/")):
+            return []
+        if import_name.startswith("/"):
+            stem = import_name.lstrip("/")
+        else:
+            stem = posixpath.normpath(posixpath.join(_parent(from_file), import_name))
+
+        candidates = [stem]
+        # TypeScript sources are imported with the emitted .js extension
+        base, ext = posixpath.splitext(stem)
+        if ext in (".js", ".jsx", ".mjs", ".cjs"):
+            candidates += [base + ".ts", base + ".tsx"]
+        candidates += [stem + ext for ext in JS_EXTENSIONS]
+        candidates += [posixpath.join(stem, "index" + ext) for ext in JS_EXTENSIONS]
+        for candidate in candidates:
+            if candidate in self.files:
+                return [candidate]
+        return []
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
@@ -0,0 +1,189 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .symbols import moved_symbol
+
+
+# (old_start, old_count, new_start, new_count), 1-based as in a unified diff
+Hunk = Tuple[int, int, int, int]
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+FILE_HEADER = re.compile(r"^\+\+\+ (?:b/)?(.+)$")
+
+
+class TextEdit(NamedTuple):
+    """A single Tree.edit call, in byte offsets and (row, column) points"""
+
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: Tuple[int, int]
+    old_end_point: Tuple[int, int]
+    new_end_point: Tuple[int, int]
+
+
+def parse_unified_diff(diff_text: str) -> Dict[str, List[Hunk]]:
+    """Collect hunk headers per file from unified diff output (ideally -U0)"""
+    hunks: Dict[str, List[Hunk]] = {}
+    current: Optional[List[Hunk]] = None
+
+    for line in diff_text.splitlines():
+        file_match = FILE_HEADER.match(line)
+        if file_match:
+            path = file_match.group(1).strip()
+            current = None if path == "/dev/null" else hunks.setdefault(path, [])
+            continue
+
+        hunk_match = HUNK_HEADER.match(line)
+        if hunk_match and current is not None:
+            old_start, old_count, new_start, new_count = hunk_match.groups()
+            current.append((
+                int(old_start),
+                int(old_count) if old_count is not None else 1,
+                int(new_start),
+                int(new_count) if new_count is not None else 1,
+            ))
+
+    return hunks
+
+
+def compute_hunks(old: bytes, new: bytes) -> List[Hunk]:
+    """
+    Single line-level hunk spanning everything between the common prefix and
+    suffix, for when no diff is at hand. Linear time, unlike a full diff.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    old_count = len(old_lines) - prefix - suffix
+    new_count = len(new_lines) - prefix - suffix
+    if not old_count and not new_count:
+        return []
+    return [(
+        prefix + 1 if old_count else prefix,
+        old_count,
+        prefix + 1 if new_count else prefix,
+        new_count,
+    )]
+
+
+def _line_starts(data: bytes) -> List[int]:
+    starts = [0]
+    index = data.find(b"\n")
+    while index != -1:
+        starts.append(index + 1)
+        index = data.find(b"\n", index + 1)
+    return starts
+
+
+def _line_offset(line_starts: List[int], line_index: int, size: int) -> int:
+    return line_starts[line_index] if line_index < len(line_starts) else size
+
+
+def _point(line_starts: List[int], byte: int) -> Tuple[int, int]:
+    row = bisect_right(line_starts, byte) - 1
+    return row, byte - line_starts[row]
+
+
+def _extent_end(start_point: Tuple[int, int], text: bytes) -> Tuple[int, int]:
+    """Point reached after inserting text at start_point"""
+    newlines = text.count(b"\n")
+    if not newlines:
+        return start_point[0], start_point[1] + len(text)
+    return start_point[0] + newlines, len(text) - text.rfind(b"\n") - 1
+
+
+def hunks_to_edits(old: bytes, new: bytes, hunks: List[Hunk]) -> Optional[List[TextEdit]]:
+    """
+    Turn line hunks into Tree.edit calls, ordered by position.
+
+    Offsets are in old-file coordinates, so apply the edits last to first.
+
+    Returns None when the hunks do not describe old -> new (for example a
+    stale diff), in which case the caller should parse from scratch.
+    """
+    old_starts, new_starts = _line_starts(old), _line_starts(new)
+    edits: List[TextEdit] = []
+    old_cursor = new_cursor = 0
+
+    for old_start, old_count, new_start, new_count in sorted(hunks):
+        # A zero count means "after line N", which is index N when 0-based
+        old_index = old_start - 1 if old_count else old_start
+        new_index = new_start - 1 if new_count else new_start
+
+        start = _line_offset(old_starts, old_index, len(old))
+        old_end = _line_offset(old_starts, old_index + old_count, len(old))
+        new_start_byte = _line_offset(new_starts, new_index, len(new))
+        new_end = _line_offset(new_starts, new_index + new_count, len(new))
+
+        # Text between hunks must be untouched and line up on both sides
+        if start - old_cursor != new_start_byte - new_cursor:
+            return None
+        if old[old_cursor:start] != new[new_cursor:new_start_byte]:
+            return None
+
+        start_point = _point(old_starts, start)
+        edits.append(TextEdit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=start + (new_end - new_start_byte),
+            start_point=start_point,
+            old_end_point=_point(old_starts, old_end),
+            new_end_point=_extent_end(start_point, new[new_start_byte:new_end]),
+        ))
+        old_cursor, new_cursor = old_end, new_end
+
+    if old[old_cursor:] != new[new_cursor:]:
+        return None
+    return edits
+
+
+class AnalysisUnit:
+    """Extraction results for one top-level node, reusable while it is unchanged"""
+
+    __slots__ = ("start_byte", "end_byte", "start_row", "functions", "classes", "imports", "graph")
+
+    def __init__(self, start_byte, end_byte, start_row, functions, classes, imports, graph):
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+        self.start_row = start_row
+        self.functions = functions
+        self.classes = classes
+        self.imports = imports
+        self.graph = graph
+
+    def moved_to(self, buffer, start_byte: int, start_row: int) -> "AnalysisUnit":
+        """Same unit in a new version of the file; the graph is position-free"""
+        byte_shift = start_byte - self.start_byte
+        line_shift = start_row - self.start_row
+        return AnalysisUnit(
+            start_byte,
+            self.end_byte + byte_shift,
+            start_row,
+            [moved_symbol(s, buffer, byte_shift, line_shift) for s in self.functions],
+            [moved_symbol(s, buffer, byte_shift, line_shift) for s in self.classes],
+            self.imports,
+            self.graph,
+        )
+
+
+def new_ranges(edits: List[TextEdit]) -> List[Tuple[int, int, int]]:
+    """(new_start, new_end, size delta so far) of each edit in new-file coordinates"""
+    ranges = []
+    delta = 0
+    for edit in edits:
+        new_start = edit.start_byte + delta
+        delta += edit.new_end_byte - edit.old_end_byte
+        ranges.append((new_start, new_start + (edit.new_end_byte - edit.start_byte), delta))
+    return ranges
@@ -0,0 +1,202 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .analysis_cache import AnalysisCache, pack_analysis, unpack_analysis
+from .code_graph import CodeGraph, merge_graphs
+from .parser import LANGUAGE_MAP, SimpleASTParser
+from .symbol_index import SymbolIndex
+from .symbols import SourceBuffer
+
+
+# Directories never worth parsing in a full repository walk
+SKIP_DIRS = {".git", "node_modules", "vendor", "target", "dist", "build", "__pycache__", ".venv", "venv"}
+
+# Below this many files the pool start-up and IPC cost more than they save
+MIN_PARALLEL_FILES = 8
+
+# (cache_dir, max_bytes, memory_entries) for an AnalysisCache, or None for no cache
+CacheArgs = Optional[Tuple[str, int, int]]
+
+# Per-process state of pool workers, populated by _init_worker
+_worker_parsers: Dict[str, SimpleASTParser] = {}
+_worker_cache: Optional[AnalysisCache] = None
+
+
+def iter_source_files(repo_path) -> Iterable[str]:
+    """Yield repository-relative paths of every file with a supported extension"""
+    repo_path = Path(repo_path)
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in files:
+            if Path(name).suffix in LANGUAGE_MAP:
+                yield (Path(root) / name).relative_to(repo_path).as_posix()
+
+
+def _init_worker(cache_args: CacheArgs):
+    global _worker_cache
+    _worker_parsers.clear()
+    _worker_cache = AnalysisCache(*cache_args) if cache_args else None
+
+
+def _get_parser(parsers: Dict[str, SimpleASTParser], language: str) -> SimpleASTParser:
+    """One warm parser per language per process (or per inline ParallelParser)"""
+    parser = parsers.get(language)
+    if parser is None:
+        parser = parsers[language] = SimpleASTParser(language)
+    return parser
+
+
+def _analyze_one(
+    repo_path: str,
+    file_path: str,
+    parsers: Dict[str, SimpleASTParser],
+    cache: Optional[AnalysisCache],
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[bytes], Optional[str]]:
+    """
+    Worker task: analyze one file and return (file_path, payload, source, error).
+
+    The payload is the compact pack_analysis form, never a Tree, so it is
+    cheap to pickle back to the parent along with the raw file bytes.
+    """
+    try:
+        language = LANGUAGE_MAP[Path(file_path).suffix]
+        parser = _get_parser(parsers, language)
+        full_path = os.path.join(repo_path, file_path)
+        with open(full_path, "rb") as f:
+            source = f.read()
+        analysis, graph = parser.analyze_path(full_path, cache, source)
+        return file_path, pack_analysis(analysis, graph, full_path), source, None
+    except Exception as e:
+        return file_path, None, None, str(e)
+
+
+def _analyze_chunk(repo_path: str, file_paths: List[str]):
+    """Pool task, run with the worker's parsers and cache"""
+    return [_analyze_one(repo_path, file_path, _worker_parsers, _worker_cache) for file_path in file_paths]
+
+
+class ParallelParser:
+    """
+    Spreads file analysis across a process pool.
+
+    Each worker keeps one parser per language for its whole life and sends
+    back compact payloads; the parent rebuilds the same
+    extract_semantic_analysis dicts and per-file graphs, keyed and labelled
+    by repository-relative path.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        cache_memory_entries: int = 1024,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_memory_entries = cache_memory_entries
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Inline (small batch) runs use this instance's own parsers and cache
+        self._parsers: Dict[str, SimpleASTParser] = {}
+        self._cache: Optional[AnalysisCache] = None
+
+    @classmethod
+    def from_settings(cls) -> "ParallelParser":
+        """Build a pool sized from application settings, sharing the analysis cache"""
+        from src.utils.config import settings
+
+        return cls(
+            max_workers=settings.ast_parse_workers or None,
+            cache_dir=settings.analysis_cache_dir,
+            cache_max_bytes=settings.analysis_cache_max_bytes,
+            cache_memory_entries=settings.analysis_cache_memory_entries,
+        )
+
+    def __enter__(self) -> "ParallelParser":
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    @property
+    def _cache_args(self) -> CacheArgs:
+        if not self.cache_dir:
+            return None
+        return self.cache_dir, self.cache_max_bytes, self.cache_memory_entries
+
+    def _local_cache(self) -> Optional[AnalysisCache]:
+        if self._cache is None and self.cache_dir:
+            self._cache = AnalysisCache(*self._cache_args)
+        return self._cache
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self._cache_args,),
+            )
+        return self._executor
+
+    def analyze_files(
+        self, repo_path, file_paths: Iterable[str]
+    ) -> Dict[str, Tuple[Dict[str, Any], CodeGraph]]:
+        """Analyze repository-relative paths, e.g. RepoManager.get_diff()['diff_files']"""
+        repo_path = str(repo_path)
+        file_paths = [
+            f for f in file_paths
+            if Path(f).suffix in LANGUAGE_MAP and os.path.isfile(os.path.join(repo_path, f))
+        ]
+
+        if len(file_paths) < MIN_PARALLEL_FILES or self.max_workers == 1:
+            cache = self._local_cache()
+            outputs = [_analyze_one(repo_path, f, self._parsers, cache) for f in file_paths]
+        else:
+            # Several files per task keeps IPC overhead low; the spread stays even
+            chunk_size = max(1, min(32, len(file_paths) // (self.max_workers * 4)))
+            chunks = [
+                file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)
+            ]
+            executor = self._get_executor()
+            outputs = [
+                output
+                for chunk_outputs in executor.map(_analyze_chunk, [repo_path] * len(chunks), chunks)
+                for output in chunk_outputs
+            ]
+
+        results = {}
+        for file_path, payload, source, error in outputs:
+            if error is not None:
+                print(f"Failed to analyze {file_path}: {error}")
+                continue
+            results[file_path] = unpack_analysis(payload, file_path, SourceBuffer(source))
+        return results
+
+    def analyze_repository(self, repo_path) -> Dict[str, Tuple[Dict[str, Any], CodeGraph]]:
+        """Analyze every supported file in a checkout"""
+        return self.analyze_files(repo_path, iter_source_files(repo_path))
+
+    def build_repository_graph(
+        self, repo_path
+    ) -> Tuple[Dict[str, Dict[str, Any]], CodeGraph, SymbolIndex]:
+        """
+        Analyze a checkout, merge its per-file graphs into one CodeGraph and
+        link calls to their definitions across files through a SymbolIndex.
+        """
+        results = self.analyze_repository(repo_path)
+        analyses = {file_path: analysis for file_path, (analysis, _) in results.items()}
+        graph = merge_graphs(graph for _, graph in results.values())
+        index = SymbolIndex.from_results(results)
+        index.link_calls(graph)
+        return analyses, graph, index
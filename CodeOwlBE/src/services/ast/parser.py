@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Tuple
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Tuple
 
 import tree_sitter_go as tsgo
 import tree_sitter_javascript as tsjs
@@ -7,7 +8,11 @@ import tree_sitter_rust as tsrust
 import tree_sitter_typescript as tsts
 
 from .base_parser import BaseParser
-from .extractors import PythonExtractor, JavaScriptExtractor, GoExtractor, RustExtractor
+from .analysis_cache import AnalysisCache, git_blob_sha
+from .code_graph import CodeGraph, merge_graphs
+from .incremental import AnalysisUnit, Hunk, new_ranges
+from .symbols import SourceBuffer
+from .query_engine import QueryExtractor, analyze_tree, query_digest
 
 
 # Language modules mapping
@@ -19,6 +24,12 @@ LANGUAGE_MODULES = {
     "rust": tsrust,
 }
 
+# Grammar entry points of modules without a language() function:
+# tree-sitter-typescript ships separate TypeScript and TSX grammars
+LANGUAGE_FUNCTIONS = {
+    "typescript": tsts.language_typescript,
+}
+
 # File extension to language mapping
 LANGUAGE_MAP = {
     ".py": "python",
@@ -28,14 +39,18 @@ LANGUAGE_MAP = {
     ".rs": "rust",
 }
 
-# Extractor mapping
-EXTRACTORS = {
-    "python": PythonExtractor,
-    "javascript": JavaScriptExtractor,
-    "typescript": JavaScriptExtractor,  # JS and TS use same extractor
-    "go": GoExtractor,
-    "rust": RustExtractor,
-}
+# Bump when the shape of the analysis output changes to invalidate cached entries
+ANALYSIS_VERSION = 4
+
+
+def grammar_version(language: str) -> str:
+    """Version tag for cache keys: grammar package version plus query file digest"""
+    module_name = LANGUAGE_MODULES[language].__name__
+    try:
+        package_version = metadata.version(module_name.replace("_", "-"))
+    except metadata.PackageNotFoundError:
+        package_version = "unknown"
+    return f"{package_version}-{query_digest(language)}-v{ANALYSIS_VERSION}"
 
 
 class SimpleASTParser(BaseParser):
@@ -49,34 +64,137 @@ class SimpleASTParser(BaseParser):
             raise ValueError(f"Unsupported language: {language}")
 
         lang_module = LANGUAGE_MODULES[language]
-        super().__init__(lang_module, language)
-        self.extractor = EXTRACTORS[language]
-
-    def extract_functions(self, tree, source_code: str) -> List[Dict[str, Any]]:
-        """Extract function definitions using language-specific extractor"""
-        if self.lang_name in ("javascript", "typescript"):
-            return self.extractor.extract_functions(
-                tree, source_code, self.node_text, self.lang_name
+        super().__init__(lang_module, language, LANGUAGE_FUNCTIONS.get(language))
+        self.grammar_version = grammar_version(language)
+        # file_path -> {start_byte: AnalysisUnit} from the last incremental analysis
+        self.previous_units: Dict[str, Dict[int, AnalysisUnit]] = {}
+
+    def extract_functions(self, tree, source_code) -> List[Dict[str, Any]]:
+        """Function and method definitions, as in extract_semantic_analysis"""
+        return self.extract_semantic_analysis(tree, source_code, "")["functions"]
+
+    def extract_classes(self, tree, source_code) -> List[Dict[str, Any]]:
+        """Class, struct, interface, trait and impl definitions, as in extract_semantic_analysis"""
+        return self.extract_semantic_analysis(tree, source_code, "")["classes"]
+
+    def extract_imports(self, tree, source_code) -> List[str]:
+        """Imported module names, as in extract_semantic_analysis"""
+        return self.extract_semantic_analysis(tree, source_code, "")["imports"]
+
+    def analyze_file(
+        self, tree, source_code, file_path: str
+    ) -> Tuple[Dict[str, Any], CodeGraph]:
+        """Extract semantic analysis and per-file graph in a single tree walk"""
+        return analyze_tree(tree, source_code, self.lang_name, file_path)
+
+    def analyze_path(
+        self,
+        file_path: str,
+        cache: Optional[AnalysisCache] = None,
+        data: Optional[bytes] = None,
+    ) -> Tuple[Dict[str, Any], CodeGraph]:
+        """
+        Read, parse and analyze a file, reusing a cached result when the
+        same blob was analyzed before. Cache hits skip tree-sitter entirely.
+        Pass data when the file contents are already in memory.
+        """
+        if data is None:
+            with open(file_path, "rb") as f:
+                data = f.read()
+
+        blob_sha = git_blob_sha(data)
+        if cache is not None:
+            cached = cache.get(
+                self.lang_name, self.grammar_version, blob_sha, file_path, SourceBuffer(data)
             )
-        return self.extractor.extract_functions(tree, source_code, self.node_text)
+            if cached is not None:
+                return cached
 
-    def extract_classes(self, tree, source_code: str) -> List[Dict[str, Any]]:
-        """Extract class definitions using language-specific extractor"""
-        return self.extractor.extract_classes(tree, source_code, self.node_text)
+        tree, source_code = self.parse_bytes(data)
+        analysis, graph = self.analyze_file(tree, source_code, file_path)
+        if cache is not None:
+            cache.put(self.lang_name, self.grammar_version, blob_sha, file_path, analysis, graph)
+        return analysis, graph
 
-    def extract_imports(self, tree, source_code: str) -> List[str]:
-        """Extract import statements using language-specific extractor"""
-        return self.extractor.extract_imports(tree, source_code, self.node_text)
+    def analyze_incremental(
+        self,
+        file_path: str,
+        source_code: Optional[bytes] = None,
+        hunks: Optional[List[Hunk]] = None,
+    ) -> Tuple[Dict[str, Any], CodeGraph]:
+        """
+        Analyze a new version of a file, reusing work from the previous one.
 
-    def extract_semantic_analysis(
-        self, tree, source_code: str, file_path: str
-    ) -> Dict[str, Any]:
-        """Extract complete semantic analysis for a file"""
-        return {
+        The file is reparsed with its previous tree, and only top-level nodes
+        touched by the edits or by changed_ranges() are extracted again;
+        results for the rest are carried over with shifted line numbers.
+        """
+        if source_code is None:
+            with open(file_path, "rb") as f:
+                source_code = f.read()
+
+        tree, text, edits, changed_ranges = self.parse_incremental(
+            file_path, source_code, hunks
+        )
+        previous_units = self.previous_units.get(file_path) if edits is not None else None
+        edit_ranges = new_ranges(edits) if edits else []
+        dirty = changed_ranges + [(start, end) for start, end, _ in edit_ranges]
+
+        units: List[AnalysisUnit] = []
+        for node in tree.root_node.children:
+            unit = None
+            if previous_units is not None and not any(
+                start <= node.end_byte and end >= node.start_byte for start, end in dirty
+            ):
+                # Untouched node: map its start back to the previous version
+                delta = 0
+                for _, end, delta_after in edit_ranges:
+                    if end > node.start_byte:
+                        break
+                    delta = delta_after
+                previous = previous_units.get(node.start_byte - delta)
+                if previous is not None and (
+                    previous.end_byte - previous.start_byte == node.end_byte - node.start_byte
+                ):
+                    unit = previous.moved_to(text, node.start_byte, node.start_point[0])
+
+            if unit is None:
+                extractor = QueryExtractor(text, self.lang_name, file_path).run(
+                    tree, node.start_byte, node.end_byte
+                )
+                unit = AnalysisUnit(
+                    node.start_byte,
+                    node.end_byte,
+                    node.start_point[0],
+                    extractor.functions,
+                    extractor.classes,
+                    extractor.imports,
+                    extractor.graph,
+                )
+            units.append(unit)
+
+        self.previous_units[file_path] = {unit.start_byte: unit for unit in units}
+
+        graph = merge_graphs(unit.graph for unit in units)
+
+        analysis = {
             "file_path": file_path,
             "language": self.lang_name,
-            "functions": self.extract_functions(tree, source_code),
-            "classes": self.extract_classes(tree, source_code),
-            "imports": self.extract_imports(tree, source_code),
+            "functions": [record for unit in units for record in unit.functions],
+            "classes": [record for unit in units for record in unit.classes],
+            "imports": [name for unit in units for name in unit.imports],
             "analysis_method": "simplified_ast",
         }
+        return analysis, graph
+
+    def forget(self, file_path: str):
+        """Drop retained tree and extraction results for a file"""
+        super().forget(file_path)
+        self.previous_units.pop(file_path, None)
+
+    def extract_semantic_analysis(
+        self, tree, source_code, file_path: str
+    ) -> Dict[str, Any]:
+        """Extract complete semantic analysis for a file"""
+        analysis, _ = self.analyze_file(tree, source_code, file_path)
+        return analysis
@@ -0,0 +1,24 @@
+; Go extraction queries
+
+(function_declaration
+  name: (identifier) @name
+  parameters: (_)? @parameters) @definition.function
+
+(method_declaration
+  receiver: (_)? @receiver
+  name: (field_identifier) @name
+  parameters: (_)? @parameters) @definition.method
+
+(type_spec
+  name: (type_identifier) @name
+  type: (struct_type)) @definition.struct
+
+(type_spec
+  name: (type_identifier) @name
+  type: (interface_type)) @definition.interface
+
+(import_spec
+  path: (_) @import.name) @reference.import
+
+(call_expression
+  function: (_) @name) @reference.call
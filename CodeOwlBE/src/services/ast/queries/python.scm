@@ -0,0 +1,37 @@
+; Python extraction queries
+;
+; Anchor captures name the record kind (@definition.<kind>, @reference.import,
+; @reference.call); @name and the other sub-captures fill in its fields.
+
+(function_definition
+  name: (identifier) @name
+  parameters: (_)? @parameters) @definition.function
+
+(class_definition
+  name: (identifier) @name) @definition.class
+
+(import_statement
+  name: [
+    (dotted_name) @import.name
+    (aliased_import name: (dotted_name) @import.name)
+  ]) @reference.import
+
+(import_from_statement
+  module_name: (_) @import.name) @reference.import
+
+; `from . import a, b` names submodules: @import.member turns "." into ".a", ".b"
+(import_from_statement
+  module_name: (relative_import) @import.name
+  name: [
+    (dotted_name) @import.member
+    (aliased_import name: (dotted_name) @import.member)
+  ]) @reference.import
+
+(call
+  function: (identifier) @name) @reference.call
+
+; Method and module-qualified calls keep their receiver (self.m, obj.m, mod.f)
+; so the symbol index can tell same-class calls from foreign ones
+(call
+  function: (attribute
+    attribute: (identifier)) @name) @reference.call
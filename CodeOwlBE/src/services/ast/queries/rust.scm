@@ -0,0 +1,22 @@
+; Rust extraction queries
+
+(function_item
+  name: (identifier) @name
+  parameters: (_)? @parameters) @definition.function
+
+(struct_item
+  name: (type_identifier) @name) @definition.struct
+
+(trait_item
+  name: (type_identifier) @name) @definition.trait
+
+; @impl.trait turns the record into "<Trait> for <Type>" with type "trait_impl"
+(impl_item
+  trait: (_)? @impl.trait
+  type: (_) @name) @definition.impl
+
+(use_declaration
+  argument: (_) @import.name) @reference.import
+
+(call_expression
+  function: (_) @name) @reference.call
@@ -0,0 +1,26 @@
+; TypeScript extraction queries
+
+(function_declaration
+  name: (identifier) @name
+  parameters: (_)? @parameters) @definition.function
+
+(class_declaration
+  name: (type_identifier) @name) @definition.class
+
+(method_definition
+  name: (property_identifier) @name
+  parameters: (_)? @parameters) @definition.method
+
+(interface_declaration
+  name: (type_identifier) @name) @definition.interface
+
+(import_statement
+  source: (string) @import.name) @reference.import
+
+(call_expression
+  function: (identifier) @name) @reference.call
+
+; Method and module-qualified calls keep their receiver (this.m, obj.m, Svc.run)
+(call_expression
+  function: (member_expression
+    property: (property_identifier)) @name) @reference.call
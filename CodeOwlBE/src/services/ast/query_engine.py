@@ -0,0 +1,219 @@
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from tree_sitter import Query, QueryCursor
+
+from .code_graph import CodeGraph, EdgeKind, NodeKind
+from .symbols import ClassSymbol, FunctionSymbol, as_source_buffer, class_symbol, function_symbol
+
+
+QUERY_DIR = Path(__file__).parent / "queries"
+
+# Definition kinds that become the enclosing scope for calls and imports
+SCOPE_KINDS = ("function", "method")
+
+# Languages that ship a query file
+QUERY_LANGUAGES = frozenset(path.stem for path in QUERY_DIR.glob("*.scm"))
+
+# Compiled queries, one per language
+_QUERY_CACHE: Dict[str, Query] = {}
+
+
+def has_queries(lang: str) -> bool:
+    """Check whether a language ships a .scm query file"""
+    return lang in QUERY_LANGUAGES
+
+
+def query_digest(lang: str) -> str:
+    """Short content hash of a language's query file, empty if it has none"""
+    if not has_queries(lang):
+        return ""
+    data = (QUERY_DIR / f"{lang}.scm").read_bytes()
+    return hashlib.sha1(data, usedforsecurity=False).hexdigest()[:12]
+
+
+def get_query(lang: str, language) -> Query:
+    """Compile the language's query file once and cache it"""
+    query = _QUERY_CACHE.get(lang)
+    if query is None:
+        source = (QUERY_DIR / f"{lang}.scm").read_text()
+        query = Query(language, source)
+        _QUERY_CACHE[lang] = query
+    return query
+
+
+class QueryExtractor:
+    """
+    Query-based extraction: tree-sitter walks the tree natively and only the
+    matched captures are turned into analysis records and graph nodes.
+    """
+
+    def __init__(self, source_code, lang: str, file_path: str):
+        self.source_code = as_source_buffer(source_code)
+        self.lang = lang
+        self.file_path = file_path
+
+        self.functions: List[FunctionSymbol] = []
+        self.classes: List[ClassSymbol] = []
+        self.imports: List[str] = []
+        self.graph = CodeGraph()
+
+    def node_text(self, node) -> str:
+        """Extract text from a node"""
+        return self.source_code.text(node.start_byte, node.end_byte)
+
+    def run(
+        self, tree, start_byte: int = 0, end_byte: Optional[int] = None
+    ) -> "QueryExtractor":
+        """
+        Run the compiled query and build records from its captures.
+
+        With a byte range, only definitions, imports and calls lying fully
+        inside [start_byte, end_byte) are extracted.
+        """
+        query = get_query(self.lang, tree.language)
+        cursor = QueryCursor(query)
+        if end_byte is not None:
+            cursor.set_byte_range(start_byte, end_byte)
+        else:
+            end_byte = tree.root_node.end_byte
+        matches = cursor.matches(tree.root_node)
+
+        # A statement with several imported names yields one match per name,
+        # so merge matches that share the same anchor node.
+        entries: Dict[Tuple[str, int, int], Tuple[str, Any, Dict[str, List]]] = {}
+        for _, captures in matches:
+            anchor_name = next(
+                name for name in captures if name.startswith(("definition.", "reference."))
+            )
+            anchor = captures[anchor_name][0]
+            if anchor.start_byte < start_byte or anchor.end_byte > end_byte:
+                continue
+            key = (anchor_name, anchor.start_byte, anchor.end_byte)
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = (anchor_name, anchor, {})
+            for name, nodes in captures.items():
+                if name != anchor_name:
+                    entry[2].setdefault(name, []).extend(nodes)
+
+        # Pre-order, outermost first, so enclosing scopes are seen before their bodies
+        ordered = sorted(
+            entries.values(), key=lambda e: (e[1].start_byte, -e[1].end_byte)
+        )
+
+        # Stacks of (end_byte, node id) for the enclosing functions, which own
+        # calls and imports, and for every enclosing definition, which contains
+        # nested ones (methods in their class or impl)
+        scopes: List[Tuple[int, int]] = []
+        containers: List[Tuple[int, int]] = []
+        for anchor_name, anchor, captures in ordered:
+            for stack in (scopes, containers):
+                while stack and stack[-1][0] <= anchor.start_byte:
+                    stack.pop()
+            current_function = scopes[-1][1] if scopes else None
+            container = containers[-1][1] if containers else None
+
+            category, kind = anchor_name.split(".", 1)
+            if category == "definition":
+                node_id = self._add_definition(kind, anchor, captures, container)
+                if node_id is not None:
+                    containers.append((anchor.end_byte, node_id))
+                    if kind in SCOPE_KINDS:
+                        scopes.append((anchor.end_byte, node_id))
+            elif kind == "import":
+                self._add_import(anchor, captures, current_function)
+            elif kind == "call":
+                self._add_call(captures, current_function)
+
+        return self
+
+    def _capture_node(self, captures: Dict[str, List], name: str):
+        nodes = captures.get(name)
+        return nodes[0] if nodes else None
+
+    def _capture_text(self, captures: Dict[str, List], name: str) -> Optional[str]:
+        node = self._capture_node(captures, name)
+        return self.node_text(node) if node is not None else None
+
+    @staticmethod
+    def _distinct(nodes: List) -> List:
+        """Nodes in source order, once each (merged matches can repeat a capture)"""
+        return sorted({(n.start_byte, n.end_byte): n for n in nodes}.values(), key=lambda n: n.start_byte)
+
+    def _add_definition(
+        self, kind: str, node, captures: Dict[str, List], container: Optional[int]
+    ) -> Optional[int]:
+        name = self._capture_text(captures, "name")
+        if not name:
+            return None
+
+        if kind in SCOPE_KINDS:
+            self.functions.append(function_symbol(
+                self.source_code, node, name, kind,
+                parameters=self._capture_node(captures, "parameters"),
+                receiver=self._capture_node(captures, "receiver"),
+            ))
+        else:
+            record_name, record_type = name, kind
+            trait = self._capture_text(captures, "impl.trait")
+            if trait:
+                record_name, record_type = f"{trait} for {name}", "trait_impl"
+            self.classes.append(class_symbol(self.source_code, node, record_name, record_type))
+
+        node_id = self.graph.add_node(self.file_path, NodeKind[kind.upper()], name)
+        if container is not None and container != node_id:
+            self.graph.add_edge(container, node_id, EdgeKind.CONTAINS)
+        return node_id
+
+    def _add_import(self, node, captures: Dict[str, List], current_function: Optional[int]):
+        names = self._distinct(captures.get("import.name", []))
+        members = self._distinct(captures.get("import.member", []))
+        for name_node in names:
+            name = self.node_text(name_node).strip("\"'`")
+            if members and not name.strip("."):
+                # Bare relative import (from . import a, b): each name may be a submodule
+                self.imports.extend(name + self.node_text(member) for member in members)
+            else:
+                self.imports.append(name)
+
+        import_text = self.node_text(node).strip()
+        import_id = self.graph.add_node(self.file_path, NodeKind.IMPORT, import_text)
+
+        # Connect import to file or function
+        if current_function is not None:
+            self.graph.add_edge(current_function, import_id, EdgeKind.USES)
+        else:
+            file_anchor = self.graph.add_node(self.file_path, NodeKind.FILE)
+            self.graph.add_edge(file_anchor, import_id, EdgeKind.IMPORTS)
+
+    def _add_call(self, captures: Dict[str, List], current_function: Optional[int]):
+        if current_function is None:
+            return
+        # Receivers may span lines (obj\n    .method); names never contain whitespace
+        called_name = "".join((self._capture_text(captures, "name") or "").split())
+        if called_name:
+            call_id = self.graph.add_node(self.file_path, NodeKind.CALL, called_name)
+            self.graph.add_edge(current_function, call_id, EdgeKind.CALLS)
+
+
+def analyze_tree(
+    tree, source_code, lang: str, file_path: str
+) -> Tuple[Dict[str, Any], CodeGraph]:
+    """
+    Return (semantic_analysis, graph) for a parsed file.
+
+    Every supported language ships a query file; tree-sitter runs its
+    compiled queries natively and only the matches are turned into records.
+    """
+    extractor = QueryExtractor(source_code, lang, file_path).run(tree)
+    analysis = {
+        "file_path": file_path,
+        "language": lang,
+        "functions": extractor.functions,
+        "classes": extractor.classes,
+        "imports": extractor.imports,
+        "analysis_method": "simplified_ast",
+    }
+    return analysis, extractor.graph
@@ -0,0 +1,338 @@
+import re
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .code_graph import NODE_KINDS, CodeGraph, EdgeKind, NodeKind
+from .parser import LANGUAGE_MAP
+
+
+# Receivers that refer to the enclosing class, so the call stays in the same file
+SELF_RECEIVERS = {"self", "cls", "this", "super()", "Self"}
+
+# Record types whose members are qualified by their name (Class.method, Type::new)
+OWNER_TYPES = {"class", "struct", "interface", "trait", "impl", "trait_impl"}
+
+# Files that stand for their directory's module
+PACKAGE_FILES = {"__init__", "mod", "lib", "main", "index"}
+
+
+class Definition(NamedTuple):
+    """Where a function, method or class is defined"""
+
+    file_path: str
+    name: str
+    kind: str
+    start_line: int
+    end_line: int
+    qualified_name: str
+
+
+# (calling definition, called name as written)
+CallSite = Tuple[Definition, str]
+
+
+def module_name(file_path: str, language: Optional[str] = None) -> str:
+    """
+    Dotted module path of a repository-relative file, e.g. src/db/models.py ->
+    src.db.models. Go files belong to their directory's package.
+    """
+    path = PurePosixPath(file_path)
+    language = language or LANGUAGE_MAP.get(path.suffix)
+    parts = list(path.parent.parts) if language == "go" else list(path.with_suffix("").parts)
+    if language != "go" and len(parts) > 1 and parts[-1] in PACKAGE_FILES:
+        parts.pop()
+    return ".".join(part for part in parts if part not in ("", ".", "/"))
+
+
+def type_name(text: str) -> str:
+    """
+    Bare type an impl, receiver or annotation refers to, e.g. "Display for
+    Foo<T>" -> Foo, "(s *Server)" -> Server, "models::User" -> User.
+    """
+    text = text.strip().strip("()").rpartition(" for ")[2]
+    words = text.split("<", 1)[0].split("[", 1)[0].split()
+    return _dotted(words[-1].lstrip("&*")).rpartition(".")[2] if words else ""
+
+
+def _owners(records: List[Any]) -> List[Tuple[str, ...]]:
+    """
+    Types enclosing each definition record, outermost first: the class or
+    impl blocks whose span contains it, or a Go method's receiver.
+    """
+    def span(i):
+        record = records[i]
+        return getattr(record, "start_byte", record["start_line"]), getattr(record, "end_byte", record["end_line"])
+
+    owners: List[Tuple[str, ...]] = [()] * len(records)
+    # (end, type name) of the enclosing owners, over records in pre-order
+    stack: List[Tuple[int, str]] = []
+    for i in sorted(range(len(records)), key=lambda i: (span(i)[0], -span(i)[1])):
+        record = records[i]
+        end = span(i)[1]
+        while stack and stack[-1][0] < end:
+            stack.pop()
+        owners[i] = tuple(name for _, name in stack)
+        receiver = record.get("receiver")
+        if receiver:
+            owners[i] += (type_name(receiver),)
+        if record["type"] in OWNER_TYPES:
+            stack.append((end, type_name(record["name"])))
+    return owners
+
+
+def _dotted_imports(imports: Iterable[str]) -> List[str]:
+    """A file's imports as dotted paths: crate::db::User, ./db/models, .models -> crate.db.User, db.models, models"""
+    names = []
+    for name in imports:
+        dotted = re.sub(r"[/\\]+|::", ".", name.strip("\"'`")).strip(".")
+        if dotted:
+            names.append(dotted)
+    return names
+
+
+def _imports_module(imports: List[str], module: str) -> bool:
+    """Whether one of a file's dotted imports names module, its package or one of its members"""
+    last = module.rpartition(".")[2]
+    for name in imports:
+        if name == module or module.startswith(name + ".") or last in name.split("."):
+            return True
+    return False
+
+
+def _dotted(called_name: str) -> str:
+    return called_name.replace("::", ".").replace("->", ".")
+
+
+def _last_segment(called_name: str) -> str:
+    return _dotted(called_name).rpartition(".")[2]
+
+
+class SymbolIndex:
+    """
+    Repository-wide map from names to definitions, for cross-file call
+    resolution.
+
+    Definitions are indexed by bare name and by every dotted suffix of their
+    qualified name, which includes the enclosing class or impl of methods
+    (User.save, models.User.save, ...), and call sites by the
+    last segment of the called name, so resolving a call or answering
+    callers()/callees() is a handful of dict lookups. update_file() replaces
+    one file's entries; calls are resolved at query time so they always see
+    the current definitions.
+    """
+
+    def __init__(self):
+        self._by_file: Dict[str, List[Definition]] = {}
+        self._by_name: Dict[str, List[Definition]] = {}
+        self._by_key: Dict[Tuple[str, str, str], Definition] = {}
+        self._qualified: Dict[str, List[Definition]] = {}
+
+        # file -> its imports as dotted paths, to prefer imported definitions
+        self._file_imports: Dict[str, List[str]] = {}
+
+        self._file_calls: Dict[str, List[CallSite]] = {}
+        self._calls_by_caller: Dict[Definition, List[str]] = {}
+        self._call_sites: Dict[str, List[CallSite]] = {}
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Tuple[Dict[str, Any], CodeGraph]]) -> "SymbolIndex":
+        """Build from {file_path: (semantic_analysis, graph)}, e.g. ParallelParser output"""
+        index = cls()
+        for file_path, (analysis, graph) in results.items():
+            index.update_file(file_path, analysis, graph)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(definitions) for definitions in self._by_file.values())
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._by_file
+
+    # Updates
+
+    def update_file(self, file_path: str, analysis: Dict[str, Any], graph: CodeGraph):
+        """Replace a file's definitions and call sites with a fresh analysis"""
+        self.remove_file(file_path)
+
+        module = module_name(file_path, analysis.get("language"))
+        definitions = []
+        records = list(analysis["functions"]) + list(analysis["classes"])
+        for record, owners in zip(records, _owners(records)):
+            name = record["name"]
+            qualified = ".".join(([module] if module else []) + list(owners) + [name])
+            definition = Definition(
+                file_path, name, record["type"], record["start_line"], record["end_line"], qualified
+            )
+            definitions.append(definition)
+            self._by_key.setdefault((file_path, definition.kind, name), definition)
+            self._by_name.setdefault(name, []).append(definition)
+            for suffix in self._suffixes(qualified):
+                self._qualified.setdefault(suffix, []).append(definition)
+        self._by_file[file_path] = definitions
+        self._file_imports[file_path] = _dotted_imports(analysis.get("imports", ()))
+
+        # Graph call edges: caller definition node -> dangling call node. Same-named
+        # definitions of a file (run() in two classes) share a node, so its calls
+        # are attributed to each of them
+        local: Dict[Tuple[str, str], List[Definition]] = {}
+        for definition in definitions:
+            local.setdefault((definition.kind, definition.name), []).append(definition)
+        calls: List[CallSite] = []
+        for src, dst, kind in graph.edges():
+            if kind != EdgeKind.CALLS or graph.node_kind(dst) != NodeKind.CALL:
+                continue
+            called_name = graph.node_name(dst)
+            for caller in local.get((graph.node_kind(src).label, graph.node_name(src)), ()):
+                calls.append((caller, called_name))
+                self._calls_by_caller.setdefault(caller, []).append(called_name)
+                self._call_sites.setdefault(_last_segment(called_name), []).append((caller, called_name))
+        self._file_calls[file_path] = calls
+
+    def remove_file(self, file_path: str):
+        """Forget everything indexed for a file"""
+        self._file_imports.pop(file_path, None)
+        definitions = self._by_file.pop(file_path, None)
+        if definitions:
+            for definition in definitions:
+                self._by_key.pop((file_path, definition.kind, definition.name), None)
+                self._discard(self._by_name, definition.name, file_path)
+                for suffix in self._suffixes(definition.qualified_name):
+                    self._discard(self._qualified, suffix, file_path)
+                self._calls_by_caller.pop(definition, None)
+
+        for caller, called_name in self._file_calls.pop(file_path, ()):
+            key = _last_segment(called_name)
+            sites = self._call_sites.get(key)
+            if sites is not None:
+                sites[:] = [site for site in sites if site[0].file_path != file_path]
+                if not sites:
+                    del self._call_sites[key]
+
+    @staticmethod
+    def _suffixes(qualified_name: str) -> List[str]:
+        parts = qualified_name.split(".")
+        return [".".join(parts[i:]) for i in range(len(parts) - 1)]
+
+    @staticmethod
+    def _discard(table: Dict[str, List[Definition]], key: str, file_path: str):
+        entries = table.get(key)
+        if entries is None:
+            return
+        entries[:] = [d for d in entries if d.file_path != file_path]
+        if not entries:
+            del table[key]
+
+    # Queries
+
+    def definitions(self, name: str) -> List[Definition]:
+        """Definitions by bare or (suffix of) qualified name"""
+        name = _dotted(name)
+        if "." in name:
+            return list(self._qualified.get(name, ()))
+        return list(self._by_name.get(name, ()))
+
+    def definition(self, file_path: str, kind: str, name: str) -> Optional[Definition]:
+        """The definition behind a graph node (file, kind label, name)"""
+        return self._by_key.get((file_path, kind, name))
+
+    def file_definitions(self, file_path: str) -> List[Definition]:
+        return list(self._by_file.get(file_path, ()))
+
+    def enclosing(self, file_path: str, line: int) -> Optional[Definition]:
+        """Innermost definition in a file whose lines contain line"""
+        best = None
+        for definition in self._by_file.get(file_path, ()):
+            if definition.start_line <= line <= definition.end_line and (
+                best is None or definition.start_line >= best.start_line
+            ):
+                best = definition
+        return best
+
+    def resolve(
+        self, called_name: str, file_path: str, caller: Optional[Definition] = None
+    ) -> Optional[Definition]:
+        """
+        Definition a call in file_path refers to, or None when unknown or
+        ambiguous. A call on a receiver (Class.method, Type::new, mod.f) only
+        resolves through a qualified name ending in receiver.name, so obj.m
+        and np.array stay unresolved. A self call from caller tries caller's
+        own class first; bare and other self calls go by name. Among several
+        candidates one in the same file wins, then one from a module the
+        file imports.
+        """
+        dotted = _dotted(called_name.strip())
+        receiver, _, name = dotted.rpartition(".")
+
+        if receiver and receiver not in SELF_RECEIVERS:
+            return self._pick(self._qualified.get(dotted), file_path)
+
+        if receiver and caller is not None:
+            owner = caller.qualified_name.rpartition(".")[0]
+            for definition in self._qualified.get(f"{owner}.{name}", ()):
+                if definition.file_path == file_path:
+                    return definition
+
+        candidates = self._by_name.get(name)
+        if not candidates:
+            return None
+        for definition in candidates:
+            if definition.file_path == file_path:
+                return definition
+        if receiver in SELF_RECEIVERS:
+            return None
+        return self._pick(candidates, file_path)
+
+    def _pick(self, candidates: Optional[List[Definition]], file_path: str) -> Optional[Definition]:
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        local = [d for d in candidates if d.file_path == file_path]
+        if len(local) == 1:
+            return local[0]
+        imports = self._file_imports.get(file_path, [])
+        matches = [d for d in candidates if _imports_module(imports, module_name(d.file_path))]
+        return matches[0] if len(matches) == 1 else None
+
+    def callees(self, definition: Definition) -> List[Definition]:
+        """Resolved definitions called from definition"""
+        seen: Dict[Definition, None] = {}
+        for called_name in self._calls_by_caller.get(definition, ()):
+            target = self.resolve(called_name, definition.file_path, definition)
+            if target is not None:
+                seen[target] = None
+        return list(seen)
+
+    def callers(self, definition: Definition) -> List[Definition]:
+        """Definitions containing a call that resolves to definition"""
+        seen: Dict[Definition, None] = {}
+        for caller, called_name in self._call_sites.get(definition.name, ()):
+            if self.resolve(called_name, caller.file_path, caller) == definition:
+                seen[caller] = None
+        return list(seen)
+
+    def iter_calls(self) -> Iterable[Tuple[Definition, Definition]]:
+        """Every resolved (caller, callee) pair in the repository"""
+        for calls in self._file_calls.values():
+            for caller, called_name in calls:
+                target = self.resolve(called_name, caller.file_path, caller)
+                if target is not None:
+                    yield caller, target
+
+    def link_calls(self, graph: CodeGraph) -> int:
+        """
+        Add CALLS edges between caller and callee definition nodes of a
+        merged repository graph. Returns the number of edges added.
+        """
+        added = 0
+        for caller, target in self.iter_calls():
+            caller_kind = NODE_KINDS.get(caller.kind)
+            target_kind = NODE_KINDS.get(target.kind)
+            if caller_kind is None or target_kind is None:
+                continue
+            src = graph.find_node(caller.file_path, caller_kind, caller.name)
+            dst = graph.find_node(target.file_path, target_kind, target.name)
+            if src is not None and dst is not None and src != dst:
+                graph.add_edge(src, dst, EdgeKind.CALLS)
+                added += 1
+        return added
@@ -0,0 +1,199 @@
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+
+class SourceBuffer:
+    """
+    A file's raw bytes, shared by every symbol record extracted from it.
+
+    Slicing with tree-sitter byte offsets decodes just that span, so
+    `source[node.start_byte:node.end_byte]` is correct for non-ASCII files
+    and the whole file is never held as a second, decoded copy.
+    """
+
+    __slots__ = ("data", "view")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.view = memoryview(data)
+
+    def text(self, start: int, end: int) -> str:
+        return str(self.view[start:end], "utf-8", "replace")
+
+    def __getitem__(self, key: slice) -> str:
+        start, end, _ = key.indices(len(self.data))
+        return self.text(start, end)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self) -> str:
+        return self.text(0, len(self.data))
+
+    def __reduce__(self):
+        return SourceBuffer, (self.data,)
+
+
+def as_source_buffer(source_code: Union[SourceBuffer, bytes, str]) -> SourceBuffer:
+    """Accept a SourceBuffer, raw bytes, or (for older callers) decoded text"""
+    if isinstance(source_code, SourceBuffer):
+        return source_code
+    if isinstance(source_code, str):
+        source_code = source_code.encode("utf-8")
+    return SourceBuffer(source_code)
+
+
+Span = Optional[Tuple[int, int]]
+
+
+class Symbol(Mapping):
+    """
+    Read-only record of a definition, stored as byte spans over a SourceBuffer.
+
+    Behaves like the dicts extractors used to return (record["source"],
+    record.get("parameters"), dict(record), comparison with dicts), but text
+    fields are only decoded when read.
+    """
+
+    __slots__ = ("buffer", "name", "type", "start_line", "end_line", "start_byte", "end_byte")
+
+    KEYS: Tuple[str, ...] = ()
+
+    def __init__(self, buffer, name, type, start_line, end_line, start_byte, end_byte):
+        self.buffer = buffer
+        self.name = name
+        self.type = type
+        self.start_line = start_line
+        self.end_line = end_line
+        self.start_byte = start_byte
+        self.end_byte = end_byte
+
+    @property
+    def source(self) -> str:
+        return self.buffer.text(self.start_byte, self.end_byte)
+
+    def keys(self):
+        return self.KEYS
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.keys():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.type} {self.name!r}, lines {self.start_line}-{self.end_line})"
+
+    def _span_text(self, span: Span) -> Optional[str]:
+        return self.buffer.text(*span) if span else None
+
+
+class FunctionSymbol(Symbol):
+    """Function or method definition"""
+
+    __slots__ = ("parameters_span", "receiver_span")
+
+    KEYS = ("name", "type", "start_line", "end_line", "parameters", "signature", "source")
+    METHOD_KEYS = KEYS + ("receiver",)
+
+    def __init__(
+        self, buffer, name, type, start_line, end_line, start_byte, end_byte,
+        parameters_span: Span = None, receiver_span: Span = None,
+    ):
+        super().__init__(buffer, name, type, start_line, end_line, start_byte, end_byte)
+        self.parameters_span = parameters_span
+        self.receiver_span = receiver_span
+
+    @property
+    def parameters(self) -> Optional[str]:
+        return self._span_text(self.parameters_span)
+
+    @property
+    def receiver(self) -> Optional[str]:
+        return self._span_text(self.receiver_span)
+
+    @property
+    def signature(self) -> str:
+        return self.source
+
+    def keys(self):
+        return self.METHOD_KEYS if self.type == "method" else self.KEYS
+
+
+class ClassSymbol(Symbol):
+    """Class-like definition: class, struct, interface, trait or impl"""
+
+    __slots__ = ()
+
+    KEYS = ("name", "type", "start_line", "end_line", "source")
+
+
+def function_symbol(buffer: SourceBuffer, node, name: str, kind: str, parameters=None, receiver=None) -> FunctionSymbol:
+    """Build a FunctionSymbol from tree-sitter nodes"""
+    return FunctionSymbol(
+        buffer, name, kind,
+        node.start_point[0] + 1, node.end_point[0] + 1,
+        node.start_byte, node.end_byte,
+        (parameters.start_byte, parameters.end_byte) if parameters is not None else None,
+        (receiver.start_byte, receiver.end_byte) if receiver is not None else None,
+    )
+
+
+def class_symbol(buffer: SourceBuffer, node, name: str, kind: str) -> ClassSymbol:
+    """Build a ClassSymbol from a tree-sitter node"""
+    return ClassSymbol(
+        buffer, name, kind,
+        node.start_point[0] + 1, node.end_point[0] + 1,
+        node.start_byte, node.end_byte,
+    )
+
+
+def moved_symbol(symbol: Symbol, buffer: SourceBuffer, byte_shift: int, line_shift: int) -> Symbol:
+    """Same symbol in a new version of the file, shifted by whole lines and bytes"""
+    def shift(span: Span) -> Span:
+        return (span[0] + byte_shift, span[1] + byte_shift) if span else None
+
+    if isinstance(symbol, FunctionSymbol):
+        return FunctionSymbol(
+            buffer, symbol.name, symbol.type,
+            symbol.start_line + line_shift, symbol.end_line + line_shift,
+            symbol.start_byte + byte_shift, symbol.end_byte + byte_shift,
+            shift(symbol.parameters_span), shift(symbol.receiver_span),
+        )
+    return ClassSymbol(
+        buffer, symbol.name, symbol.type,
+        symbol.start_line + line_shift, symbol.end_line + line_shift,
+        symbol.start_byte + byte_shift, symbol.end_byte + byte_shift,
+    )
+
+
+def pack_symbols(symbols: List[Symbol]) -> List[list]:
+    """Span-only form of symbol records, for caches and worker results"""
+    packed = []
+    for s in symbols:
+        row = [s.name, s.type, s.start_line, s.end_line, s.start_byte, s.end_byte]
+        if isinstance(s, FunctionSymbol):
+            row += [s.parameters_span, s.receiver_span]
+        packed.append(row)
+    return packed
+
+
+def unpack_symbols(buffer: SourceBuffer, packed: List[list]) -> List[Symbol]:
+    """Rebuild symbol records from pack_symbols output over the file's bytes"""
+    symbols: List[Symbol] = []
+    for row in packed:
+        if len(row) > 6:
+            params, receiver = row[6], row[7]
+            symbols.append(FunctionSymbol(
+                buffer, *row[:6],
+                tuple(params) if params else None,
+                tuple(receiver) if receiver else None,
+            ))
+        else:
+            symbols.append(ClassSymbol(buffer, *row))
+    return symbols
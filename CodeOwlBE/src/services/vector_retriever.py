@@ -1,67 +1,273 @@
-from typing import List, Dict, Any
-from src.utils.qdrant_client import qdrant_client
-from src.db.embedding_service import EmbeddingService
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
+import numpy as np
+from src.db.batching_embedder import get_batching_embedder
+from src.db.embedding_service import get_embedding_service
+from src.db.retrieval_cache import CacheKey, RetrievalCache, get_retrieval_cache
+from src.db.vector_store import Conditions, VectorStore, get_vector_store, tenant_collection
+from src.utils.config import settings
+
+# Query used to pull general review learnings
+LEARNINGS_QUERY = "Code review feedback and learnings"
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_retriever_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool that runs retrieve_context's lookups side by side"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(thread_name_prefix="vector-retriever")
+    return _shared_executor
 
 
 class VectorRetriever:
-    """Retrieves code data from Qdrant vector collections"""
-    def __init__(self):
-        self.embedding_service = EmbeddingService()
+    """
+    Retrieves code data from the vector collections. Every lookup is scoped
+    to one repository: repo_id, unless a call names another repo.
+    """
+    def __init__(self, repo_id: str = "", store: Optional[VectorStore] = None):
+        self.repo_id = repo_id
+        self.embedding_service = get_embedding_service()
+        self.store = store or get_vector_store()
+        self.cache: Optional[RetrievalCache] = get_retrieval_cache() if settings.retrieval_cache_enabled else None
     
-    def get_code_graphs_by_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
-        """Retrieve code graph for specific files"""
-        if not file_paths:
-            return []
-        
-        # Create a query from file paths
-        query_text = f"Code from files: {', '.join(file_paths)}"
-        query_vector = self.embedding_service.embed_text(query_text)
+    # Result cache: entries are dropped when VectorIndexer writes to their collection
+
+    @staticmethod
+    def _search_key(collection_name: str, query_vector: np.ndarray, limit: int, filters: Tuple) -> CacheKey:
+        detail = RetrievalCache.vector_key(query_vector) + RetrievalCache.filter_key(*filters)
+        return (collection_name, "search", detail, limit)
+
+    def _cached(self, key: CacheKey, compute: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        if self.cache is None:
+            return compute()
+        return self.cache.lookup(key, compute)
+
+    async def _acached(
+            self, key: CacheKey, compute: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        if self.cache is None:
+            return await compute()
+        value = self.cache.get(key)
+        if value is None:
+            generation = self.cache.generation(key[0])
+            value = await compute()
+            self.cache.put(key, value, generation)
+        return value
+
+    # Tenancy: a repo's lookups go to its dedicated collection if it has one, always filtered by repo_id
 
-        # Search in code_graphs collection
-        results = qdrant_client.search(
-            collection_name="code_graphs",
-            query_vector=query_vector,
-            limit=len(file_paths) * 2, # Get more results than files.
+    def _repo(self, repo_id: Optional[str]) -> str:
+        return self.repo_id if repo_id is None else repo_id
+
+    @staticmethod
+    def _repo_filter(repo_id: str) -> Tuple[Optional[Conditions], Optional[Conditions]]:
+        return {"repo_id": repo_id}, None
+
+    @staticmethod
+    def _files_filter(file_paths: List[str], repo_id: str) -> Conditions:
+        return {"file_path": list(dict.fromkeys(file_paths)), "repo_id": repo_id}
+
+    @staticmethod
+    def _in_request_order(payloads: List[Dict[str, Any]], file_paths: List[str]) -> List[Dict[str, Any]]:
+        order = {file_path: i for i, file_path in reversed(list(enumerate(file_paths)))}
+        payloads.sort(key=lambda payload: order.get(payload.get("file_path"), len(order)))
+        return payloads
+
+    def _fetch_by_files(self, collection_name: str, file_paths: List[str], repo_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Exact keyword-filtered fetch of the points for file_paths, in request order"""
+        repo_id = self._repo(repo_id)
+        collection_name = tenant_collection(collection_name, repo_id)
+        must = self._files_filter(file_paths, repo_id)
+        payloads = self._cached(
+            (collection_name, "fetch", RetrievalCache.filter_key(must), None),
+            lambda: self.store.fetch(collection_name, must=must),
         )
+        return self._in_request_order(payloads, file_paths)
 
-        # Extract payloads 
-        code_graphs = [hit.payload for hit in results]
-        return code_graphs
+    def get_code_graphs_by_files(self, file_paths: List[str], repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retrieve code graph for specific files"""
+        if not file_paths:
+            return []
+        return self._fetch_by_files("code_graphs", file_paths, repo_id)
     
-    def get_import_files_by_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+    def get_import_files_by_files(self, file_paths: List[str], repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
         '''Retrieve import files for specific files'''
         if not file_paths:
             return []
-        
-        # Create a query from file paths
-        query_text = f"Import files from files: {', '.join(file_paths)}"
-        query_vector = self.embedding_service.embed_text(query_text)
-
-        # Search in import_files collection
-        results = qdrant_client.search(
-            collection_name="import_files",
-            query_vector=query_vector,
-            limit=len(file_paths) * 2, # Get more results than files.
+        return self._fetch_by_files("import_files", file_paths, repo_id)
+    
+    def _search(
+            self,
+            collection_name: str,
+            query_vector: np.ndarray,
+            limit: int,
+            filters: Tuple[Optional[Conditions], Optional[Conditions]] = (None, None),
+    ) -> List[Dict[str, Any]]:
+        """Nearest-neighbour search returning payloads; filters is (must, must_not)"""
+        must, must_not = filters
+        return self._cached(
+            self._search_key(collection_name, query_vector, limit, filters),
+            lambda: self.store.search(collection_name, query_vector, limit, must=must, must_not=must_not),
         )
 
-        # Extract payloads 
-        import_files = [hit.payload for hit in results]
-        return import_files
+    @staticmethod
+    def _related_code_filter(
+            repo_id: str, exclude_files: Optional[List[str]]
+    ) -> Tuple[Optional[Conditions], Optional[Conditions]]:
+        must = {"repo_id": repo_id}
+        must_not = {"file_path": list(exclude_files)} if exclude_files else None
+        return must, must_not
+
+    def get_related_code(
+            self,
+            query_text: str,
+            limit: int = 5,
+            repo_id: Optional[str] = None,
+            exclude_files: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Semantic search for code graphs related to a description, e.g. of a change"""
+        repo_id = self._repo(repo_id)
+        query_vector = self.embedding_service.embed_text(query_text)
+        return self._search(
+            tenant_collection("code_graphs", repo_id), query_vector, limit,
+            self._related_code_filter(repo_id, exclude_files),
+        )
     
-    def get_related_learnings(self, limit: int = 5) -> List[Dict[str, Any]]:
+    def get_related_learnings(self, limit: int = 5, repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
         '''Retrieve recent learnings (past reviews)'''
+        repo_id = self._repo(repo_id)
         # Use generic query to get recent learnings
-        query_text = "Code review feedback and learnings"
-        query_vector = self.embedding_service.embed_text(query_text)
+        query_vector = self.embedding_service.embed_text(LEARNINGS_QUERY)
+        return self._search(tenant_collection("learnings", repo_id), query_vector, limit, self._repo_filter(repo_id))
+    
+    def retrieve_context(
+            self,
+            file_paths: List[str],
+            related_query: Optional[str] = None,
+            related_limit: int = 5,
+            learnings_limit: int = 5,
+            repo_id: Optional[str] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Everything a review needs in one call: code graphs and import files
+        for file_paths, past learnings and, given related_query, semantically
+        related code from other files.
+
+        Query texts are embedded in one batch and the lookups run
+        concurrently, so the call takes about as long as the slowest one.
+        """
+        repo_id = self._repo(repo_id)
+        queries = [LEARNINGS_QUERY] + ([related_query] if related_query else [])
+        vectors = self.embedding_service.embed_batch(queries)
+
+        lookups = {
+            "code_graphs": (self.get_code_graphs_by_files, file_paths, repo_id),
+            "import_files": (self.get_import_files_by_files, file_paths, repo_id),
+            "learnings": (
+                self._search, tenant_collection("learnings", repo_id), vectors[0], learnings_limit,
+                self._repo_filter(repo_id),
+            ),
+        }
+        if related_query:
+            lookups["related_code"] = (
+                self._search, tenant_collection("code_graphs", repo_id), vectors[1], related_limit,
+                self._related_code_filter(repo_id, file_paths),
+            )
+
+        executor = get_retriever_executor()
+        futures = {name: executor.submit(*call) for name, call in lookups.items()}
+        context = {name: future.result() for name, future in futures.items()}
+        context.setdefault("related_code", [])
+        return context
+    
+    # Async facade: native async store calls, queries embedded through the shared batcher
+
+    async def _afetch_by_files(self, collection_name: str, file_paths: List[str], repo_id: Optional[str]) -> List[Dict[str, Any]]:
+        if not file_paths:
+            return []
+        repo_id = self._repo(repo_id)
+        collection_name = tenant_collection(collection_name, repo_id)
+        must = self._files_filter(file_paths, repo_id)
+        payloads = await self._acached(
+            (collection_name, "fetch", RetrievalCache.filter_key(must), None),
+            lambda: self.store.afetch(collection_name, must=must),
+        )
+        return self._in_request_order(payloads, file_paths)
+
+    async def _asearch(
+            self,
+            collection_name: str,
+            query_vector: np.ndarray,
+            limit: int,
+            filters: Tuple[Optional[Conditions], Optional[Conditions]] = (None, None),
+    ) -> List[Dict[str, Any]]:
+        must, must_not = filters
+        return await self._acached(
+            self._search_key(collection_name, query_vector, limit, filters),
+            lambda: self.store.asearch(collection_name, query_vector, limit, must=must, must_not=must_not),
+        )
+
+    async def aget_code_graphs_by_files(self, file_paths: List[str], repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """get_code_graphs_by_files for async callers"""
+        return await self._afetch_by_files("code_graphs", file_paths, repo_id)
 
-        results = qdrant_client.search(
-            collection_name="learnings",
-            query_vector=query_vector,
-            limit=limit
+    async def aget_import_files_by_files(self, file_paths: List[str], repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """get_import_files_by_files for async callers"""
+        return await self._afetch_by_files("import_files", file_paths, repo_id)
+
+    async def aget_related_code(
+            self,
+            query_text: str,
+            limit: int = 5,
+            repo_id: Optional[str] = None,
+            exclude_files: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """get_related_code for async callers"""
+        repo_id = self._repo(repo_id)
+        query_vector = await get_batching_embedder().embed(query_text)
+        return await self._asearch(
+            tenant_collection("code_graphs", repo_id), query_vector, limit,
+            self._related_code_filter(repo_id, exclude_files),
+        )
+
+    async def aget_related_learnings(self, limit: int = 5, repo_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """get_related_learnings for async callers"""
+        repo_id = self._repo(repo_id)
+        query_vector = await get_batching_embedder().embed(LEARNINGS_QUERY)
+        return await self._asearch(
+            tenant_collection("learnings", repo_id), query_vector, limit, self._repo_filter(repo_id)
         )
 
-        learnings = [hit.payload for hit in results]
-        return learnings
+    async def aretrieve_context(
+            self,
+            file_paths: List[str],
+            related_query: Optional[str] = None,
+            related_limit: int = 5,
+            learnings_limit: int = 5,
+            repo_id: Optional[str] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """retrieve_context for async callers, with every lookup in flight at once"""
+        lookups = {
+            "code_graphs": self.aget_code_graphs_by_files(file_paths, repo_id),
+            "import_files": self.aget_import_files_by_files(file_paths, repo_id),
+            "learnings": self.aget_related_learnings(learnings_limit, repo_id),
+        }
+        if related_query:
+            lookups["related_code"] = self.aget_related_code(
+                related_query, related_limit, repo_id, exclude_files=file_paths
+            )
+
+        results = await asyncio.gather(*lookups.values())
+        context = dict(zip(lookups, results))
+        context.setdefault("related_code", [])
+        return context
     
     def format_for_ai(
             self,
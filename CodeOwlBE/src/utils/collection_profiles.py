@@ -0,0 +1,243 @@
+"""
+Named storage/index profiles for the Qdrant collections, and a command to
+move existing collections onto one in place.
+
+    python -m src.utils.collection_profiles --profile memory-lean
+    python -m src.utils.collection_profiles --profile low-latency --collections learnings
+"""
+import argparse
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionConfig,
+    CollectionParamsDiff,
+    CollectionStatus,
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
+
+from src.db.vector_store import COLLECTIONS, base_collection
+
+from .config import settings
+
+
+# Collection metadata key recording which profile a collection was created or migrated on
+PROFILE_KEY = "profile"
+
+
+class CollectionProfile(NamedTuple):
+    """How a collection stores and indexes its vectors, and how it is searched"""
+
+    quantization: Optional[str] = None  # None, scalar (int8) or binary
+    quantized_in_ram: bool = True  # keep quantized vectors in RAM when the originals are on disk
+    rescore: bool = True  # re-rank quantized candidates with the original vectors
+    oversampling: float = 1.0  # candidates fetched per result before rescoring
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = True
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    hnsw_ef: Optional[int] = None  # search-time beam width, None uses the server default
+    default_segment_number: int = 0  # 0 lets the server pick from the CPU count
+    max_segment_size: Optional[int] = None  # kilobytes
+    indexing_threshold: int = 20000  # kilobytes of vectors before a segment gets an HNSW index
+
+
+PROFILES: Dict[str, CollectionProfile] = {
+    # Qdrant defaults: full float32 vectors and the HNSW graph in RAM
+    "default": CollectionProfile(),
+    # int8 copies (4x smaller) in RAM, originals and graph memory-mapped from disk,
+    # few large segments; rescoring reads only the oversampled candidates from disk
+    "memory-lean": CollectionProfile(
+        quantization="scalar",
+        oversampling=2.0,
+        on_disk_vectors=True,
+        hnsw_on_disk=True,
+        default_segment_number=2,
+        max_segment_size=512 * 1024,
+    ),
+    # 1-bit copies (32x smaller); only worth it for 512+ dimension models, since
+    # recall on small embeddings leans heavily on oversampling
+    "minimal-memory": CollectionProfile(
+        quantization="binary",
+        oversampling=4.0,
+        on_disk_vectors=True,
+        hnsw_on_disk=True,
+        default_segment_number=2,
+        max_segment_size=512 * 1024,
+    ),
+    # Everything in RAM, a denser graph and int8 candidates rescored from RAM
+    "low-latency": CollectionProfile(
+        quantization="scalar",
+        oversampling=1.5,
+        on_disk_payload=False,
+        hnsw_m=32,
+        hnsw_ef_construct=200,
+        hnsw_ef=128,
+    ),
+}
+
+
+def profile_name(collection_name: str) -> str:
+    """
+    Profile configured for a collection: its own override, else that of the
+    shared collection it belongs to, else the global one.
+    """
+    overrides = settings.qdrant_collection_profiles
+    return overrides.get(
+        collection_name, overrides.get(base_collection(collection_name), settings.qdrant_collection_profile)
+    )
+
+
+def get_profile(name: str) -> CollectionProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile {name!r}, expected one of {', '.join(PROFILES)}") from None
+
+
+def _quantization(profile: CollectionProfile):
+    if profile.quantization is None:
+        return None
+    if profile.quantization == "scalar":
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8, quantile=0.99, always_ram=profile.quantized_in_ram
+        ))
+    if profile.quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=profile.quantized_in_ram))
+    raise ValueError(f"Unknown quantization {profile.quantization!r}, expected scalar or binary")
+
+
+def _hnsw(profile: CollectionProfile, tenant_graphs: bool = False) -> HnswConfigDiff:
+    if tenant_graphs:
+        # No global graph (m=0); one graph per tenant-field value instead, so a
+        # repo-filtered search costs what that repository's size costs
+        return HnswConfigDiff(
+            m=0, payload_m=profile.hnsw_m, ef_construct=profile.hnsw_ef_construct, on_disk=profile.hnsw_on_disk
+        )
+    return HnswConfigDiff(m=profile.hnsw_m, ef_construct=profile.hnsw_ef_construct, on_disk=profile.hnsw_on_disk)
+
+
+def _optimizers(profile: CollectionProfile) -> OptimizersConfigDiff:
+    return OptimizersConfigDiff(
+        default_segment_number=profile.default_segment_number,
+        max_segment_size=profile.max_segment_size,
+        indexing_threshold=profile.indexing_threshold,
+    )
+
+
+def create_arguments(
+    name: str, profile: CollectionProfile, dimension: int, tenant_graphs: bool = False
+) -> Dict[str, Any]:
+    """Keyword arguments for QdrantClient.create_collection; tenant_graphs indexes each repository separately"""
+    return {
+        "metadata": {PROFILE_KEY: name},
+        "vectors_config": VectorParams(size=dimension, distance=Distance.COSINE, on_disk=profile.on_disk_vectors),
+        "on_disk_payload": profile.on_disk_payload,
+        "hnsw_config": _hnsw(profile, tenant_graphs),
+        "optimizers_config": _optimizers(profile),
+        "quantization_config": _quantization(profile),
+    }
+
+
+def update_arguments(name: str, profile: CollectionProfile, tenant_graphs: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for QdrantClient.update_collection, moving a collection onto profile"""
+    return {
+        "metadata": {PROFILE_KEY: name},
+        # "" is the collection's single unnamed vector
+        "vectors_config": {"": VectorParamsDiff(on_disk=profile.on_disk_vectors)},
+        "collection_params": CollectionParamsDiff(on_disk_payload=profile.on_disk_payload),
+        "hnsw_config": _hnsw(profile, tenant_graphs),
+        "optimizers_config": _optimizers(profile),
+        "quantization_config": _quantization(profile) or Disabled.DISABLED,
+    }
+
+
+def search_params(profile: CollectionProfile) -> Optional[SearchParams]:
+    """Query-time parameters matching profile, None when the server defaults apply"""
+    if profile.quantization is None and profile.hnsw_ef is None:
+        return None
+    quantization = None
+    if profile.quantization is not None:
+        quantization = QuantizationSearchParams(rescore=profile.rescore, oversampling=profile.oversampling)
+    return SearchParams(hnsw_ef=profile.hnsw_ef, quantization=quantization)
+
+
+def collection_search_params(config: CollectionConfig) -> Optional[SearchParams]:
+    """
+    Query-time parameters for a collection as it is actually stored: those of
+    the profile recorded in its metadata. Collections created before profiles
+    were recorded rescore if they are quantized and use server defaults otherwise.
+    """
+    name = (config.metadata or {}).get(PROFILE_KEY)
+    if name in PROFILES:
+        return search_params(PROFILES[name])
+    if config.quantization_config is not None:
+        return SearchParams(quantization=QuantizationSearchParams(rescore=True))
+    return None
+
+
+def migrate_collection(
+    client: QdrantClient,
+    collection_name: str,
+    name: str,
+    tenant_graphs: bool = False,
+    wait: bool = True,
+    poll_seconds: float = 2.0,
+):
+    """
+    Move an existing collection onto the named profile without taking it offline.
+
+    Qdrant applies the change in place: the collection keeps serving reads
+    and writes from its current segments while the optimizer rebuilds them
+    under the new layout in the background.
+    """
+    arguments = update_arguments(name, get_profile(name), tenant_graphs)
+    client.update_collection(collection_name=collection_name, **arguments)
+    if not wait:
+        return
+    while True:
+        info = client.get_collection(collection_name)
+        if info.status == CollectionStatus.GREEN:
+            return
+        if info.status == CollectionStatus.RED:
+            raise RuntimeError(f"Optimizing {collection_name} failed: {info.optimizer_status}")
+        print(f"{collection_name}: optimizing ({info.status.value}, {info.points_count} points)")
+        time.sleep(poll_seconds)
+
+
+def main(argv: Optional[List[str]] = None):
+    from .qdrant_client import qdrant_client
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", help="profile to apply (default: each collection's configured profile)")
+    parser.add_argument("--collections", nargs="+", help="default: the shared collections and every dedicated one")
+    parser.add_argument("--no-wait", action="store_true", help="return before the optimizer finishes")
+    args = parser.parse_args(argv)
+
+    collections = args.collections or [
+        collection.name for collection in qdrant_client.get_collections().collections
+        if base_collection(collection.name) in COLLECTIONS
+    ]
+    for collection_name in collections:
+        name = args.profile or profile_name(collection_name)
+        tenant_graphs = settings.qdrant_tenant_graphs and collection_name in COLLECTIONS
+        migrate_collection(qdrant_client, collection_name, name, tenant_graphs, wait=not args.no_wait)
+        print(f"{collection_name}: now on profile {name}")
+
+
+if __name__ == "__main__":
+    main()
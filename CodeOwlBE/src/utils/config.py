@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,10 +25,53 @@ class Settings(BaseSettings):
     # Qdrant Configuration
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
+    qdrant_grpc_port: int = 6334
+    qdrant_prefer_grpc: bool = False
+    qdrant_timeout: int = 10  # seconds
+    qdrant_http2: bool = False  # needs TLS; plain-HTTP servers fall back to HTTP/1.1
+    qdrant_pool_size: int = 32
+    qdrant_keepalive_expiry: float = 30.0  # seconds an idle pooled connection stays open
+    qdrant_collection_profile: str = "default"  # default, memory-lean, minimal-memory or low-latency
+    qdrant_collection_profiles: Dict[str, str] = {}  # per-collection overrides, e.g. {"learnings": "low-latency"}
+    qdrant_tenant_graphs: bool = False  # per-repo HNSW graphs in the shared collections; unfiltered searches scan
+
+    # Vector Store Configuration
+    vector_store_backend: str = "qdrant"  # qdrant or local (embedded, no server)
+    local_store_dir: str = "./.cache/vectors"
+    local_store_hnsw_threshold: int = 20000  # points before local search switches to HNSW (needs the hnsw extra)
+    vector_dedicated_repos: List[str] = []  # repos (large tenants) given their own collections
+
+    # Retrieval Cache Configuration
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_max_entries: int = 2048
+    retrieval_cache_max_bytes: int = 64 * 1024 * 1024
+    retrieval_cache_ttl_seconds: float = 300.0  # bounds staleness from writers in other processes
 
     # Embedding Configuration
     embedding_model: str = "BAAI/bge-small-en-v1.5"
     embedding_dimension: int = 384
+    embedding_batch_size: int = 64
+    embedding_batch_wait_ms: float = 5.0  # max time a request waits for a batch to fill
+    embedding_backend: str = "torch"  # torch, onnx or onnx-int8
+    embedding_onnx_dir: str = "./.cache/onnx"
+    embedding_quantization: str = "avx2"  # arm64, avx2, avx512 or avx512_vnni
+    embedding_warmup: bool = True  # load the model at startup instead of on the first request
+
+    # Embedding Cache Configuration
+    embedding_cache_enabled: bool = True
+    embedding_cache_dir: str = "./.cache/embeddings"
+    embedding_cache_max_bytes: int = 256 * 1024 * 1024
+    embedding_cache_memory_entries: int = 10000
+
+    # Bulk Indexing Configuration
+    qdrant_upsert_batch_size: int = 256
+    qdrant_upsert_parallel: int = 4
+
+    # AST Analysis Cache Configuration
+    analysis_cache_dir: str = "./.cache/analysis"
+    analysis_cache_max_bytes: int = 512 * 1024 * 1024
+    analysis_cache_memory_entries: int = 1024
+    ast_parse_workers: int = 0  # 0 uses every available core
 
     # Application Configuration
     temp_repo_dir: str = "./temp_repos"
@@ -0,0 +1,117 @@
+"""
+Query latency of the synchronous and asyncio Qdrant clients under
+concurrent load, against a scratch collection of random vectors.
+
+    python -m src.utils.qdrant_benchmark --points 20000 --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import Batch, Distance, VectorParams
+
+from .qdrant_client import create_async_client, create_client
+
+
+def _summary(name: str, latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    ms = np.array(latencies) * 1000
+    return {
+        "client": name,
+        "requests": len(latencies),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "throughput": len(latencies) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def run_sync(client: QdrantClient, collection_name: str, queries: np.ndarray, concurrency: int, limit: int) -> Dict[str, Any]:
+    """One blocking client shared by a pool of concurrency threads"""
+    def query(vector: np.ndarray) -> float:
+        started = time.perf_counter()
+        client.query_points(collection_name=collection_name, query=vector, limit=limit)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(query, queries))
+    return _summary("sync", latencies, time.perf_counter() - started)
+
+
+async def run_async(client: AsyncQdrantClient, collection_name: str, queries: np.ndarray, concurrency: int, limit: int) -> Dict[str, Any]:
+    """One asyncio client with at most concurrency requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def query(vector: np.ndarray) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await client.query_points(collection_name=collection_name, query=vector, limit=limit)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(query(vector) for vector in queries))
+    return _summary("async", list(latencies), time.perf_counter() - started)
+
+
+async def _run_fresh_async(collection_name: str, queries: np.ndarray, concurrency: int, limit: int, **overrides: Any) -> Dict[str, Any]:
+    client = create_async_client(**overrides)
+    try:
+        return await run_async(client, collection_name, queries, concurrency, limit)
+    finally:
+        await client.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    from .config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--grpc", action="store_true", help="also run both clients over gRPC")
+    parser.add_argument("--location", help="e.g. :memory: to smoke-test without a server")
+    args = parser.parse_args(argv)
+
+    overrides = {"location": args.location} if args.location else {}
+    rng = np.random.default_rng(0)
+    dim = settings.embedding_dimension
+    collection_name = f"benchmark_{uuid.uuid4().hex[:8]}"
+
+    setup = create_client(**overrides)
+    setup.create_collection(collection_name, vectors_config=VectorParams(size=dim, distance=Distance.COSINE))
+    try:
+        for start in range(0, args.points, 1000):
+            count = min(1000, args.points - start)
+            setup.upsert(collection_name, points=Batch(
+                ids=list(range(start, start + count)),
+                vectors=rng.standard_normal((count, dim), dtype=np.float32).tolist(),
+            ))
+        queries = rng.standard_normal((args.requests, dim), dtype=np.float32)
+
+        transports = [False, True] if args.grpc and not args.location else [False]
+        for prefer_grpc in transports:
+            label = "grpc" if prefer_grpc else "rest"
+            client = setup if args.location else create_client(prefer_grpc=prefer_grpc, **overrides)
+            results = [run_sync(client, collection_name, queries, args.concurrency, args.limit)]
+            if args.location:
+                print("(the async client cannot share an in-memory store, skipping it)")
+            else:
+                results.append(asyncio.run(_run_fresh_async(
+                    collection_name, queries, args.concurrency, args.limit, prefer_grpc=prefer_grpc
+                )))
+            for result in results:
+                print(
+                    f"{label:<5} {result['client']:<6} p50 {result['p50_ms']:7.2f} ms  "
+                    f"p99 {result['p99_ms']:7.2f} ms  {result['throughput']:8.1f} req/s"
+                )
+    finally:
+        setup.delete_collection(collection_name)
+
+
+if __name__ == "__main__":
+    main()
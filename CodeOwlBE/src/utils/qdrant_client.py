@@ -1,27 +1,128 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import KeywordIndexParams, KeywordIndexType, PayloadSchemaType
+
+from src.db.vector_store import COLLECTIONS, TENANT_FIELD, base_collection
+
+from .collection_profiles import create_arguments, get_profile, profile_name
 from .config import settings
 
-qdrant_client = QdrantClient(
-    host=settings.qdrant_host,
-    port=settings.qdrant_port
-)
-
-
-def initialize_collections():
-    """Create 3 collections: code_graphs, import_files, learnings"""
-    collections = ["code_graphs", "import_files", "learnings"]
-
-    for collection in collections:
-        if not qdrant_client.collection_exists(collection):
-            qdrant_client.create_collection(
-                collection_name=collection,
-                vectors_config=VectorParams(
-                    size=settings.embedding_dimension,
-                    distance=Distance.COSINE
-                ),
-            )
-            print(f"Created collection: {collection}")
+
+def client_options(**overrides: Any) -> Dict[str, Any]:
+    """Connection, transport and pooling arguments shared by the sync and async clients"""
+    options: Dict[str, Any] = {
+        "host": settings.qdrant_host,
+        "port": settings.qdrant_port,
+        "grpc_port": settings.qdrant_grpc_port,
+        "prefer_grpc": settings.qdrant_prefer_grpc,
+        "timeout": settings.qdrant_timeout,
+        "http2": settings.qdrant_http2,
+        "limits": httpx.Limits(
+            max_connections=settings.qdrant_pool_size,
+            max_keepalive_connections=settings.qdrant_pool_size,
+            keepalive_expiry=settings.qdrant_keepalive_expiry,
+        ),
+    }
+    options.update(overrides)
+    if "location" in options or "url" in options:
+        options.pop("host", None)
+    return options
+
+
+def create_client(**overrides: Any) -> QdrantClient:
+    """Synchronous client configured from settings"""
+    return QdrantClient(**client_options(**overrides))
+
+
+def create_async_client(**overrides: Any) -> AsyncQdrantClient:
+    """Asyncio client configured from settings"""
+    return AsyncQdrantClient(**client_options(**overrides))
+
+
+qdrant_client = create_client()
+
+_async_client: Optional[AsyncQdrantClient] = None
+_async_lock = threading.Lock()
+
+
+def get_async_client() -> AsyncQdrantClient:
+    """Process-wide AsyncQdrantClient, created on first use"""
+    global _async_client
+    if _async_client is None:
+        with _async_lock:
+            if _async_client is None:
+                _async_client = create_async_client()
+    return _async_client
+
+
+# Payload fields each collection is filtered on, indexed as exact-match keywords
+PAYLOAD_INDEXES = {
+    "code_graphs": ["file_path", "repo_id", "generation"],
+    "import_files": ["file_path", "repo_id", "generation"],
+    "learnings": ["repo_id"],
+}
+
+# The tenant field's index also groups each repository's points together on
+# disk, so a repo-filtered search reads only that repository's data
+TENANT_INDEX = KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)
+
+
+def _collection_setup(collection: str, dimension: Optional[int]) -> Tuple[str, Dict[str, Any], List[Tuple[str, Any]]]:
+    """(profile name, create_collection arguments, payload indexes) for a collection"""
+    base = base_collection(collection)
+    profile = profile_name(collection)
+    arguments = create_arguments(
+        profile,
+        get_profile(profile),
+        dimension or settings.embedding_dimension,
+        tenant_graphs=settings.qdrant_tenant_graphs and collection == base,
+    )
+    indexes = [
+        (field, TENANT_INDEX if field == TENANT_FIELD else PayloadSchemaType.KEYWORD)
+        for field in PAYLOAD_INDEXES.get(base, [])
+    ]
+    return profile, arguments, indexes
+
+
+def initialize_collections(
+    collections: Optional[Iterable[str]] = None,
+    client: Optional[QdrantClient] = None,
+    dimension: Optional[int] = None,
+):
+    """
+    Create the collections (default: code_graphs, import_files, learnings)
+    and their payload indexes, on client (default: the shared one).
+    """
+    client = client or qdrant_client
+    for collection in collections or COLLECTIONS:
+        profile, arguments, indexes = _collection_setup(collection, dimension)
+        if not client.collection_exists(collection):
+            client.create_collection(collection_name=collection, **arguments)
+            print(f"Created collection: {collection} (profile {profile})")
         else:
-            print(f"Collection already exists: {collection}")
\ No newline at end of file
+            # Profiles are not re-applied here; python -m src.utils.collection_profiles migrates
+            print(f"Collection already exists: {collection}")
+
+        # Creating an index that already exists is a no-op, so existing
+        # collections pick up fields added here
+        for field, schema in indexes:
+            client.create_payload_index(collection_name=collection, field_name=field, field_schema=schema)
+
+
+async def ainitialize_collections(
+    collections: Optional[Iterable[str]] = None,
+    client: Optional[AsyncQdrantClient] = None,
+    dimension: Optional[int] = None,
+):
+    """initialize_collections on an asyncio client (default: the shared one)"""
+    client = client or get_async_client()
+    for collection in collections or COLLECTIONS:
+        profile, arguments, indexes = _collection_setup(collection, dimension)
+        if not await client.collection_exists(collection):
+            await client.create_collection(collection_name=collection, **arguments)
+            print(f"Created collection: {collection} (profile {profile})")
+        for field, schema in indexes:
+            await client.create_payload_index(collection_name=collection, field_name=field, field_schema=schema)
@@ -0,0 +1,31 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Server startup: load the embedding model before the first request.
+
+    Parse workers (ParallelParser) are forked from this process, so the
+    model is preloaded for fork and stays shared with them instead of being
+    copied page by page by their garbage collections.
+    """
+    from src.utils.config import settings
+
+    if settings.embedding_warmup:
+        from src.db.model_registry import preload_for_fork
+
+        preload_for_fork()
+    yield
+
+
+app = FastAPI(title="CodeOwl", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    from src.db.model_registry import loaded_models
+
+    return {"status": "ok", "models": loaded_models()}
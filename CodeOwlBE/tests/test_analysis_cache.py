@@ -0,0 +1,63 @@
+import subprocess
+
+from src.services.ast.analysis_cache import AnalysisCache, git_blob_sha
+from src.services.ast.parser import SimpleASTParser
+
+
+SOURCE = b"import os\n\n\nclass A:\n    def m(self):\n        helper()\n\n\ndef helper():\n    pass\n"
+
+
+def _summary(analysis, graph):
+    return (
+        [(f["name"], f["type"], f["start_line"], f["source"]) for f in analysis["functions"]],
+        [(c["name"], c["type"]) for c in analysis["classes"]],
+        analysis["imports"],
+        sorted(graph.to_networkx().nodes),
+    )
+
+
+def test_blob_sha_matches_git():
+    expected = subprocess.run(
+        ["git", "hash-object", "--stdin"], input=SOURCE, capture_output=True, check=True
+    ).stdout.decode().strip()
+
+    assert git_blob_sha(SOURCE) == expected
+
+
+def test_same_blob_at_another_path_is_a_hit(tmp_path):
+    parser = SimpleASTParser("python")
+    cache = AnalysisCache(str(tmp_path))
+
+    fresh = parser.analyze_path("pkg/a.py", cache, SOURCE)
+    moved = parser.analyze_path("pkg/b.py", cache, SOURCE)
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["disk_hits"] == 1
+    assert moved[0]["file_path"] == "pkg/b.py"
+    assert "pkg/b.py::class::A" in moved[1].to_networkx()
+    assert _summary(*moved) == _summary(*parser.analyze_path("pkg/b.py", data=SOURCE))
+    assert _summary(*fresh) == _summary(*parser.analyze_path("pkg/a.py", data=SOURCE))
+
+
+def test_disk_hit_after_reopen_and_miss_on_change(tmp_path):
+    parser = SimpleASTParser("python")
+    parser.analyze_path("a.py", AnalysisCache(str(tmp_path)), SOURCE)
+
+    cache = AnalysisCache(str(tmp_path))
+    cached = parser.analyze_path("a.py", cache, SOURCE)
+    parser.analyze_path("a.py", cache, SOURCE + b"\n\ndef other():\n    pass\n")
+
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert _summary(*cached) == _summary(*parser.analyze_path("a.py", data=SOURCE))
+
+
+def test_evicts_to_fit_max_bytes(tmp_path):
+    parser = SimpleASTParser("python")
+    cache = AnalysisCache(str(tmp_path), max_bytes=1)
+
+    for i in range(3):
+        parser.analyze_path(f"m{i}.py", cache, SOURCE + f"\n# {i}\n".encode())
+
+    assert cache.stats()["evictions"] == 3
+    assert cache.disk_bytes() == 0
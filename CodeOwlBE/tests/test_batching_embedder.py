@@ -0,0 +1,42 @@
+import asyncio
+
+import numpy as np
+
+from src.db.batching_embedder import BatchingEmbedder
+
+
+class RecordingService:
+    """Stands in for EmbeddingService: one row per text, its length in every column"""
+
+    embedding_dim = 4
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts, batch_size=None, normalize=False):
+        self.batches.append(list(texts))
+        return np.stack([np.full(self.embedding_dim, len(text), dtype=np.float32) for text in texts])
+
+
+def test_concurrent_requests_share_a_batch():
+    service = RecordingService()
+    batcher = BatchingEmbedder(service, max_batch_size=8, max_wait_ms=50)
+    texts = ["a", "bb", "ccc"]
+
+    try:
+        vectors = asyncio.run(batcher.embed_many(texts))
+    finally:
+        batcher.close()
+
+    assert service.batches == [texts]
+    assert [int(vector[0]) for vector in vectors] == [1, 2, 3]
+
+
+def test_blank_text_skips_the_model():
+    service = RecordingService()
+    batcher = BatchingEmbedder(service)
+
+    vector = asyncio.run(batcher.embed("  "))
+
+    assert service.batches == []
+    assert not vector.any()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.db.local_vector_store import LocalVectorStore
+from src.db.vector_indexer import VectorIndexer, point_id
+from src.db.vector_store import tenant_collection
+from src.utils.config import settings
+
+
+class TextLengthService:
+    """Stands in for EmbeddingService: embeds each text as its length"""
+
+    def __init__(self):
+        self.batches = []
+
+    def import_file_text(self, file_path, source_code, imports):
+        return file_path + source_code
+
+    def learning_text(self, commit_msg, bot_comment, user_feedback="", code_context=""):
+        return commit_msg + bot_comment
+
+    def embed_batch(self, texts, batch_size=None, normalize=False):
+        self.batches.append(len(texts))
+        return np.stack([np.full(4, len(text), dtype=np.float32) for text in texts])
+
+
+class RecordingStore(LocalVectorStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.upserts = []
+
+    def upsert(self, collection_name, ids, vectors, payloads, wait=True):
+        self.upserts.append((len(ids), wait))
+        super().upsert(collection_name, ids, vectors, payloads, wait)
+
+
+@pytest.fixture
+def indexer(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.db.vector_indexer.get_embedding_service", TextLengthService)
+    monkeypatch.setattr(settings, "qdrant_upsert_batch_size", 3)
+    monkeypatch.setattr(settings, "qdrant_upsert_parallel", 2)
+    store = RecordingStore(str(tmp_path))
+    yield VectorIndexer("r1", store=store)
+    store.close()
+
+
+def test_bulk_index_embeds_in_batches_and_upserts_in_chunks(indexer):
+    records = [(f"f{i}.py", "x" * i, ["os"]) for i in range(10)]
+    progress = []
+
+    ids = indexer.index_import_files(records, batch_size=4, progress=lambda done, total: progress.append(done))
+
+    assert ids == [point_id("import_file", f"f{i}.py", "r1") for i in range(10)]
+    assert indexer.embedding_service.batches == [4, 4, 2]
+    assert progress == [4, 8, 10]
+    assert sum(n for n, _ in indexer.store.upserts) == 10
+    # Only the last chunk waits; it is the barrier for the ones before it
+    assert [wait for _, wait in indexer.store.upserts][-1] is True
+    assert not any(wait for _, wait in indexer.store.upserts[:-1])
+    collection_name = tenant_collection("import_files", "r1")
+    assert indexer.store.count(collection_name) == 10
+
+
+def test_bulk_learnings_and_sweep(indexer):
+    records = [{"commit_msg": f"c{i}", "bot_comment": "b"} for i in range(3)]
+    indexer.index_learnings(records, progress=lambda *_: None)
+    indexer.index_import_files([("a.py", "", []), ("b.py", "", [])], generation="g1", progress=lambda *_: None)
+    indexer.index_import_files([("a.py", "", [])], generation="g2", progress=lambda *_: None)
+
+    indexer.sweep_stale(None, "g2", ["import_files"])
+
+    assert indexer.store.count(tenant_collection("learnings", "r1")) == 3
+    assert [p["file_path"] for p in indexer.store.fetch(tenant_collection("import_files", "r1"))] == ["a.py"]
@@ -0,0 +1,128 @@
+import networkx as nx
+import pytest
+
+from src.services.ast.code_graph import CodeGraph, EdgeKind, NodeKind, merge_graphs
+from src.services.ast.graph_builder import build_simple_graph
+from src.services.ast.parser import SimpleASTParser
+
+
+# (file, kind, name) nodes and edges between them, as the extractors emit them
+NODES = [
+    ("app.py", NodeKind.FILE, ""),
+    ("app.py", NodeKind.CLASS, "App"),
+    ("app.py", NodeKind.METHOD, "run"),
+    ("app.py", NodeKind.FUNCTION, "main"),
+    ("app.py", NodeKind.IMPORT, "import os"),
+    ("app.py", NodeKind.CALL, "self.run"),
+    ("app.py", NodeKind.CALL, "App"),
+]
+EDGES = [
+    (1, 2, EdgeKind.CONTAINS),
+    (0, 4, EdgeKind.IMPORTS),
+    (3, 6, EdgeKind.CALLS),
+    (2, 5, EdgeKind.CALLS),
+    (3, 4, EdgeKind.USES),
+    (3, 4, EdgeKind.CALLS),  # a repeated edge keeps the latest kind
+]
+
+
+def _legacy_label(file_path, kind, name):
+    return f"{file_path}::file" if kind == NodeKind.FILE else f"{file_path}::{kind.label}::{name}"
+
+
+def _legacy_graph(nodes, edges):
+    """The string-labelled networkx graph the extractors built before CodeGraph"""
+    graph = nx.DiGraph()
+    labels = []
+    for file_path, kind, name in nodes:
+        label = _legacy_label(file_path, kind, name)
+        if kind == NodeKind.FILE:
+            graph.add_node(label, type="file")
+        elif kind == NodeKind.IMPORT:
+            graph.add_node(label, type="import", text=name)
+        else:
+            graph.add_node(label, type=kind.label, name=name)
+        labels.append(label)
+    for src, dst, kind in edges:
+        graph.add_edge(labels[src], labels[dst], type=kind.label)
+    return graph
+
+
+def _code_graph(nodes, edges):
+    graph = CodeGraph()
+    ids = [graph.add_node(*node) for node in nodes]
+    for src, dst, kind in edges:
+        graph.add_edge(ids[src], ids[dst], kind)
+    return graph
+
+
+def _same_graph(graph: nx.DiGraph, legacy: nx.DiGraph):
+    assert dict(graph.nodes(data=True)) == dict(legacy.nodes(data=True))
+    assert {(u, v): d for u, v, d in graph.edges(data=True)} == {(u, v): d for u, v, d in legacy.edges(data=True)}
+
+
+def test_matches_legacy_networkx_graph():
+    _same_graph(_code_graph(NODES, EDGES).to_networkx(), _legacy_graph(NODES, EDGES))
+
+
+def test_nodes_are_deduplicated():
+    graph = _code_graph(NODES, EDGES)
+    assert graph.add_node("app.py", NodeKind.FUNCTION, "main") == 3
+    assert graph.find_node("app.py", NodeKind.FUNCTION, "main") == 3
+    assert graph.find_node("app.py", NodeKind.CLASS, "main") is None
+    assert graph.number_of_nodes() == len(NODES)
+    assert graph.number_of_edges() == _legacy_graph(NODES, EDGES).number_of_edges()
+
+
+@pytest.mark.parametrize("node", range(len(NODES)))
+def test_neighbors_match_legacy(node):
+    graph = _code_graph(NODES, EDGES)
+    legacy = _legacy_graph(NODES, EDGES)
+    label = graph.label(node)
+    assert {graph.label(n) for n in graph.successors(node)} == set(legacy.successors(label))
+    assert {graph.label(n) for n in graph.predecessors(node)} == set(legacy.predecessors(label))
+
+
+@pytest.mark.parametrize("direction", ["forward", "reverse", "both"])
+def test_k_hop_matches_networkx_bfs(direction):
+    graph = _code_graph(NODES, EDGES)
+    legacy = _legacy_graph(NODES, EDGES)
+    search = {"forward": legacy, "reverse": legacy.reverse(), "both": legacy.to_undirected()}[direction]
+
+    node_ids, hops = graph.k_hop([1], k=2, direction=direction)
+
+    expected = nx.single_source_shortest_path_length(search, graph.label(1), cutoff=2)
+    assert {graph.label(n): int(h) for n, h in zip(node_ids, hops)} == expected
+
+
+def test_merge_matches_compose():
+    other_nodes = [("lib.py", NodeKind.FUNCTION, "helper"), ("app.py", NodeKind.FUNCTION, "main")]
+    other_edges = [(1, 0, EdgeKind.CALLS)]
+
+    merged = merge_graphs([_code_graph(NODES, EDGES), _code_graph(other_nodes, other_edges)])
+
+    legacy = nx.compose(_legacy_graph(NODES, EDGES), _legacy_graph(other_nodes, other_edges))
+    _same_graph(merged.to_networkx(), legacy)
+
+
+def test_payload_round_trip_moves_file():
+    payload = _code_graph(NODES, EDGES).to_payload("app.py")
+
+    moved = CodeGraph.from_payload(payload, "pkg/app.py")
+
+    expected = [("pkg/app.py", kind, name) for _, kind, name in NODES]
+    _same_graph(moved.to_networkx(), _legacy_graph(expected, EDGES))
+
+
+def test_parsed_file_keeps_legacy_labels():
+    source = "import os\n\nclass App:\n    def run(self):\n        return os.getcwd()\n\ndef main():\n    App().run()\n"
+    parser = SimpleASTParser("python")
+    tree, text = parser.parse_bytes(source.encode())
+
+    graph = build_simple_graph(tree, text, "python", "app.py")
+
+    assert graph.nodes["app.py::file"] == {"type": "file"}
+    assert graph.nodes["app.py::class::App"] == {"type": "class", "name": "App"}
+    assert graph.nodes["app.py::import::import os"] == {"type": "import", "text": "import os"}
+    assert graph.edges["app.py::file", "app.py::import::import os"] == {"type": "imports"}
+    assert graph.edges["app.py::function::main", "app.py::call::App"] == {"type": "calls"}
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from src.db.qdrant_store import QdrantStore
+from src.utils.collection_profiles import (
+    PROFILES,
+    _quantization,
+    collection_search_params,
+    create_arguments,
+    get_profile,
+    migrate_collection,
+    search_params,
+)
+
+
+def _create(client, collection_name, name):
+    client.create_collection(collection_name, **create_arguments(name, get_profile(name), 4))
+
+
+def test_search_params_follow_the_stored_profile():
+    client = QdrantClient(":memory:")
+    _create(client, "fast", "low-latency")
+    _create(client, "plain", "default")
+
+    store = QdrantStore(client=client)
+
+    assert store.search_params("fast") == search_params(PROFILES["low-latency"])
+    assert store.search_params("plain") is None
+
+
+def test_migration_records_the_new_profile():
+    client = QdrantClient(":memory:")
+    _create(client, "c", "default")
+
+    migrate_collection(client, "c", "memory-lean", wait=False)
+
+    assert QdrantStore(client=client).search_params("c") == search_params(PROFILES["memory-lean"])
+
+
+def test_unrecorded_collections_fall_back_on_their_quantization():
+    quantized = SimpleNamespace(metadata=None, quantization_config=_quantization(PROFILES["memory-lean"]))
+    plain = SimpleNamespace(metadata={}, quantization_config=None)
+
+    assert collection_search_params(quantized).quantization.rescore
+    assert collection_search_params(plain) is None
+
+
+def test_async_search_params():
+    async def run():
+        client = AsyncQdrantClient(":memory:")
+        await client.create_collection("fast", **create_arguments("low-latency", get_profile("low-latency"), 4))
+        return await QdrantStore(async_client=client).asearch_params("fast")
+
+    assert asyncio.run(run()) == search_params(PROFILES["low-latency"])
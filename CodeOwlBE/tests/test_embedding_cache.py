@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.db.embedding_cache import EmbeddingCache
+
+
+VECTOR_BYTES = 4 * 4
+
+
+def vec(x: float) -> np.ndarray:
+    return np.full(4, x, dtype=np.float32)
+
+
+def test_memory_hits_and_misses(tmp_path):
+    cache = EmbeddingCache("m", str(tmp_path))
+    cache.put_many(["a"], [vec(1)])
+
+    a, b = cache.get_many([" a ", "b"])
+
+    np.testing.assert_array_equal(a, vec(1))
+    assert b is None
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_level_survives_reopen(tmp_path):
+    EmbeddingCache("m", str(tmp_path)).put_many(["a", "b"], [vec(1), vec(2)])
+
+    cache = EmbeddingCache("m", str(tmp_path))
+    a, b = cache.get_many(["a", "b"])
+    cache.get_many(["a"])
+
+    np.testing.assert_array_equal(b, vec(2))
+    assert cache.stats()["disk_hits"] == 2
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_disk_bytes_are_shared_between_instances(tmp_path):
+    first = EmbeddingCache("m", str(tmp_path))
+    second = EmbeddingCache("m", str(tmp_path))
+
+    first.put_many(["a"], [vec(1)])
+    second.put_many(["b", "a"], [vec(2), vec(3)])
+
+    assert first.disk_bytes() == second.disk_bytes() == 2 * VECTOR_BYTES
+    np.testing.assert_array_equal(EmbeddingCache("m", str(tmp_path)).get_many(["a"])[0], vec(3))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache("m", str(tmp_path), max_bytes=2 * VECTOR_BYTES, memory_entries=1)
+    cache.put_many(["a"], [vec(1)])
+    cache.put_many(["b"], [vec(2)])
+    cache.get_many(["a"])
+
+    cache.put_many(["c"], [vec(3)])
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.disk_bytes() == 2 * VECTOR_BYTES
+    reopened = EmbeddingCache("m", str(tmp_path))
+    assert [v is not None for v in reopened.get_many(["a", "b", "c"])] == [True, False, True]
+
+
+def test_model_change_clears_the_store(tmp_path):
+    EmbeddingCache("m", str(tmp_path)).put_many(["a"], [vec(1)])
+
+    cache = EmbeddingCache("other", str(tmp_path))
+
+    assert cache.disk_bytes() == 0
+    assert cache.get_many(["a"]) == [None]
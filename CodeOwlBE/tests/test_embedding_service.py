@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from src.db.embedding_service import EmbeddingService
+from src.utils.config import settings
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word, plus [CLS] and [SEP]"""
+
+    is_fast = False
+
+    def __call__(self, texts, add_special_tokens=True, truncation=False, max_length=None, **kwargs):
+        def encode(text):
+            ids = text.split()
+            if add_special_tokens:
+                ids = ["[CLS]"] + ids + ["[SEP]"]
+            return ids[:max_length] if truncation else ids
+
+        if isinstance(texts, str):
+            return {"input_ids": encode(texts)}
+        return {"input_ids": [encode(text) for text in texts]}
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+class WordCountModel:
+    """Stands in for a SentenceTransformer: embeds a text as its word count"""
+
+    max_seq_length = 12
+
+    def __init__(self):
+        self.tokenizer = WordTokenizer()
+        self.batches = []
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True):
+        self.batches.append(list(texts))
+        return np.array([[len(text.split()), 1.0, 0.0, 0.0] for text in texts])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    model = WordCountModel()
+    monkeypatch.setattr("src.db.embedding_service.get_model", lambda *args: model)
+    monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+    monkeypatch.setattr(settings, "embedding_dimension", 4)
+    return EmbeddingService()
+
+
+def test_batches_group_texts_of_similar_length(service):
+    texts = ["a b c d e f", "a", "a b c d e", "a b"]
+
+    vectors = service.embed_batch(texts, batch_size=2)
+
+    assert service.model.batches == [["a", "a b"], ["a b c d e", "a b c d e f"]]
+    assert vectors[:, 0].tolist() == [6, 1, 5, 2]
+
+
+def test_truncation_counts_model_tokens(service):
+    assert service.truncate_to_tokens("one two three four", 2) == "one two"
+    assert service.truncate_to_tokens("one two", 5) == "one two"
+    assert service.truncate_to_tokens("one", 0) == ""
+
+
+def test_import_file_text_keeps_the_source_that_fits(service):
+    text = service.import_file_text("a.py", " ".join(f"w{i}" for i in range(50)), ["os"])
+
+    assert len(service.model.tokenizer(text)["input_ids"]) <= service.max_seq_length
+    assert text.endswith("Source Code: w0 w1 w2")
+
+
+def test_vectors_are_contiguous_float32(service):
+    vectors = service.embed_batch(["a b", "", "a b c"])
+    vector = service.embed_text("a b c", normalize=True)
+
+    assert vectors.dtype == np.float32 and vectors.flags.c_contiguous
+    assert vectors.shape == (3, 4)
+    assert vector.dtype == np.float32
+    np.testing.assert_allclose(vector, np.array([3, 1, 0, 0]) / np.sqrt(10), rtol=1e-6)
+    assert service.embed_text("  ").tolist() == [0.0] * 4
+
+
+def test_normalize_leaves_zero_rows_alone(service):
+    vectors = service._as_vectors(np.array([[3.0, 4.0], [0.0, 0.0]]), normalize=True)
+
+    np.testing.assert_allclose(vectors, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_qdrant_store_accepts_float32_arrays():
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Distance, VectorParams
+
+    from src.db.qdrant_store import QdrantStore
+
+    client = QdrantClient(":memory:")
+    client.create_collection("c", vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    store = QdrantStore(client=client)
+    ids = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+
+    store.upsert("c", ids, np.eye(2, 4, dtype=np.float32), [{"n": 1}, {"n": 2}])
+
+    assert store.search("c", np.array([0, 1, 0, 0], dtype=np.float32), 1) == [{"n": 2}]
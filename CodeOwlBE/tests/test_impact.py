@@ -0,0 +1,85 @@
+from src.services.ast.code_graph import merge_graphs
+from src.services.ast.impact import ImpactAnalyzer, IntervalTree, hunk_line_ranges
+from src.services.ast.parser import SimpleASTParser
+from src.services.ast.symbol_index import SymbolIndex
+
+
+def test_interval_tree_touching_and_nested():
+    tree = IntervalTree([(1, 10, "outer"), (3, 5, "inner"), (10, 12, "next"), (20, 30, "far")])
+
+    assert sorted(tree.overlap(10, 10)) == ["next", "outer"]
+    assert sorted(tree.overlap(4, 4)) == ["inner", "outer"]
+    assert sorted(tree.overlap(6, 9)) == ["outer"]
+    assert tree.overlap(13, 19) == []
+    assert sorted(tree.overlap(0, 100)) == ["far", "inner", "next", "outer"]
+
+
+def test_interval_tree_matches_brute_force():
+    intervals = [(s, s + (s * 7) % 11, s) for s in range(1, 60, 3)]
+    tree = IntervalTree(intervals)
+
+    for lo in range(0, 75, 4):
+        for hi in (lo, lo + 2, lo + 9):
+            expected = sorted(v for start, end, v in intervals if start <= hi and end >= lo)
+            assert sorted(tree.overlap(lo, hi)) == expected
+
+
+def test_hunk_line_ranges():
+    # (old_start, old_count, new_start, new_count)
+    added_only = (4, 0, 5, 3)
+    deleted_only = (7, 2, 9, 0)
+    deleted_at_top = (1, 2, 0, 0)
+
+    assert hunk_line_ranges([added_only, deleted_only, deleted_at_top]) == [(5, 7), (9, 10), (1, 1)]
+
+
+SOURCE = b"""def leaf():
+    pass
+
+
+def middle():
+    leaf()
+
+
+def top():
+    middle()
+
+
+def other():
+    middle()
+
+
+def unrelated():
+    pass
+"""
+
+
+def _analyzer():
+    analysis, graph = SimpleASTParser("python").analyze_path("m.py", data=SOURCE)
+    index = SymbolIndex.from_results({"m.py": (analysis, graph)})
+    graph = merge_graphs([graph])
+    index.link_calls(graph)
+    return ImpactAnalyzer(index, graph)
+
+
+def test_changed_symbols_from_hunks():
+    analyzer = _analyzer()
+
+    changed = analyzer.changed_symbols({"m.py": [(6, 1, 6, 1)], "missing.py": [(1, 1, 1, 1)]})
+
+    assert [d.name for d in changed] == ["middle"]
+
+
+def test_impact_ranks_changed_then_callers_then_callees():
+    analyzer = _analyzer()
+
+    impacted = analyzer.analyze({"m.py": [(6, 1, 6, 1)]}, k=2)
+
+    assert [(s.definition.name, s.relation, s.hops) for s in impacted] == [
+        ("middle", "changed", 0),
+        ("top", "caller", 1),
+        ("other", "caller", 1),
+        ("leaf", "callee", 1),
+    ]
+    assert [s.score for s in impacted] == [1.0, 0.5, 0.5, 0.5]
+    assert len(analyzer.analyze({"m.py": [(6, 1, 6, 1)]}, limit=2)) == 2
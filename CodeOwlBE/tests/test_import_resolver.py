@@ -0,0 +1,48 @@
+import pytest
+
+from src.services.ast.import_resolver import ImportResolver
+
+
+FILES = [
+    "service/src/__init__.py",
+    "service/src/db/__init__.py",
+    "service/src/db/models.py",
+    "service/src/db/store.py",
+    "service/main.py",
+    "pkg/__init__.py",
+    "pkg/a.py",
+    "pkg/sub/__init__.py",
+    "pkg/sub/m.py",
+    "tools/app/core.py",
+    "tools/run.py",
+]
+
+
+@pytest.mark.parametrize(
+    "import_name, from_file, expected",
+    [
+        # Package-chain root: service/ holds the src package
+        ("src.db.models", "service/main.py", "service/src/db/models.py"),
+        ("src.db.models.User", "service/main.py", "service/src/db/models.py"),
+        # Top-level directory as root, without __init__.py files
+        ("app.core", "tools/run.py", "tools/app/core.py"),
+        # Checkout root
+        ("pkg.sub.m", "tools/run.py", "pkg/sub/m.py"),
+        ("tools.app.core", "service/main.py", "tools/app/core.py"),
+        # from . import store / from .. import a: submodules first
+        (".store", "service/src/db/models.py", "service/src/db/store.py"),
+        ("..a", "pkg/sub/m.py", "pkg/a.py"),
+        # ...else a name defined in the package's __init__.py
+        (".Base", "service/src/db/models.py", "service/src/db/__init__.py"),
+        (".", "pkg/sub/m.py", "pkg/sub/__init__.py"),
+    ],
+)
+def test_resolve_python(import_name, from_file, expected):
+    assert ImportResolver(FILES).resolve(import_name, from_file) == [expected]
+
+
+def test_external_python_imports_do_not_resolve():
+    resolver = ImportResolver(FILES)
+
+    assert resolver.resolve("os.path", "service/main.py") == []
+    assert resolver.resolve("numpy", "service/main.py") == []
@@ -0,0 +1,78 @@
+import pytest
+
+from src.services.ast.incremental import compute_hunks
+from src.services.ast.parser import SimpleASTParser
+
+
+BASE = b'''import os
+from . import util
+
+
+class Store:
+    def get(self, key):
+        return self.load(key)
+
+    def load(self, key):
+        return os.environ.get(key)
+
+
+def main():
+    store = Store()
+    print(store.get("HOME"))
+
+
+def helper(x):
+    return util.double(x)
+'''
+
+EDITS = {
+    "edit body": BASE.replace(b"return os.environ.get(key)", b"value = os.environ.get(key)\n        return value or ''"),
+    "add function": BASE.replace(b"def main():", b"def setup():\n    return Store()\n\n\ndef main():"),
+    "remove method": BASE.replace(b"    def load(self, key):\n        return os.environ.get(key)\n\n", b""),
+    "add import": b"import sys\n" + BASE,
+    "rename class": BASE.replace(b"Store", b"Repository"),
+    "append": BASE + b"\n\nclass Extra:\n    pass\n",
+}
+
+
+def _snapshot(analysis, graph):
+    return (
+        [dict(record) for record in analysis["functions"]],
+        [dict(record) for record in analysis["classes"]],
+        analysis["imports"],
+        dict(graph.to_networkx().nodes(data=True)),
+        {(u, v): d for u, v, d in graph.to_networkx().edges(data=True)},
+    )
+
+
+@pytest.mark.parametrize("name", EDITS)
+def test_incremental_matches_full_reparse(name):
+    new = EDITS[name]
+    parser = SimpleASTParser("python")
+    parser.analyze_incremental("app.py", BASE)
+
+    incremental = parser.analyze_incremental("app.py", new)
+
+    full = SimpleASTParser("python").analyze_path("app.py", data=new)
+    assert _snapshot(*incremental) == _snapshot(*full)
+
+
+def test_incremental_with_explicit_hunks():
+    new = EDITS["add function"]
+    parser = SimpleASTParser("python")
+    parser.analyze_incremental("app.py", BASE)
+
+    incremental = parser.analyze_incremental("app.py", new, compute_hunks(BASE, new))
+
+    full = SimpleASTParser("python").analyze_path("app.py", data=new)
+    assert _snapshot(*incremental) == _snapshot(*full)
+
+
+def test_successive_versions_stay_in_sync():
+    parser = SimpleASTParser("python")
+    parser.analyze_incremental("app.py", BASE)
+
+    for new in EDITS.values():
+        incremental = parser.analyze_incremental("app.py", new)
+        full = SimpleASTParser("python").analyze_path("app.py", data=new)
+        assert _snapshot(*incremental) == _snapshot(*full)
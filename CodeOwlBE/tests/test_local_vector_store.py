@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.db.local_vector_store import LocalVectorStore
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    store.initialize_collections(3, ["code_graphs"])
+    store.upsert(
+        "code_graphs",
+        ["a", "b", "c"],
+        np.stack([_unit(1, 0, 0), _unit(0, 1, 0), _unit(1, 1, 0)]),
+        [
+            {"repo_id": "r1", "file_path": "a.py"},
+            {"repo_id": "r1", "file_path": "b.py"},
+            {"repo_id": "r2", "file_path": "c.py"},
+        ],
+    )
+    yield store
+    store.close()
+
+
+def test_search_ranks_by_cosine(store):
+    results = store.search("code_graphs", _unit(1, 0.1, 0), 3)
+    assert [r["file_path"] for r in results] == ["a.py", "c.py", "b.py"]
+
+
+def test_search_and_fetch_apply_filters(store):
+    results = store.search("code_graphs", _unit(1, 0, 0), 3, must={"repo_id": "r1"}, must_not={"file_path": "a.py"})
+    assert [r["file_path"] for r in results] == ["b.py"]
+
+    fetched = store.fetch("code_graphs", must={"file_path": ["a.py", "c.py"]})
+    assert sorted(r["file_path"] for r in fetched) == ["a.py", "c.py"]
+
+
+def test_upsert_replaces_same_id(store):
+    store.upsert("code_graphs", ["a"], _unit(0, 0, 1)[None], [{"repo_id": "r1", "file_path": "a2.py"}])
+
+    assert store.count("code_graphs") == 3
+    assert store.search("code_graphs", _unit(0, 0, 1), 1)[0]["file_path"] == "a2.py"
+
+
+def test_delete_by_filter(store):
+    store.delete("code_graphs", must={"repo_id": "r1"})
+
+    assert store.count("code_graphs") == 1
+    assert [r["file_path"] for r in store.fetch("code_graphs")] == ["c.py"]
+
+
+def test_reload_from_disk(store, tmp_path):
+    store.delete("code_graphs", must={"file_path": "b.py"})
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path))
+    try:
+        assert reopened.count("code_graphs") == 2
+        assert reopened.search("code_graphs", _unit(1, 0, 0), 1)[0]["file_path"] == "a.py"
+    finally:
+        reopened.close()
+
+
+def test_missing_collection_reads_empty(store):
+    assert store.search("learnings", _unit(1, 0, 0), 5) == []
+    assert store.fetch("learnings") == []
+    assert store.count("learnings") == 0
@@ -0,0 +1,66 @@
+from src.services.ast.parallel import ParallelParser, iter_source_files
+from src.services.ast.parser import SimpleASTParser
+
+
+FILES = {
+    "app/main.py": "from app import util\n\n\ndef main():\n    util.run()\n",
+    "web/index.js": 'import x from "./x";\nfunction f() { g(); }\n',
+    "node_modules/dep/index.js": "function skipped() {}\n",
+    "README.md": "not source\n",
+}
+
+
+def _checkout(tmp_path, extra=0):
+    for file_path, text in FILES.items():
+        path = tmp_path / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    for i in range(extra):
+        (tmp_path / "app" / f"m{i}.py").write_text(f"def f{i}():\n    main()\n")
+    return tmp_path
+
+
+def _summary(results):
+    return {
+        file_path: (
+            [(f["name"], f["start_line"], f["source"]) for f in analysis["functions"]],
+            analysis["imports"],
+            sorted(graph.to_networkx().nodes),
+        )
+        for file_path, (analysis, graph) in results.items()
+    }
+
+
+def test_walk_skips_vendored_and_unsupported_files(tmp_path):
+    _checkout(tmp_path)
+
+    assert sorted(iter_source_files(tmp_path)) == ["app/main.py", "web/index.js"]
+
+
+def test_pool_and_inline_runs_match_a_plain_parse(tmp_path):
+    repo = _checkout(tmp_path, extra=12)
+    expected = {
+        file_path: SimpleASTParser("python" if file_path.endswith(".py") else "javascript").analyze_path(
+            file_path, data=(repo / file_path).read_bytes()
+        )
+        for file_path in iter_source_files(repo)
+    }
+
+    with ParallelParser(max_workers=2) as pool:
+        pooled = pool.analyze_repository(repo)
+    with ParallelParser(max_workers=1) as inline:
+        local = inline.analyze_repository(repo)
+
+    assert _summary(pooled) == _summary(local) == _summary(expected)
+
+
+def test_repository_graph_links_calls_across_files(tmp_path):
+    repo = _checkout(tmp_path, extra=1)
+    (repo / "app" / "util.py").write_text("def run():\n    pass\n")
+
+    with ParallelParser(max_workers=1, cache_dir=str(tmp_path / ".cache")) as parser:
+        analyses, graph, index = parser.build_repository_graph(repo)
+
+    assert "app/util.py" in analyses
+    (main,) = index.definitions("main")
+    assert [d.qualified_name for d in index.callees(main)] == ["app.util.run"]
@@ -0,0 +1,73 @@
+import pytest
+
+from src.services.ast.parser import LANGUAGE_MODULES, SimpleASTParser
+from src.services.ast.query_engine import get_query
+
+
+@pytest.mark.parametrize("language", LANGUAGE_MODULES)
+def test_every_language_loads_with_its_queries(language):
+    parser = SimpleASTParser(language)
+
+    assert get_query(language, parser.language) is not None
+
+
+def test_typescript_analysis():
+    source = b'''import { a } from "./a";
+interface Shape { area(): number }
+class Circle implements Shape {
+  area(): number { return helper(1); }
+}
+export function helper(x: number): number { return x; }
+'''
+    analysis, graph = SimpleASTParser("typescript").analyze_path("shape.ts", data=source)
+
+    assert [(f["name"], f["type"]) for f in analysis["functions"]] == [("area", "method"), ("helper", "function")]
+    assert [(c["name"], c["type"]) for c in analysis["classes"]] == [("Shape", "interface"), ("Circle", "class")]
+    assert analysis["imports"] == ["./a"]
+    assert "shape.ts::interface::Shape" in graph.to_networkx()
+
+
+SAMPLES = {
+    "python": b"import os\nfrom . import e\n\nclass A:\n    def m(self):\n        pass\n\ndef f():\n    pass\n",
+    "javascript": b'import x from "./x";\nclass A {}\nfunction f() { g(); }\n',
+    "typescript": b'import { a } from "./a";\ninterface I {}\nclass A {}\nfunction f(): void {}\n',
+    "go": b'package p\n\nimport "fmt"\n\ntype S struct{}\n\nfunc (s S) M() {}\n\nfunc F() { fmt.Println() }\n',
+    "rust": b"use std::fmt;\n\nstruct S;\n\nimpl S {\n    fn new() -> S { S }\n}\n\nfn f() {}\n",
+}
+
+
+@pytest.mark.parametrize("language", SAMPLES)
+def test_extract_methods_match_semantic_analysis(language):
+    parser = SimpleASTParser(language)
+    tree, text = parser.parse_bytes(SAMPLES[language])
+
+    analysis = parser.extract_semantic_analysis(tree, text, "sample")
+
+    assert parser.extract_functions(tree, text) == analysis["functions"]
+    assert parser.extract_classes(tree, text) == analysis["classes"]
+    assert parser.extract_imports(tree, text) == analysis["imports"]
+    assert analysis["functions"] and analysis["classes"] and analysis["imports"]
+
+
+def test_python_bare_relative_imports_name_each_module():
+    source = b"from . import a, b as c\nfrom .. import d\nfrom .x import y\nimport os.path\n"
+
+    analysis, _ = SimpleASTParser("python").analyze_path("pkg/m.py", data=source)
+
+    assert analysis["imports"] == [".a", ".b", "..d", ".x", "os.path"]
+
+
+DEEP = {
+    "python": b"import os\n\ndef f():\n    return " + b"(" * 3000 + b"1" + b")" * 3000 + b"\n",
+    "javascript": b'import x from "./x";\nfunction f() { return ' + b"[" * 3000 + b"]" * 3000 + b"; }\n",
+}
+
+
+@pytest.mark.parametrize("language", DEEP)
+def test_deeply_nested_source_does_not_recurse(language):
+    parser = SimpleASTParser(language)
+    tree, text = parser.parse_bytes(DEEP[language])
+
+    assert [f["name"] for f in parser.extract_functions(tree, text)] == ["f"]
+    assert len(parser.extract_imports(tree, text)) == 1
+    assert parser.analyze_incremental("deep", DEEP[language])[0]["functions"][0]["name"] == "f"
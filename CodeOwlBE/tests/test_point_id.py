@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.db.local_vector_store import LocalVectorStore
+from src.db.vector_indexer import VectorIndexer, point_id
+from src.db.vector_store import tenant_collection
+
+
+def test_point_id_is_deterministic():
+    assert point_id("code_graph", "src/app.py", "r1") == point_id("code_graph", "src/app.py", "r1")
+
+
+def test_point_id_separates_repos_and_kinds():
+    ids = {
+        point_id("code_graph", "src/app.py", "r1"),
+        point_id("code_graph", "src/app.py", "r2"),
+        point_id("import_file", "src/app.py", "r1"),
+    }
+    assert len(ids) == 3
+
+
+def test_reindexing_replaces_points(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    try:
+        for version in range(2):
+            ids = [point_id("code_graph", path, "r1") for path in ("a.py", "b.py")]
+            payloads = [{"file_path": path, "version": version} for path in ("a.py", "b.py")]
+            store.upsert("code_graphs", ids, np.eye(2, 4, dtype=np.float32), payloads)
+
+        assert store.count("code_graphs") == 2
+        assert {p["version"] for p in store.fetch("code_graphs")} == {1}
+    finally:
+        store.close()
+
+
+class FakeEmbeddingService:
+    """Stands in for EmbeddingService without loading a model"""
+
+    def code_graph_text(self, graph_data):
+        return str(graph_data)
+
+    def embed_code_graph(self, graph_data):
+        return np.ones(4, dtype=np.float32)
+
+    def embed_batch(self, texts, batch_size=None, normalize=False):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_new_file_version_replaces_its_point(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.db.vector_indexer.get_embedding_service", FakeEmbeddingService)
+    store = LocalVectorStore(str(tmp_path))
+    try:
+        indexer = VectorIndexer("r1", store=store)
+        first = indexer.index_code_graph("a.py", {"functions": ["f"]}, blob_sha="abc")
+        second = indexer.index_code_graph("a.py", {"functions": ["g"]}, blob_sha="def")
+        (bulk,) = indexer.index_code_graphs([("a.py", {"functions": ["h"]})], progress=lambda *_: None)
+
+        assert first == second == bulk
+        assert store.count(tenant_collection("code_graphs", "r1")) == 1
+    finally:
+        store.close()
@@ -0,0 +1,55 @@
+from src.db.retrieval_cache import RetrievalCache
+
+
+KEY = ("code_graphs", "fetch", "{}", None)
+OTHER = ("learnings", "fetch", "{}", None)
+
+
+def test_lookup_computes_once():
+    cache = RetrievalCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"file_path": "a.py"}]
+
+    assert cache.lookup(KEY, compute) == [{"file_path": "a.py"}]
+    assert cache.lookup(KEY, compute) == [{"file_path": "a.py"}]
+    assert len(calls) == 1
+
+
+def test_bump_drops_only_that_collection():
+    cache = RetrievalCache()
+    cache.put(KEY, [{"n": 1}], cache.generation(KEY[0]))
+    cache.put(OTHER, [{"n": 2}], cache.generation(OTHER[0]))
+
+    cache.bump("code_graphs")
+
+    assert cache.get(KEY) is None
+    assert cache.get(OTHER) == [{"n": 2}]
+
+
+def test_result_computed_across_a_write_is_not_stored():
+    cache = RetrievalCache()
+    generation = cache.generation(KEY[0])
+    cache.bump("code_graphs")  # a write lands while the lookup is running
+
+    cache.put(KEY, [{"n": 1}], generation)
+
+    assert cache.get(KEY) is None
+
+
+def test_cached_values_are_copies():
+    cache = RetrievalCache()
+    cache.put(KEY, [{"n": 1}], 0)
+
+    cache.get(KEY)[0]["n"] = 2
+
+    assert cache.get(KEY) == [{"n": 1}]
+
+
+def test_ttl_expires_entries():
+    cache = RetrievalCache(ttl_seconds=0)
+    cache.put(KEY, [{"n": 1}], 0)
+
+    assert cache.get(KEY) is None
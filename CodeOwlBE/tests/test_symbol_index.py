@@ -0,0 +1,114 @@
+import pytest
+
+from src.services.ast.parser import LANGUAGE_MAP, SimpleASTParser
+from src.services.ast.symbol_index import SymbolIndex, type_name
+
+
+FILES = {
+    "lib/foo.rs": b"pub struct Foo;\n\nimpl Foo {\n    pub fn new() -> Foo { Foo }\n}\n\nfn make() -> Foo { Foo::new() }\n",
+    "app/svc.py": b"""import numpy as np
+from app import models
+
+
+class Svc:
+    def run(self):
+        self.stop()
+
+    def stop(self):
+        return np.array([])
+
+
+class Other:
+    def run(self):
+        self.stop()
+
+    def stop(self):
+        pass
+
+
+def main():
+    Svc.run(None)
+    obj.run()
+    models.User.save(None)
+    helper()
+""",
+    "app/models.py": b"class User:\n    def save(self):\n        pass\n\n\ndef helper():\n    pass\n",
+    "other/models.py": b"class User:\n    def save(self):\n        pass\n",
+    "p/s.go": b"package p\n\ntype S struct{}\n\nfunc (s *S) Run() {}\n\nfunc F() { S.Run(nil) }\n",
+    "web/a.js": b"class Svc {\n  run() { this.x(); }\n  x() {}\n}\n\nfunction f() { Svc.run(); }\n",
+}
+
+
+def _index(files=FILES):
+    results = {}
+    for file_path, source in files.items():
+        language = LANGUAGE_MAP["." + file_path.rsplit(".", 1)[1]]
+        results[file_path] = SimpleASTParser(language).analyze_path(file_path, data=source)
+    return SymbolIndex.from_results(results)
+
+
+def _qualified(definitions):
+    return sorted(d.qualified_name for d in definitions)
+
+
+def _get(index, qualified_name):
+    (definition,) = index.definitions(qualified_name)
+    return definition
+
+
+@pytest.mark.parametrize(
+    "caller, expected",
+    [
+        ("lib.foo.make", ["lib.foo.Foo.new"]),
+        ("app.svc.Svc.run", ["app.svc.Svc.stop"]),
+        ("app.svc.Other.run", ["app.svc.Other.stop"]),
+        ("app.svc.main", ["app.models.User.save", "app.models.helper", "app.svc.Svc.run"]),
+        ("p.F", ["p.S.Run"]),
+        ("web.a.Svc.run", ["web.a.Svc.x"]),
+        ("web.a.f", ["web.a.Svc.run"]),
+    ],
+)
+def test_callees(caller, expected):
+    index = _index()
+    assert _qualified(index.callees(_get(index, caller))) == expected
+
+
+def test_callers():
+    index = _index()
+    assert _qualified(index.callers(_get(index, "app.svc.Svc.run"))) == ["app.svc.main"]
+    assert _qualified(index.callers(_get(index, "app.svc.Other.run"))) == []
+
+
+def test_foreign_receivers_stay_unresolved():
+    index = _index()
+    assert index.resolve("obj.run", "app/svc.py") is None
+    assert index.resolve("np.array", "app/svc.py") is None
+
+
+def test_ambiguous_names_prefer_imported_module():
+    index = _index()
+    assert index.resolve("User.save", "app/svc.py").file_path == "app/models.py"
+    assert index.resolve("User.save", "lib/foo.rs") is None
+
+
+def test_same_file_definition_wins():
+    index = _index()
+    assert index.resolve("run", "web/a.js").qualified_name == "web.a.Svc.run"
+    assert index.resolve("Foo::new", "lib/foo.rs").qualified_name == "lib.foo.Foo.new"
+
+
+def test_update_and_remove_file():
+    index = _index()
+    index.remove_file("app/models.py")
+    assert _qualified(index.callees(_get(index, "app.svc.main"))) == ["app.svc.Svc.run", "other.models.User.save"]
+
+    index = _index({**FILES, "lib/foo.rs": b"fn make() {}\n"})
+    assert index.definitions("Foo.new") == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("Display for Foo<T, U>", "Foo"), ("(s *S[T])", "S"), ("models::User", "User"), ("&mut Foo", "Foo")],
+)
+def test_type_name(text, expected):
+    assert type_name(text) == expected
@@ -0,0 +1,55 @@
+import pickle
+
+from src.services.ast.parser import SimpleASTParser
+from src.services.ast.symbols import SourceBuffer, moved_symbol, pack_symbols, unpack_symbols
+
+
+SOURCE = "# héllo wörld ✓\n\nclass Café:\n    def naïve(self, ünïcode):\n        return 'ß'\n".encode()
+
+
+def _analysis():
+    return SimpleASTParser("python").analyze_path("cafe.py", data=SOURCE)[0]
+
+
+def test_spans_decode_non_ascii_source():
+    analysis = _analysis()
+    (method,) = analysis["functions"]
+    (cls,) = analysis["classes"]
+
+    assert method["name"] == "naïve"
+    assert method["parameters"] == "(self, ünïcode)"
+    assert method["source"].endswith("return 'ß'")
+    assert cls["source"].startswith("class Café:")
+
+
+def test_symbols_behave_like_the_old_dicts():
+    (method,) = _analysis()["functions"]
+
+    record = dict(method)
+
+    assert set(record) == {"name", "type", "start_line", "end_line", "parameters", "signature", "source"}
+    assert method == record
+    assert method.get("receiver") is None
+
+
+def test_pack_round_trip_and_pickle():
+    analysis = _analysis()
+    symbols = analysis["functions"] + analysis["classes"]
+    buffer = SourceBuffer(SOURCE)
+
+    unpacked = unpack_symbols(buffer, pack_symbols(symbols))
+
+    assert [dict(s) for s in unpacked] == [dict(s) for s in symbols]
+    assert [dict(s) for s in pickle.loads(pickle.dumps(symbols))] == [dict(s) for s in symbols]
+    assert buffer[2:8] == SOURCE[2:8].decode()
+
+
+def test_moved_symbol_follows_inserted_lines():
+    (method,) = _analysis()["functions"]
+    prefix = "# ünïcode line\n".encode()
+
+    moved = moved_symbol(method, SourceBuffer(prefix + SOURCE), len(prefix), 1)
+
+    assert moved["start_line"] == method["start_line"] + 1
+    assert moved["source"] == method["source"]
+    assert moved["parameters"] == method["parameters"]
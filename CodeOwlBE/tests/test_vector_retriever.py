@@ -0,0 +1,115 @@
+import asyncio
+
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from src.db.local_vector_store import LocalVectorStore
+from src.db.qdrant_store import QdrantStore
+from src.db.vector_indexer import VectorIndexer, point_id
+from src.db.vector_store import base_collection, tenant_collection
+from src.services.vector_retriever import VectorRetriever
+from src.utils.config import settings
+from src.utils.qdrant_client import ainitialize_collections, initialize_collections
+
+
+class ConstantService:
+    """Stands in for EmbeddingService: every text embeds to the same vector"""
+
+    embedding_dim = 4
+
+    def embed_text(self, text, normalize=False):
+        return np.ones(4, dtype=np.float32)
+
+    def embed_batch(self, texts, batch_size=None, normalize=False):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def embed_code_graph(self, graph_data):
+        return self.embed_text("")
+
+    def embed_learning(self, **kwargs):
+        return self.embed_text("")
+
+
+def _qdrant_store():
+    client = QdrantClient(":memory:")
+    initialize_collections(client=client, dimension=4)
+    return QdrantStore(client=client)
+
+
+@pytest.fixture(params=["local", "qdrant"])
+def store(request, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.services.vector_retriever.get_embedding_service", ConstantService)
+    monkeypatch.setattr(settings, "retrieval_cache_enabled", False)
+    monkeypatch.setattr(settings, "embedding_dimension", 4)
+    store = LocalVectorStore(str(tmp_path)) if request.param == "local" else _qdrant_store()
+    yield store
+    if request.param == "local":
+        store.close()
+
+
+def _put(store, collection_name, repo_id, file_paths):
+    store.upsert(
+        collection_name,
+        [point_id(collection_name, file_path, repo_id) for file_path in file_paths],
+        np.ones((len(file_paths), 4), dtype=np.float32),
+        [{"file_path": file_path, "repo_id": repo_id} for file_path in file_paths],
+    )
+
+
+def test_fetch_by_files_is_exact_and_in_request_order(store):
+    _put(store, "code_graphs", "r1", ["a.py", "b.py", "c.py", "ab.py"])
+    retriever = VectorRetriever("r1", store=store)
+
+    found = retriever.get_code_graphs_by_files(["c.py", "a.py", "c.py", "missing.py"])
+
+    assert [p["file_path"] for p in found] == ["c.py", "a.py"]
+    assert retriever.get_import_files_by_files([]) == []
+
+
+class ConstantBatcher:
+    async def embed(self, text):
+        return np.ones(4, dtype=np.float32)
+
+
+def test_async_index_and_retrieve_on_the_async_client(monkeypatch):
+    monkeypatch.setattr("src.db.vector_indexer.get_embedding_service", ConstantService)
+    monkeypatch.setattr("src.services.vector_retriever.get_embedding_service", ConstantService)
+    monkeypatch.setattr("src.services.vector_retriever.get_batching_embedder", ConstantBatcher)
+    monkeypatch.setattr(settings, "retrieval_cache_enabled", False)
+
+    async def run():
+        client = AsyncQdrantClient(":memory:")
+        await ainitialize_collections(client=client, dimension=4)
+        store = QdrantStore(async_client=client)
+        indexer = VectorIndexer("r1", store=store)
+        await indexer.aindex_code_graph("a.py", {"functions": ["f"]})
+        await indexer.aindex_code_graph("b.py", {"functions": ["g"]})
+        await indexer.aindex_learning("fix", "use a lock")
+        return await VectorRetriever("r1", store=store).aretrieve_context(["a.py"], related_query="locking")
+
+    context = asyncio.run(run())
+
+    assert [p["file_path"] for p in context["code_graphs"]] == ["a.py"]
+    assert context["import_files"] == []
+    assert [p["bot_comment"] for p in context["learnings"]] == ["use a lock"]
+    assert [p["file_path"] for p in context["related_code"]] == ["b.py"]
+
+
+def test_lookups_stay_within_one_repository(store, monkeypatch):
+    monkeypatch.setattr(settings, "vector_dedicated_repos", ["big/Repo"])
+    dedicated = tenant_collection("code_graphs", "big/Repo")
+    for repo_id in ("r1", "r2", "big/Repo"):
+        _put(store, tenant_collection("code_graphs", repo_id), repo_id, ["a.py", f"{repo_id}.py"])
+        _put(store, tenant_collection("learnings", repo_id), repo_id, [f"{repo_id}.md"])
+
+    r1 = VectorRetriever("r1", store=store)
+    context = r1.retrieve_context(["a.py"], related_query="anything")
+
+    assert dedicated != "code_graphs" and base_collection(dedicated) == "code_graphs"
+    assert store.count(dedicated) == 2
+    assert [p["repo_id"] for p in context["code_graphs"]] == ["r1"]
+    assert [p["file_path"] for p in context["learnings"]] == ["r1.md"]
+    assert [p["file_path"] for p in context["related_code"]] == ["r1.py"]
+    assert [p["repo_id"] for p in r1.get_code_graphs_by_files(["a.py"], repo_id="big/Repo")] == ["big/Repo"]
+    assert [p["repo_id"] for p in VectorRetriever("r2", store=store).get_related_code("x")] == ["r2", "r2"]